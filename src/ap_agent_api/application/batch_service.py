@@ -0,0 +1,112 @@
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ap_agent_api.domain.models.batch import BatchItemResult
+from ap_agent_api.domain.models.property import PropertyAddress, PropertyData
+from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+from ap_agent_api.application.elevation_risk_service import (
+    ELEVATION_RISK_FILENAME, run_and_save_elevation_risk_assessment
+)
+from ap_agent_api.application.property_search_service import PROPERTY_DETAILS_FILENAME, run_and_save_property_search
+
+from ap_agent_api.infrastructure import gis_image_generate
+from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
+
+import coloredlogs, logging
+logger = logging.getLogger(__name__)
+coloredlogs.install(level='INFO', logger=logger)
+
+
+async def _run_assessment(name: str, address: PropertyAddress):
+    if name == "elevation_risk":
+        return await run_and_save_elevation_risk_assessment(address)
+    return await run_and_save_property_search(address)
+
+
+async def _score_address(index: int, address: PropertyAddress, stored: Dict[str, Optional[BaseModel]]) -> BatchItemResult:
+    """
+    Runs the requested assessments that have no stored result (None in
+    `stored`, see _load_stored) for one address, isolating their failures.
+    """
+    item = BatchItemResult(index=index, address=address, success=True)
+    for name, value in stored.items():
+        if value is not None:
+            setattr(item, name, value)
+            item.from_store.append(name)
+
+    pending = [name for name, value in stored.items() if value is None]
+    outcomes = await asyncio.gather(*(_run_assessment(name, address) for name in pending), return_exceptions=True)
+    for name, outcome in zip(pending, outcomes):
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                # Cancellation (or interpreter exit) is not a failed assessment.
+                raise outcome
+            logger.error(f"Batch {name} failed for {address.street}: {outcome}")
+            item.success = False
+            item.errors[name] = str(outcome)
+            continue
+        setattr(item, name, outcome)
+    return item
+
+
+def _load_stored(addresses: List[PropertyAddress], include_property_search: bool) -> List[Dict[str, Optional[BaseModel]]]:
+    """
+    Returns, for every address, its fresh stored result of each requested
+    assessment ("elevation_risk", "property_data"), or None where there is none.
+    """
+    file_repo = PropertyFileRepository()
+    stored = []
+    for address in addresses:
+        results = {"elevation_risk": file_repo.load_model(
+            address, filename=ELEVATION_RISK_FILENAME, model_cls=ElevationRiskAssessment
+        )}
+        if include_property_search:
+            results["property_data"] = file_repo.load_model(
+                address, filename=PROPERTY_DETAILS_FILENAME, model_cls=PropertyData
+            )
+        stored.append(results)
+    return stored
+
+
+async def score_portfolio(addresses: List[PropertyAddress], include_property_search: bool = False) -> AsyncIterator[BatchItemResult]:
+    """
+    Scores many addresses, yielding each result as soon as it is ready.
+
+    Already-stored results are yielded first. The remaining addresses are
+    geocoded together through the batch geocoder, then run through the regular
+    services, whose per-stage concurrency limits bound the load on geohub,
+    OpenCV and the agent.
+    """
+    logger.info(f"Scoring portfolio of {len(addresses)} addresses ...")
+
+    # The stored-result lookups read the store; keep them off the event loop.
+    stored = await asyncio.to_thread(_load_stored, addresses, include_property_search)
+    pending = [address for address, results in zip(addresses, stored) if results["elevation_risk"] is None]
+
+    loop = asyncio.get_running_loop()
+    geocoded = None
+    if pending:
+        # One batched geocoder call per chunk fills the geocode cache that the
+        # per-address assessments then read from.
+        geocoded = loop.run_in_executor(None, gis_image_generate.geocode_addresses, pending)
+
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def worker(index: int, address: PropertyAddress):
+        if geocoded is not None and stored[index]["elevation_risk"] is None:
+            try:
+                await asyncio.shield(geocoded)
+            except Exception as e:
+                logger.warning(f"Batch geocoding failed, falling back to per-address geocoding: {e}")
+        await results.put(await _score_address(index, address, stored[index]))
+
+    tasks = [asyncio.create_task(worker(index, address)) for index, address in enumerate(addresses)]
+    try:
+        for _ in range(len(tasks)):
+            yield await results.get()
+    finally:
+        # The consumer may stop early (e.g. the client disconnected).
+        for task in tasks:
+            task.cancel()
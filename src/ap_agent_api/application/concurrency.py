@@ -0,0 +1,29 @@
+import asyncio
+import weakref
+from typing import Dict
+
+
+class StageLimiter:
+    """
+    Named asyncio semaphores, one per pipeline stage, created lazily for each
+    event loop (a semaphore cannot be shared across loops).
+
+    Usage:
+        limits = StageLimiter({"geocode": 8, "scoring": 4})
+        async with limits("geocode"):
+            ...
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = dict(limits)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def __call__(self, stage: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        semaphore = semaphores.get(stage)
+        if semaphore is None:
+            semaphore = semaphores[stage] = asyncio.Semaphore(self.limits[stage])
+        return semaphore
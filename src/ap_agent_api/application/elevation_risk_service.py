@@ -1,32 +1,120 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Optional, Tuple
+
+from ap_agent_api.config import (
+    ELEVATION_MAX_CONCURRENCY, ELEVATION_IO_WORKERS, ELEVATION_CPU_WORKERS,
+    ELEVATION_GEOCODE_CONCURRENCY, ELEVATION_LAYER_CONCURRENCY, ELEVATION_SCORING_CONCURRENCY, SCORING_ENGINE
+)
 from ap_agent_api.domain.models.property import PropertyAddress
 from ap_agent_api.domain.models.risks import ElevationRiskAssessment
-from ap_agent_api.domain.utils import get_property_directory
-
-from ap_agent_api.infrastructure import gis_image_generate
-from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+from ap_agent_api.domain.models.events import StageEvent
+from ap_agent_api.domain.utils import get_property_directory, normalize_address
+from ap_agent_api.application.concurrency import StageLimiter
+from ap_agent_api.application.single_flight import SingleFlight
+from ap_agent_api.application.progress import EmitFn, stream_stage_events
 
-# from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
+from ap_agent_api.infrastructure import gis_image_generate, metrics
+from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
 
 #TODO : DO this better by checking if images exist and if not 
 # they call the tools to generate them.
 
+ELEVATION_RISK_FILENAME = 'elevation_risk.json'
+
 import coloredlogs, logging
 logger = logging.getLogger(__name__)
 coloredlogs.install(level='INFO', logger=logger)
 
+# Blocking network calls (geocoding, layer exports) and OpenCV work run on
+# their own pools so that they never block the event loop.
+_executors = {}
+_executors_lock = threading.Lock()
+
+def _get_executor(kind: str) -> ThreadPoolExecutor:
+    """
+    Returns the "io" or "cpu" worker pool, creating it on first use.
+    """
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            max_workers = ELEVATION_IO_WORKERS if kind == "io" else ELEVATION_CPU_WORKERS
+            executor = _executors[kind] = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix=f"elevation-{kind}"
+            )
+        return executor
+
+# Concurrency limits: "total" assessments in flight, and per pipeline stage.
+_limits = StageLimiter({
+    "total": ELEVATION_MAX_CONCURRENCY,
+    "geocode": ELEVATION_GEOCODE_CONCURRENCY,
+    "layers": ELEVATION_LAYER_CONCURRENCY,
+    "scoring": ELEVATION_SCORING_CONCURRENCY,
+})
+
+# Identical assessments that arrive while one is running share its result.
+_assessment_flight = SingleFlight()
+
+async def _run_stage(stage: str, kind: str, fn, *args, **kwargs):
+    """
+    Runs a blocking pipeline stage on the "io" or "cpu" pool, within the stage's limit.
+    """
+    loop = asyncio.get_running_loop()
+    async with _limits(stage):
+        return await loop.run_in_executor(_get_executor(kind), partial(fn, *args, **kwargs))
+
+def shutdown_executors(wait: bool = True):
+    """
+    Shuts down the worker pools used by the elevation risk service.
+    """
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
 
 async def run_elevation_risk_assessment(address: PropertyAddress):
+    """
+    Assesses the elevation risk of the address. Concurrent requests for the
+    same (normalized) address share a single assessment.
+    """
+    return await _assessment_flight.do(normalize_address(address), _run_elevation_risk_assessment, address)
+
+async def _run_elevation_risk_assessment(address: PropertyAddress, emit: Optional[EmitFn] = None):
+
+    # OpenCV and NumPy are loaded on the first assessment, not at API startup.
+    from ap_agent_api.domain.tools import elevation_risk_calculator as erc
 
     logger.info("Running elevation risk assessment ...")
-    
-    # 1. Generate the GIS images.
-    output_dir = gis_image_generate.run(address=address)
 
-    # 2. Check the elevation risk.
-    elevation_risk_dict = erc.calculate(output_dir / "contour_map.png")
+    async with _limits("total"):
+        # 1. Geocode the address.
+        wgs84_x, wgs84_y, wm_x, wm_y = await _run_stage("geocode", "io", gis_image_generate.geocode_property, address)
+        if emit:
+            emit("geocoded", longitude=wgs84_x, latitude=wgs84_y)
+
+        # 2. Fetch the GIS images (kept in memory, saved in the background).
+        images = await _run_stage("layers", "io", gis_image_generate.fetch_images, address, wm_x, wm_y)
+        if emit:
+            emit("layers_fetched", layers={
+                name: {"ok": layer.ok, "elapsed": layer.elapsed, "error": layer.error}
+                for name, layer in images.layers.items()
+            })
+        contour_image = images.content("contour")
+        if contour_image is None:
+            raise ValueError(f"Contour map could not be fetched: {images.layers['contour'].error}")
 
-    # file_repo = PropertyFileRepository()
-    # file_path = file_repo.save(property_address=address, data=elevation_risk_dict, filename='elevation_risk.json')
+        # 3. Check the elevation risk.
+        timings = {}
+        elevation_risk_dict = await _run_stage(
+            "scoring", "cpu", erc.calculate, contour_image,
+            timings=timings, engine=SCORING_ENGINE, box_side_metres=gis_image_generate.BOX_SIDE_METERS
+        )
+        for step, seconds in timings.items():
+            metrics.SCORING_STEP_SECONDS[step].observe(seconds)
 
     # Convert dictionary to ElevationRiskAssessment pydantic model
     elevation_risk_assessment = ElevationRiskAssessment(**elevation_risk_dict)
@@ -35,6 +123,71 @@ async def run_elevation_risk_assessment(address: PropertyAddress):
 
     return elevation_risk_assessment
 
+# The result store is SQLite: its reads and writes run in worker threads, off
+# the event loop.
+
+async def get_stored_elevation_risk_json(address: PropertyAddress) -> Optional[bytes]:
+    """
+    Returns the stored elevation risk assessment for the address as JSON bytes, ready to be
+    returned by the API, if it is still fresh.
+    """
+    return await asyncio.to_thread(
+        PropertyFileRepository().load_json, address, filename=ELEVATION_RISK_FILENAME, model_cls=ElevationRiskAssessment
+    )
+
+async def get_or_run_elevation_risk_assessment(address: PropertyAddress) -> Tuple[ElevationRiskAssessment, bool]:
+    """
+    Returns the stored assessment for the address if it is still fresh,
+    otherwise runs and stores a new one.
+
+    Returns:
+        tuple: (assessment, True if it was loaded from the results store)
+    """
+    risk_data = await asyncio.to_thread(
+        PropertyFileRepository().load_model, address, filename=ELEVATION_RISK_FILENAME, model_cls=ElevationRiskAssessment
+    )
+    if risk_data is not None:
+        logger.info(f"Elevation risk loaded from existing file for: {address.street}")
+        return risk_data, True
+
+    return await run_and_save_elevation_risk_assessment(address), False
+
+async def run_and_save_elevation_risk_assessment(address: PropertyAddress) -> ElevationRiskAssessment:
+    """
+    Runs a new assessment and stores it, without looking for a stored one
+    (for callers that already did, e.g. with get_stored_elevation_risk_json).
+    """
+    risk_data = await run_elevation_risk_assessment(address)
+    file_path = await asyncio.to_thread(
+        PropertyFileRepository().save, property_address=address, data=risk_data, filename=ELEVATION_RISK_FILENAME
+    )
+    logger.info(f"Elevation risk for: {address.street} saved to {file_path}")
+    return risk_data
+
+async def stream_elevation_risk_assessment(address: PropertyAddress) -> AsyncIterator[StageEvent]:
+    """
+    Assesses the elevation risk of the address, yielding an event as each stage
+    completes: "geocoded", "layers_fetched", then "risk_scored" with the
+    assessment (or only "risk_scored" if a stored result is fresh). Failures
+    end the stream with an "error" event.
+
+    Each stream runs its own assessment (in-flight assessments are not
+    shared, as they would not report stages), within the same limits.
+    """
+    async def produce(emit: EmitFn):
+        file_repo = PropertyFileRepository()
+        risk_data = await asyncio.to_thread(
+            file_repo.load_model, address, filename=ELEVATION_RISK_FILENAME, model_cls=ElevationRiskAssessment
+        )
+        from_store = risk_data is not None
+        if not from_store:
+            risk_data = await _run_elevation_risk_assessment(address, emit)
+            await asyncio.to_thread(file_repo.save, property_address=address, data=risk_data, filename=ELEVATION_RISK_FILENAME)
+        emit("risk_scored", elevation_risk=risk_data.model_dump(by_alias=True), from_store=from_store)
+
+    async for event in stream_stage_events(produce):
+        yield event
+
 if __name__ == "__main__":
 
     test_address = PropertyAddress(
@@ -44,4 +197,4 @@ if __name__ == "__main__":
         postcode="5087"
     )
 
-    run_elevation_risk_assessment(test_address)
\ No newline at end of file
+    asyncio.run(run_elevation_risk_assessment(test_address))
\ No newline at end of file
@@ -0,0 +1,27 @@
+import asyncio
+from typing import List
+
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.domain.models.geocode import GeocodeResult
+
+from ap_agent_api.infrastructure import gis_image_generate
+
+import coloredlogs, logging
+logger = logging.getLogger(__name__)
+coloredlogs.install(level='INFO', logger=logger)
+
+
+async def run_batch_geocode(addresses: List[PropertyAddress]) -> List[GeocodeResult]:
+    """
+    Geocodes many addresses with as few geocoder round trips as possible.
+    Results are returned in the same order as the input addresses.
+    """
+    logger.info(f"Running batch geocode for {len(addresses)} addresses ...")
+
+    loop = asyncio.get_running_loop()
+    coordinates = await loop.run_in_executor(None, gis_image_generate.geocode_addresses, addresses)
+
+    return [
+        GeocodeResult(address=address, found=x is not None, longitude=x, latitude=y)
+        for address, (x, y) in zip(addresses, coordinates)
+    ]
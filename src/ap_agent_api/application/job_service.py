@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ap_agent_api.config import JOB_WORKERS, JOB_POLL_INTERVAL_SECONDS
+from ap_agent_api.domain.models.job import Job
+from ap_agent_api.domain.models.property import PropertyAddress
+
+from ap_agent_api.infrastructure.job_queue import JobQueue, create_job_queue
+
+import coloredlogs, logging
+logger = logging.getLogger(__name__)
+coloredlogs.install(level='INFO', logger=logger)
+
+SEARCH_JOB = "search"
+ELEVATION_RISK_JOB = "elevation-risk"
+
+# A handler runs one kind of job: payload -> JSON-serializable result.
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+async def _run_search_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from ap_agent_api.application.property_search_service import get_or_run_property_search
+
+    property_data, from_store = await get_or_run_property_search(PropertyAddress(**payload["address"]))
+    return {"data": property_data.model_dump(mode="json", by_alias=True), "from_store": from_store}
+
+async def _run_elevation_risk_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from ap_agent_api.application.elevation_risk_service import get_or_run_elevation_risk_assessment
+
+    risk_data, from_store = await get_or_run_elevation_risk_assessment(PropertyAddress(**payload["address"]))
+    return {"data": risk_data.model_dump(mode="json", by_alias=True), "from_store": from_store}
+
+DEFAULT_HANDLERS: Dict[str, JobHandler] = {
+    SEARCH_JOB: _run_search_job,
+    ELEVATION_RISK_JOB: _run_elevation_risk_job,
+}
+
+
+class JobManager:
+    """
+    Runs queued jobs on a fixed number of asyncio worker tasks.
+
+    Usage:
+        manager = JobManager(InMemoryJobQueue())
+        await manager.start()
+        job = await manager.submit("elevation-risk", {"address": {...}})
+        ...
+        await manager.stop()
+    """
+
+    def __init__(self, queue: JobQueue, handlers: Optional[Dict[str, JobHandler]] = None,
+                 workers: int = JOB_WORKERS, poll_interval: float = JOB_POLL_INTERVAL_SECONDS):
+        self.queue = queue
+        self.handlers = dict(DEFAULT_HANDLERS if handlers is None else handlers)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Started {self.workers} job workers")
+
+    async def stop(self):
+        """
+        Cancels the workers. Jobs they were running stay in the "running" state.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Job:
+        """
+        Queues a job and returns it right away.
+
+        Raises:
+            ValueError: If there is no handler for the job kind.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = await asyncio.to_thread(self.queue.enqueue, kind, payload)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await asyncio.to_thread(self.queue.get, job_id)
+
+    async def _worker(self, worker_id: int):
+        # A failing queue (e.g. a locked database) must not end the worker.
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self.queue.claim)
+            except Exception as e:
+                logger.error(f"Job worker {worker_id} could not claim a job: {e}", exc_info=True)
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job):
+        logger.info(f"Running {job.kind} job {job.id}")
+        try:
+            result = await self.handlers[job.kind](job.payload)
+        except Exception as e:
+            logger.error(f"{job.kind} job {job.id} failed: {e}", exc_info=True)
+            await self._fail(job, str(e))
+            return
+        try:
+            await asyncio.to_thread(self.queue.complete, job.id, result)
+        except Exception as e:
+            # E.g. a result that cannot be stored as JSON.
+            logger.error(f"Could not store the result of {job.kind} job {job.id}: {e}", exc_info=True)
+            await self._fail(job, f"Could not store the result: {e}")
+            return
+        logger.info(f"{job.kind} job {job.id} succeeded")
+
+    async def _fail(self, job: Job, error: str):
+        try:
+            await asyncio.to_thread(self.queue.fail, job.id, error)
+        except Exception as e:
+            # The job stays "running" until its lease runs out.
+            logger.error(f"Could not mark {job.kind} job {job.id} as failed: {e}", exc_info=True)
+
+_manager: Optional[JobManager] = None
+
+def get_job_manager() -> JobManager:
+    """
+    Returns the process-wide job manager, backed by the configured queue.
+    """
+    global _manager
+    if _manager is None:
+        _manager = JobManager(create_job_queue())
+    return _manager
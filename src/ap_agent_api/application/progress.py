@@ -0,0 +1,43 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
+from ap_agent_api.domain.models.events import StageEvent
+
+import coloredlogs, logging
+logger = logging.getLogger(__name__)
+coloredlogs.install(level='INFO', logger=logger)
+
+# Reports that a pipeline stage finished: emit("geocoded", longitude=..., latitude=...)
+EmitFn = Callable[..., None]
+
+
+async def stream_stage_events(produce: Callable[[EmitFn], Awaitable[None]]) -> AsyncIterator[StageEvent]:
+    """
+    Runs produce(emit) as a task and yields the events it emits as they happen.
+
+    A failure is reported as a final "error" event instead of being raised, as
+    the response has usually started by then. If the consumer stops early (e.g.
+    the client disconnected), the task is cancelled.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    start = time.perf_counter()
+
+    def emit(stage: str, **data):
+        queue.put_nowait(StageEvent(stage=stage, elapsed=time.perf_counter() - start, data=data))
+
+    async def run():
+        try:
+            await produce(emit)
+        except Exception as e:
+            logger.error(f"Streamed assessment failed: {e}", exc_info=True)
+            emit("error", message=str(e))
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while (event := await queue.get()) is not None:
+            yield event
+    finally:
+        task.cancel()
@@ -1,19 +1,61 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
 
+from ap_agent_api.config import AGENT_MAX_CONCURRENCY
 from ap_agent_api.domain.models.property import PropertyAddress, PropertyData
+from ap_agent_api.domain.models.events import StageEvent
 from ap_agent_api.domain.instructions.property_detail_inst import build_property_detail_inst
+from ap_agent_api.domain.utils import normalize_address
+from ap_agent_api.application.concurrency import StageLimiter
+from ap_agent_api.application.single_flight import SingleFlight
+from ap_agent_api.application.progress import EmitFn, stream_stage_events
 
 from ap_agent_api.infrastructure.llm_providers.openapi import create_search_agent
 
-# from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
+from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
+from ap_agent_api.infrastructure import metrics
 #this was done using port last time.
-from agents import Runner
+
+PROPERTY_DETAILS_FILENAME = 'property_details.json'
 
 import coloredlogs, logging
 logger = logging.getLogger(__name__)
 coloredlogs.install(level='INFO', logger=logger)
 
+# Identical searches that arrive while one is running share its agent run.
+_search_flight = SingleFlight()
+# Bounds the number of agent runs in flight.
+_limits = StageLimiter({"agent": AGENT_MAX_CONCURRENCY})
+
 async def run_property_search(address: PropertyAddress):
+    """
+    Runs the web-search agent for the address. Concurrent requests for the
+    same (normalized) address share a single agent run.
+    """
+    return await _search_flight.do(normalize_address(address), _run_property_search, address)
+
+@asynccontextmanager
+async def _agent_run():
+    """
+    Holds an agent slot and records the run's duration and outcome.
+    """
+    async with _limits("agent"):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            metrics.AGENT_RUN_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
+            if outcome == "error":
+                metrics.UPSTREAM_ERRORS.inc(upstream="agent")
 
+def _build_search(address: PropertyAddress):
+    """
+    Returns the search agent and the prompt for the address.
+    """
     instructions = build_property_detail_inst()
 
     search_agent = create_search_agent(instruction=instructions, output_type=PropertyData)
@@ -21,21 +63,109 @@ async def run_property_search(address: PropertyAddress):
     #Start the search.
     prompt = f"""Search for detailed publicly available information about the property located at:
         {address.street}, {address.suburb}, {address.state} {address.postcode}."""
+
+    return search_agent, prompt
+
+async def _run_property_search(address: PropertyAddress):
+    # The agents SDK (and openai) is loaded on the first search, not at API startup.
+    from agents import Runner
+
+    search_agent, prompt = _build_search(address)
     
     logger.info("Running property search and its risk assessment ...")
 
     # search_results = await search_agent.run(prompt)
-    search_results =  await Runner.run(search_agent, prompt)
+    async with _agent_run():
+        search_results =  await Runner.run(search_agent, prompt)
 
     search_output = search_results.final_output_as(
         PropertyData
     )
 
-    # file_repo = PropertyFileRepository()
-    # file_path = file_repo.save(property_address=address, search_output.model_dump(), 'property_details.json')
-
     return search_output
 
+async def _run_property_search_streamed(address: PropertyAddress, emit: EmitFn) -> PropertyData:
+    """
+    Runs the search agent, emitting "agent_step" events for its tool calls and
+    messages and "agent_output" events for each chunk of output text.
+    """
+    from agents import Runner
+
+    search_agent, prompt = _build_search(address)
+
+    logger.info("Running streamed property search ...")
+
+    async with _agent_run():
+        search_results = Runner.run_streamed(search_agent, prompt)
+        async for event in search_results.stream_events():
+            if event.type == "run_item_stream_event":
+                emit("agent_step", name=event.name)
+            elif event.type == "raw_response_event" and event.data.type == "response.output_text.delta":
+                emit("agent_output", delta=event.data.delta)
+
+    return search_results.final_output_as(PropertyData)
+
+# The result store is SQLite: its reads and writes run in worker threads, off
+# the event loop.
+
+async def get_stored_property_search_json(address: PropertyAddress) -> Optional[bytes]:
+    """
+    Returns the stored property data for the address as JSON bytes, ready to be
+    returned by the API, if it is still fresh.
+    """
+    return await asyncio.to_thread(
+        PropertyFileRepository().load_json, address, filename=PROPERTY_DETAILS_FILENAME, model_cls=PropertyData
+    )
+
+async def get_or_run_property_search(address: PropertyAddress) -> Tuple[PropertyData, bool]:
+    """
+    Returns the stored property data for the address if it is still fresh,
+    otherwise runs and stores a new search.
+
+    Returns:
+        tuple: (property data, True if it was loaded from the results store)
+    """
+    property_data = await asyncio.to_thread(
+        PropertyFileRepository().load_model, address, filename=PROPERTY_DETAILS_FILENAME, model_cls=PropertyData
+    )
+    if property_data is not None:
+        logger.info(f"Property data loaded from existing file for: {address.street}")
+        return property_data, True
+
+    return await run_and_save_property_search(address), False
+
+async def run_and_save_property_search(address: PropertyAddress) -> PropertyData:
+    """
+    Runs a new search and stores its result, without looking for a stored one
+    (for callers that already did, e.g. with get_stored_property_search_json).
+    """
+    property_data = await run_property_search(address)
+    file_path = await asyncio.to_thread(
+        PropertyFileRepository().save, property_address=address, data=property_data, filename=PROPERTY_DETAILS_FILENAME
+    )
+    logger.info(f"Property data for: {address.street} saved to {file_path}")
+    return property_data
+
+async def stream_property_search(address: PropertyAddress) -> AsyncIterator[StageEvent]:
+    """
+    Searches for the property, yielding the agent's progress as it happens and
+    a final "search_completed" event with the property data (or only that event
+    if a stored result is fresh). Failures end the stream with an "error" event.
+    """
+    async def produce(emit: EmitFn):
+        file_repo = PropertyFileRepository()
+        property_data = await asyncio.to_thread(
+            file_repo.load_model, address, filename=PROPERTY_DETAILS_FILENAME, model_cls=PropertyData
+        )
+        from_store = property_data is not None
+        if not from_store:
+            property_data = await _run_property_search_streamed(address, emit)
+            await asyncio.to_thread(file_repo.save, property_address=address, data=property_data, filename=PROPERTY_DETAILS_FILENAME)
+        emit("search_completed", property_data=property_data.model_dump(by_alias=True), from_store=from_store)
+
+    async for event in stream_stage_events(produce):
+        yield event
+
 if __name__ == '__main__':
     import asyncio
     
@@ -51,5 +181,5 @@ if __name__ == '__main__':
     logger.info(f"Property Search Result: {result}")
 
     file_repo = PropertyFileRepository()
-    file_path = file_repo.save(property_address=test_address, property_results=result)
+    file_path = file_repo.save(property_address=test_address, data=result, filename=PROPERTY_DETAILS_FILENAME)
     logger.info(f"Property data saved to: {file_path}")
\ No newline at end of file
@@ -0,0 +1,94 @@
+from typing import Dict, Optional
+
+from ap_agent_api.config import SCORING_PROCESS_WORKERS, SCORING_ENGINE, RASTER_STORE_ENABLED
+from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+from ap_agent_api.application.elevation_risk_service import ELEVATION_RISK_FILENAME
+
+from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
+from ap_agent_api.infrastructure.gis_image_generate import BOX_SIDE_METERS, LAYER_FILES
+from ap_agent_api.infrastructure.raster_store import get_raster_store
+
+# Raster store layer of the isolated contour masks.
+CONTOUR_MASK_LAYER = "contour_mask"
+# The raster store is compacted after a run when replaced masks take up at
+# least this share of its data file.
+RASTER_STORE_MAX_GARBAGE_RATIO = 0.5
+
+import coloredlogs, logging
+logger = logging.getLogger(__name__)
+coloredlogs.install(level='INFO', logger=logger)
+
+
+def rescore_stored_properties(max_workers: int = SCORING_PROCESS_WORKERS,
+                              suburb: Optional[str] = None, state: Optional[str] = None,
+                              use_raster_store: bool = RASTER_STORE_ENABLED) -> Dict[str, int]:
+    """
+    Re-scores the stored contour map of every property that has an elevation
+    risk assessment in the result store (optionally only those in a suburb or
+    state) across a process pool, and stores the new assessments.
+
+    With the raster store, properties whose isolated contour mask is stored
+    (and newer than their contour map) are scored from the memory-mapped mask;
+    the masks of the others are stored for the next run. Results are saved
+    one by one as they are scored, so memory does not grow with the number of
+    properties.
+
+    Returns:
+        dict: Number of properties "rescored", "failed", "missing_image" and
+            scored "from_raster_store".
+    """
+    if SCORING_ENGINE != "pixel":
+        # The new scores would not be on the scale of the assessments being run.
+        raise ValueError(f"Bulk re-scoring only supports the pixel engine, SCORING_ENGINE is '{SCORING_ENGINE}'")
+
+    # OpenCV and NumPy are only needed here, not by the importers of this module.
+    from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+
+    file_repo = PropertyFileRepository()
+    raster_store = get_raster_store() if use_raster_store else None
+    stored = file_repo.find_addresses(ELEVATION_RISK_FILENAME, suburb=suburb, state=state)
+
+    summary = {"rescored": 0, "failed": 0, "missing_image": 0, "from_raster_store": 0}
+    addresses, images = [], []
+    for address in stored:
+        image = file_repo.find_image(address, LAYER_FILES["contour"])
+        if image is None:
+            logger.warning(f"No stored contour map for: {address.street}, {address.suburb}")
+            summary["missing_image"] += 1
+            continue
+        mask = raster_store.get(address, CONTOUR_MASK_LAYER, newer_than=image.stat().st_mtime) if raster_store else None
+        if mask is not None:
+            risk = erc.score_mask(mask, box_side_metres=BOX_SIDE_METERS)
+            file_repo.save(property_address=address, data=ElevationRiskAssessment(**risk), filename=ELEVATION_RISK_FILENAME)
+            summary["rescored"] += 1
+            summary["from_raster_store"] += 1
+            continue
+        addresses.append(address)
+        images.append(image)
+
+    logger.info(f"Re-scoring {len(images)} contour maps and {summary['from_raster_store']} stored masks "
+                f"of {len(stored)} stored properties ...")
+    results = erc.iter_score_images(images, max_workers=max_workers, box_side_metres=BOX_SIDE_METERS,
+                                    return_masks=raster_store is not None)
+    for address, result in zip(addresses, results):
+        if not result.ok:
+            logger.error(f"Re-scoring failed for {address.street}, {address.suburb}: {result.error}")
+            summary["failed"] += 1
+            continue
+        if raster_store is not None:
+            raster_store.put(address, CONTOUR_MASK_LAYER, result.mask)
+        file_repo.save(property_address=address, data=ElevationRiskAssessment(**result.risk), filename=ELEVATION_RISK_FILENAME)
+        summary["rescored"] += 1
+
+    if raster_store is not None:
+        stats = raster_store.stats()
+        garbage = stats["file_bytes"] - stats["live_bytes"]
+        if garbage and garbage >= RASTER_STORE_MAX_GARBAGE_RATIO * stats["file_bytes"]:
+            raster_store.compact()
+
+    logger.info(f"Re-scoring finished: {summary}")
+    return summary
+
+if __name__ == "__main__":
+
+    rescore_stored_properties()
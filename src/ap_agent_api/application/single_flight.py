@@ -0,0 +1,43 @@
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight computation.
+
+    The first caller for a key starts the computation; callers that arrive while
+    it is running await the same result (or exception) instead of starting their
+    own. Once it finishes the key is released, so later calls run afresh.
+    """
+
+    def __init__(self):
+        # One table per event loop, as tasks cannot be shared across loops.
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+
+        task = calls.get(key)
+        if task is None:
+            task = loop.create_task(fn(*args, **kwargs))
+            calls[key] = task
+            task.add_done_callback(lambda done: calls.pop(key, None) if calls.get(key) is done else None)
+
+        # A caller giving up (e.g. a client disconnecting) must not cancel the
+        # computation the other callers are waiting on.
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """
+        Number of computations currently running on the calling thread's loop.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return 0
+        return len(self._calls.get(loop, {}))
@@ -7,3 +7,98 @@ BASE_DIR = Path(__file__).parent.parent.parent
 PROPERTY_RESULTS_DIR = BASE_DIR / "property_results"
 
 load_dotenv(dotenv_path=os.path.join(os.path.abspath(BASE_DIR), ".env"))
+
+# GIS layer fetching
+LAYER_FETCH_CONCURRENT = os.getenv("LAYER_FETCH_CONCURRENT", "true").lower() in ("1", "true", "yes")
+LAYER_FETCH_WORKERS = int(os.getenv("LAYER_FETCH_WORKERS", "8"))
+
+# Elevation risk service
+ELEVATION_MAX_CONCURRENCY = int(os.getenv("ELEVATION_MAX_CONCURRENCY", "32"))
+ELEVATION_IO_WORKERS = int(os.getenv("ELEVATION_IO_WORKERS", "16"))
+ELEVATION_CPU_WORKERS = int(os.getenv("ELEVATION_CPU_WORKERS", str(os.cpu_count() or 1)))
+# Per-stage limits, applied within the overall ELEVATION_MAX_CONCURRENCY.
+ELEVATION_GEOCODE_CONCURRENCY = int(os.getenv("ELEVATION_GEOCODE_CONCURRENCY", "8"))
+ELEVATION_LAYER_CONCURRENCY = int(os.getenv("ELEVATION_LAYER_CONCURRENCY", "8"))
+ELEVATION_SCORING_CONCURRENCY = int(os.getenv("ELEVATION_SCORING_CONCURRENCY", str(os.cpu_count() or 1)))
+
+# Contour scoring engine: "pixel" counts contour pixels per ring, "polyline"
+# measures contour lengths and slopes. Their scores are not on the same scale,
+# so change it only together with re-scoring every stored result; bulk
+# re-scoring supports the pixel engine only.
+SCORING_ENGINE = os.getenv("SCORING_ENGINE", "pixel").lower()
+SCORING_ENGINES = ("pixel", "polyline")
+if SCORING_ENGINE not in SCORING_ENGINES:
+    raise ValueError(f"SCORING_ENGINE must be one of {SCORING_ENGINES}, got {SCORING_ENGINE!r}")
+
+# Processes used to re-score stored contour maps in bulk.
+SCORING_PROCESS_WORKERS = int(os.getenv("SCORING_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+
+# Shared HTTP sessions
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+
+# Geocoding
+# Used when the locator does not report its own MaxBatchSize.
+GEOCODE_MAX_BATCH_SIZE = int(os.getenv("GEOCODE_MAX_BATCH_SIZE", "100"))
+GEOCODE_CACHE_ENABLED = os.getenv("GEOCODE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+GEOCODE_CACHE_PATH = Path(os.getenv("GEOCODE_CACHE_PATH", PROPERTY_RESULTS_DIR / "geocode_cache.sqlite3"))
+# Failed lookups are retried after this many seconds; matches never expire.
+GEOCODE_NEGATIVE_TTL_SECONDS = int(os.getenv("GEOCODE_NEGATIVE_TTL_SECONDS", "3600"))
+
+# Width and height (pixels) of the exported map images; 400 is the MapServer
+# default. Larger exports are scored with rings in metres, in tiles.
+MAP_EXPORT_SIZE = int(os.getenv("MAP_EXPORT_SIZE", "400"))
+
+# Map imagery: "export" requests a bbox image per address from MapServer/export,
+# "tiles" mosaics cached MapServer tiles (basemap layers only).
+MAP_FETCH_MODE = os.getenv("MAP_FETCH_MODE", "export").lower()
+TILE_CACHE_DIR = Path(os.getenv("TILE_CACHE_DIR", PROPERTY_RESULTS_DIR / "tiles"))
+TILE_LEVEL = int(os.getenv("TILE_LEVEL", "17"))
+# Size the mosaicked image is resampled to; 0 keeps the tile level's native
+# resolution (no resampling drift in the scores).
+TILE_OUTPUT_SIZE = int(os.getenv("TILE_OUTPUT_SIZE", "0"))
+
+# Fetched layer images: "async" writes them to the property directory in the
+# background, "sync" before returning, "none" keeps them in memory only.
+IMAGE_PERSIST_MODE = os.getenv("IMAGE_PERSIST_MODE", "async").lower()
+IMAGE_PERSIST_MODES = ("async", "sync", "none")
+if IMAGE_PERSIST_MODE not in IMAGE_PERSIST_MODES:
+    raise ValueError(f"IMAGE_PERSIST_MODE must be one of {IMAGE_PERSIST_MODES}, got {IMAGE_PERSIST_MODE!r}")
+
+# Result store: an SQLite index of the results, keyed by address hash, and a
+# directory of per-property blobs (layer images).
+RESULT_STORE_PATH = Path(os.getenv("RESULT_STORE_PATH", PROPERTY_RESULTS_DIR / "results.sqlite3"))
+RESULT_BLOB_DIR = Path(os.getenv("RESULT_BLOB_DIR", PROPERTY_RESULTS_DIR / "blobs"))
+# Stored results older than this are fetched again.
+ELEVATION_RISK_TTL_DAYS = float(os.getenv("ELEVATION_RISK_TTL_DAYS", "10"))
+PROPERTY_DETAILS_TTL_DAYS = float(os.getenv("PROPERTY_DETAILS_TTL_DAYS", "10"))
+
+# Raster store: decoded rasters (isolated contour masks) in a memory-mapped
+# file, so bulk re-scoring does not decode and isolate every PNG again.
+RASTER_STORE_ENABLED = os.getenv("RASTER_STORE_ENABLED", "false").lower() in ("1", "true", "yes")
+RASTER_STORE_DIR = Path(os.getenv("RASTER_STORE_DIR", PROPERTY_RESULTS_DIR / "rasters"))
+# Store binary masks with one bit per pixel instead of one byte.
+RASTER_STORE_PACK_MASKS = os.getenv("RASTER_STORE_PACK_MASKS", "true").lower() in ("1", "true", "yes")
+
+# In-process cache of validated results loaded by PropertyFileRepository
+RESULT_CACHE_MAXSIZE = int(os.getenv("RESULT_CACHE_MAXSIZE", "1024"))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+
+# Property search agent
+AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))
+
+# Batch scoring
+BATCH_MAX_ADDRESSES = int(os.getenv("BATCH_MAX_ADDRESSES", "1000"))
+
+# Background jobs: "memory" keeps the queue in-process, "sqlite" persists it
+# to JOB_QUEUE_PATH (shared by the API workers on one host).
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "memory")
+JOB_QUEUE_PATH = Path(os.getenv("JOB_QUEUE_PATH", PROPERTY_RESULTS_DIR / "jobs.sqlite3"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Idle workers re-check the queue this often (for jobs enqueued by other processes).
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+# Finished jobs (and their results) are kept this long, then removed.
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+# SQLite jobs still running after this long are assumed to belong to a crashed
+# worker and are queued again; keep it well above the longest job.
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "1800"))
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
+
+from ap_agent_api.domain.models.property import PropertyAddress, PropertyData
+from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+
+class BatchItemResult(BaseModel):
+    """Model representing the outcome of scoring one address of a batch."""
+    index: int = Field(..., description="Position of the address in the batch request")
+    address: PropertyAddress
+    success: bool = Field(..., description="True if every requested assessment succeeded")
+    elevation_risk: Optional[ElevationRiskAssessment] = None
+    property_data: Optional[PropertyData] = None
+    from_store: List[str] = Field(
+        default_factory=list, description="Assessments served from previously stored results"
+    )
+    errors: Dict[str, str] = Field(default_factory=dict, description="Assessment name -> error message")
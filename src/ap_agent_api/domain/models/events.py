@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict
+
+class StageEvent(BaseModel):
+    """Model representing progress of a long-running assessment."""
+    stage: str = Field(..., description="Pipeline stage, e.g. 'geocoded', 'layers_fetched', 'risk_scored'")
+    elapsed: float = Field(..., description="Seconds since the assessment started")
+    data: Dict[str, Any] = Field(default_factory=dict)
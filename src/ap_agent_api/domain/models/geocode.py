@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from ap_agent_api.domain.models.property import PropertyAddress
+
+class GeocodeResult(BaseModel):
+    """Model representing the geocoded location of a property address."""
+    address: PropertyAddress
+    found: bool = Field(..., description="True if the geocoder matched the address")
+    longitude: Optional[float] = Field(None, description="WGS 84 longitude (x)")
+    latitude: Optional[float] = Field(None, description="WGS 84 latitude (y)")
@@ -0,0 +1,22 @@
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(BaseModel):
+    """Model representing a background job and, once finished, its outcome."""
+    id: str
+    kind: str = Field(..., description="Job type, e.g. 'search' or 'elevation-risk'")
+    status: JobStatus = JobStatus.QUEUED
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = Field(..., description="Unix time the job was enqueued")
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
@@ -1,13 +1,19 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 class RiskCategory(BaseModel):
     """Model representing a risk category with count and density metrics."""
     count: int = Field(..., description="Number of risk indicators in this category")
     density: float = Field(..., description="Risk density score for this category")
+    slope: Optional[float] = Field(
+        None, description="Mean slope (rise over run) of the ring, from its contour spacing (polyline engine only)"
+    )
 
 class ElevationRiskAssessment(BaseModel):
     """Model representing elevation-based risk assessment for a property."""
+    # Saved results are dumped by field name, the calculator output uses the aliases.
+    model_config = ConfigDict(populate_by_name=True)
+
     high_risk_immediate_property: RiskCategory = Field(
         ..., 
         alias="High Risk (Immediate Property)",
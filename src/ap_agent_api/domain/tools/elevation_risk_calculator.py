@@ -1,9 +1,16 @@
 import cv2
 import numpy as np
 import math
-from typing import Dict, List, Tuple
-from matplotlib import pyplot as plt
-import random
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ap_agent_api.config import SCORING_ENGINES
 
 import logging
 logger = logging.getLogger(__name__)
@@ -16,145 +23,483 @@ RISK_RINGS = [
     (80, 200, 25, "Low Risk (Neighborhood Scale)"),
 ]
 
+# Ground size of a pixel of the default 400px map export (BOX_SIDE_METERS / 400),
+# which CENTER_PIXEL and RISK_RINGS are tuned to.
+METRES_PER_PIXEL = 305.748113 / 400
+# RISK_RINGS in metres (about 23 m, 61 m and 153 m), for maps of any resolution.
+RISK_RINGS_METRES = [
+    (r_min * METRES_PER_PIXEL, r_max * METRES_PER_PIXEL, factor, name)
+    for r_min, r_max, factor, name in RISK_RINGS
+]
+# Images larger than this (pixels) are isolated and scored in tiles.
+SCORING_TILE_SIZE = 1024
+# Each tile is processed with this many extra pixels on every side: the road
+# and label mask is dilated twice and the contours three times.
+TILE_HALO = 5
+
+# Polyline engine: assumed elevation step between contour lines on the basemap.
+CONTOUR_INTERVAL_METRES = 10.0
+# approxPolyDP tolerance (pixels) used to simplify the contour outlines.
+POLYLINE_EPSILON = 1.5
+ENGINES = SCORING_ENGINES
+
+# HSV ranges of the map features removed from the contour map.
+ROAD_HSV_RANGE = (np.array([0, 140, 200]), np.array([10, 255, 255]))
+LABEL_HSV_RANGE = (np.array([0, 0, 50]), np.array([179, 40, 230]))
+
+_scratch = threading.local()
+
 # --- IMAGE PROCESSING FUNCTIONS ---
-def subtract_roads_from_contours(contour_img_path: str) -> np.ndarray:
+def load_image(image) -> np.ndarray:
+    """
+    Returns a BGR image from a decoded ndarray, encoded image bytes (e.g. the
+    MapServer response body) or a file path.
+    """
+    if isinstance(image, np.ndarray):
+        return image
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        decoded = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if decoded is None:
+            raise ValueError("Could not decode image bytes")
+        return decoded
+    decoded = cv2.imread(str(image))
+    if decoded is None:
+        raise FileNotFoundError(f"Could not read image '{image}'")
+    return decoded
+
+def _scratch_buffers(shape: Tuple[int, int]):
+    """
+    Returns this thread's reusable (hsv, gray, mask, features) working buffers
+    for images of the given size.
+    """
+    buffers = getattr(_scratch, "buffers", None)
+    if buffers is None or buffers[1].shape != shape:
+        buffers = (
+            np.empty(shape + (3,), dtype=np.uint8),
+            np.empty(shape, dtype=np.uint8),
+            np.empty(shape, dtype=np.uint8),
+            np.empty(shape, dtype=np.uint8),
+        )
+        _scratch.buffers = buffers
+    return buffers
+
+def subtract_roads_from_contours(contour_img) -> np.ndarray:
     """
     Loads two images, converts them to grayscale, and subtracts the road features
     from the contour map to isolate only the elevation lines.
+
+    The road and label masks are built straight from the cv2.inRange output in
+    reused per-thread buffers; only the returned image is allocated per call.
+
+    Args:
+        contour_img: The contour map as a BGR ndarray, encoded bytes or a file path.
     
     Returns: A binary image where white pixels represent contours.
     """
     logger.debug("Isolating Contour Lines using Image Subtraction...")
     
-    # Load images as grayscale
     # NOTE: The images must be the same size and perfectly aligned.
-    contour_img = cv2.imread(contour_img_path)
-    img_hsv=cv2.cvtColor(contour_img, cv2.COLOR_BGR2HSV)
-    img_bin = cv2.cvtColor(contour_img, cv2.COLOR_BGR2GRAY)
-    _, img_bin = cv2.threshold(img_bin, 230, 255, cv2.THRESH_BINARY_INV)
-
-    # Removing the roads.
-    # lower mask (0-10)
-    lower_orange = np.array([0, 140, 200])
-    upper_orange = np.array([10, 255, 255])
-    road_mask = cv2.inRange(img_hsv, lower_orange, upper_orange)
-
-    # or your HSV image, which I *believe* is what you want
-    road_hsv = contour_img.copy()
-    road_hsv[np.where(road_mask==0)] = 0
-
-    # Removing the watermarks for the roads
-    lower_black = np.array([0, 0, 50])
-    upper_black = np.array([179, 40, 230])
-    label_mask = cv2.inRange(img_hsv, lower_black, upper_black)
-    labels_hsv = contour_img.copy()
-    labels_hsv[np.where(label_mask==0)] = 0
-
-    label_bin = cv2.cvtColor(labels_hsv, cv2.COLOR_BGR2GRAY)
-    _, label_bin = cv2.threshold(label_bin, 10, 255, cv2.THRESH_BINARY)
-    label_bin = cv2.dilate(label_bin, None, iterations=2)
-
-    road_bin = cv2.cvtColor(road_hsv, cv2.COLOR_BGR2GRAY)
-    _, road_bin = cv2.threshold(road_bin, 10, 255, cv2.THRESH_BINARY)
-    road_bin = cv2.dilate(road_bin, None, iterations=2)
-
-    isolated_contours = img_bin - road_bin - label_bin
-    _, isolated_contours = cv2.threshold(isolated_contours, 10, 255, cv2.THRESH_BINARY)
-    # cv2.morphologyEx(isolated_contours, cv2.MORPH_CLOSE, np.ones((3,3), np.uint8), isolated_contours, iterations=1)
-    cv2.dilate(isolated_contours, None, isolated_contours, iterations=3)
-
-    # plt.subplots(1,4, figsize=(15,5))
-    # plt.subplot(1,4,1)
-    # plt.imshow(img_bin, cmap='gray')
-    # plt.title("Original HSV Image")
-    # plt.subplot(1,4,2)
-    # plt.imshow(road_bin, cmap='gray')
-    # plt.title("Road Binary Image")
-    # plt.subplot(1,4,3)
-    # plt.imshow(label_bin, cmap='gray')
-    # plt.title("Label Binary Image")
-    # plt.subplot(1,4,4)
-    # plt.imshow(isolated_contours, cmap='gray')
-    # plt.title("Isolated Contours")
-    # plt.show()
+    contour_img = load_image(contour_img)
+    img_hsv, img_gray, mask, features = _scratch_buffers(contour_img.shape[:2])
+    cv2.cvtColor(contour_img, cv2.COLOR_BGR2HSV, dst=img_hsv)
+    cv2.cvtColor(contour_img, cv2.COLOR_BGR2GRAY, dst=img_gray)
+
+    # Roads (orange) and the watermarks for the roads (dark grey).
+    cv2.inRange(img_hsv, ROAD_HSV_RANGE[0], ROAD_HSV_RANGE[1], dst=features)
+    cv2.inRange(img_hsv, LABEL_HSV_RANGE[0], LABEL_HSV_RANGE[1], dst=mask)
+    cv2.bitwise_or(features, mask, dst=features)
+
+    # Only feature pixels brighter than 10 in grayscale are removed.
+    cv2.threshold(img_gray, 10, 255, cv2.THRESH_BINARY, dst=mask)
+    cv2.bitwise_and(features, mask, dst=features)
+    # Dilating the union equals the union of the dilated road and label masks.
+    cv2.dilate(features, None, dst=mask, iterations=2)
+
+    # Dark map pixels minus the roads and labels are the contour lines.
+    _, isolated_contours = cv2.threshold(img_gray, 230, 255, cv2.THRESH_BINARY_INV)
+    cv2.subtract(isolated_contours, mask, dst=isolated_contours)
+    cv2.dilate(isolated_contours, None, dst=isolated_contours, iterations=3)
     return isolated_contours
 
-def get_contour_pixels(isolated_contours: np.ndarray) -> List[Tuple[int, int]]:
+def _isolated_tiles(contour_img: np.ndarray, tile_size: int, window=None):
+    """
+    Isolates the contour lines tile by tile. Every tile is processed with a
+    TILE_HALO border of its neighbours, so its interior is identical to the
+    same region of subtract_roads_from_contours on the whole image, while
+    the working buffers only hold one tile.
+
+    Args:
+        window: Optional (x0, y0, x1, y1) region; tiles outside it are skipped.
+
+    Yields: (x0, y0, isolated tile) for every tile.
+    """
+    height, width = contour_img.shape[:2]
+    wx0, wy0, wx1, wy1 = window or (0, 0, width, height)
+    for y0 in range(max(0, wy0) // tile_size * tile_size, min(height, wy1), tile_size):
+        for x0 in range(max(0, wx0) // tile_size * tile_size, min(width, wx1), tile_size):
+            y1, x1 = min(y0 + tile_size, height), min(x0 + tile_size, width)
+            hy0, hx0 = max(0, y0 - TILE_HALO), max(0, x0 - TILE_HALO)
+            hy1, hx1 = min(height, y1 + TILE_HALO), min(width, x1 + TILE_HALO)
+            isolated = subtract_roads_from_contours(contour_img[hy0:hy1, hx0:hx1])
+            yield x0, y0, isolated[y0 - hy0:y1 - hy0, x0 - hx0:x1 - hx0]
+
+def subtract_roads_from_contours_tiled(contour_img, tile_size: int = SCORING_TILE_SIZE) -> np.ndarray:
+    """
+    Same result as subtract_roads_from_contours, computed in tiles of at most
+    tile_size pixels (see _isolated_tiles), for large map exports.
+    """
+    contour_img = load_image(contour_img)
+    isolated_contours = np.empty(contour_img.shape[:2], dtype=np.uint8)
+    for x0, y0, tile in _isolated_tiles(contour_img, tile_size):
+        isolated_contours[y0:y0 + tile.shape[0], x0:x0 + tile.shape[1]] = tile
+    return isolated_contours
+
+def get_contour_pixels(isolated_contours: np.ndarray) -> np.ndarray:
     """
     Finds the coordinates of all pixels that belong to a contour line.
+
+    Returns: An (N, 2) integer array of (x, y) pixel coordinates.
     """
     # Find all white pixels (where the value is 255)
     contour_coords = np.argwhere(isolated_contours == 255)
     # The result is (row, col) which corresponds to (y, x)
-    return [(c, r) for r, c in contour_coords]
+    return contour_coords[:, ::-1]
 
 # --- RISK ASSESSMENT FUNCTION ---
 
-def assess_ring_risk(contour_pixels: List[Tuple[int, int]], center: Tuple[int, int], rings: List[Tuple[int, int, int, str]]):
+def _ring_labels(distances: np.ndarray, rings) -> np.ndarray:
     """
-    Calculates the number of contour pixels (elevation changes) within concentric rings
-    radiating from the property center.
+    Maps every distance to the index of the first ring it falls into
+    (r_min <= distance < r_max). Distances outside all rings get len(rings).
+    """
+    labels = np.full(distances.shape, len(rings), dtype=np.uint8)
+    # Assign in reverse so that the first matching ring wins, as in a
+    # sequential first-match loop.
+    for index in range(len(rings) - 1, -1, -1):
+        r_min, r_max = rings[index][0], rings[index][1]
+        labels[(distances >= r_min) & (distances < r_max)] = index
+    return labels
+
+@lru_cache(maxsize=32)
+def _ring_label_grid(shape: Tuple[int, int], center: Tuple[int, int], rings: tuple) -> np.ndarray:
+    """
+    Precomputes the ring index of every pixel in an image of the given shape.
+    The grid only depends on the image size, center and rings, so it is cached
+    and shared between calls.
+    """
+    cx, cy = center
+    ys, xs = np.ogrid[:shape[0], :shape[1]]
+    distances = np.sqrt((xs - cx) ** 2 + (ys - cy) ** 2, dtype=np.float64)
+    labels = _ring_labels(distances, rings)
+    labels.setflags(write=False)
+    return labels
+
+def _risk_from_counts(counts, rings, pixel_scale: float = 1.0) -> Dict:
+    """
+    Builds the risk dictionary from per-ring pixel counts.
+
+    pixel_scale is the pixel size relative to the 400px export. Contour lines
+    are drawn the same number of pixels wide at any resolution, so counts grow
+    with the resolution and ring areas with its square; densities are scaled
+    back to the 400px export so that scores do not depend on the image size.
     """
-    logger.debug("Assessing Elevation Risk based on Contour Density in Rings...")
-    
     total_risk = 0.0
     # Initialize dictionary to store results for each ring
     risk_data = {r[3]: {"count": 0, "density": 0.0} for r in rings}
-    
-    # Define the image size (assuming square)
-    # img_size = isolated_contours.shape[0] 
-    
+
     # Calculate the area of each ring (A = pi * R^2) for density calculation
     ring_areas: Dict[str, float] = {}
-    
+
     prev_r2_area = 0.0
     for r_min, r_max, factor, name in rings:
         r_max_area = math.pi * (r_max ** 2)
         # Area of the current ring is the difference from the previous ring's outer area
         ring_area = r_max_area - prev_r2_area
-        ring_areas[name] = ring_area / factor  # Adjusted by risk factor
+        ring_areas[name] = ring_area * pixel_scale / factor  # Adjusted by risk factor
         prev_r2_area = r_max_area
 
-    # Iterate through every detected contour pixel
-    cx, cy = center
-    for px, py in contour_pixels:
-        # Calculate the Euclidean distance from the center
-        distance = math.hypot(px - cx, py - cy)
-        # Determine which ring the pixel falls into
-        for r_min, r_max, factor, name in rings:
-            if r_min <= distance < r_max:
-                risk_data[name]["count"] += 1
-                break
-                
+    for index, (_, _, _, name) in enumerate(rings):
+        risk_data[name]["count"] += int(counts[index])
+
     # Calculate density for comparison (Count / Area)
     for name, data in risk_data.items():
         if ring_areas[name] > 0:
             data["density"] = data["count"] / ring_areas[name]
             total_risk += data["density"]
 
-    risk_data["Total Risk Score"] = min(total_risk, 100)
-    return risk_data  # Cap total risk at 100
-    # return 
+    risk_data["Total Risk Score"] = min(total_risk, 100)  # Cap total risk at 100
+    return risk_data
+
+def assess_ring_risk(contour_pixels, center: Tuple[int, int], rings: List[Tuple[int, int, int, str]]):
+    """
+    Calculates the number of contour pixels (elevation changes) within concentric rings
+    radiating from the property center.
+
+    Args:
+        contour_pixels: (x, y) pixel coordinates, as an (N, 2) array or a list of tuples.
+        center: (x, y) pixel of the property.
+        rings: (r_min, r_max, factor, name) ring definitions.
+    """
+    logger.debug("Assessing Elevation Risk based on Contour Density in Rings...")
+
+    pixels = np.asarray(contour_pixels, dtype=np.int64).reshape(-1, 2)
+    cx, cy = center
+    dx = pixels[:, 0] - cx
+    dy = pixels[:, 1] - cy
+    # Calculate the Euclidean distance from the center
+    distances = np.sqrt(dx * dx + dy * dy, dtype=np.float64)
+    # Determine which ring each pixel falls into
+    labels = _ring_labels(distances, rings)
+    counts = np.bincount(labels, minlength=len(rings) + 1)
+    return _risk_from_counts(counts, rings)
+
+def assess_ring_risk_from_mask(isolated_contours: np.ndarray, center: Tuple[int, int], rings: List[Tuple[int, int, int, str]],
+                               pixel_scale: float = 1.0):
+    """
+    Same as assess_ring_risk, but works on the binary contour mask directly using
+    a precomputed ring grid, without materialising the pixel coordinates.
+    pixel_scale is passed to _risk_from_counts.
+    """
+    logger.debug("Assessing Elevation Risk based on Contour Density in Rings (mask)...")
+
+    grid = _ring_label_grid(isolated_contours.shape[:2], tuple(center), tuple(tuple(r) for r in rings))
+    counts = np.bincount(grid[isolated_contours == 255], minlength=len(rings) + 1)
+    return _risk_from_counts(counts, rings, pixel_scale)
+
+def rings_in_pixels(rings_metres, metres_per_pixel: float) -> List[Tuple[float, float, int, str]]:
+    """
+    Converts (r_min, r_max, factor, name) rings from metres to pixels of the
+    given size. Radii are rounded to 1e-6 px, so RISK_RINGS_METRES maps back
+    to exactly RISK_RINGS on the 400px export.
+    """
+    return [
+        (round(r_min / metres_per_pixel, 6), round(r_max / metres_per_pixel, 6), factor, name)
+        for r_min, r_max, factor, name in rings_metres
+    ]
+
+def assess_ring_risk_tiled(contour_img, center: Tuple[int, int], rings, tile_size: int = SCORING_TILE_SIZE,
+                           pixel_scale: float = 1.0) -> Dict:
+    """
+    Isolates the contours and counts them per ring tile by tile, skipping the
+    tiles outside the outermost ring, without holding a full-size mask or
+    working buffers. Gives the same result as assess_ring_risk_from_mask on the
+    subtract_roads_from_contours mask.
+    """
+    contour_img = load_image(contour_img)
+    cx, cy = center
+    reach = int(math.ceil(max(r[1] for r in rings)))
+    counts = np.zeros(len(rings) + 1, dtype=np.int64)
+    window = (cx - reach, cy - reach, cx + reach + 1, cy + reach + 1)
+    ring_key = tuple(tuple(r) for r in rings)
+    for x0, y0, tile in _isolated_tiles(contour_img, tile_size, window):
+        # The ring grids of the tiles are cached like the whole-image one.
+        grid = _ring_label_grid(tile.shape, (cx - x0, cy - y0), ring_key)
+        counts += np.bincount(grid[tile == 255], minlength=len(rings) + 1)
+    return _risk_from_counts(counts, rings, pixel_scale)
+
+class RingIndex:
+    """
+    Row-wise prefix sums of a contour mask, for counting contour pixels in
+    disks and rings around any number of centres.
+
+    A disk of radius r is counted with one prefix-sum lookup per row it spans,
+    O(r) instead of a pass over the whole image, so scoring K candidate centres
+    (lot centroid, parcel corners, neighbours) costs far less than K calls to
+    assess_ring_risk_from_mask. Counts are exact: a pixel is in a disk when
+    sqrt(dx * dx + dy * dy) < r, as in assess_ring_risk. Centres may be
+    fractional or lie outside the image.
+
+    Usage:
+        index = RingIndex(subtract_roads_from_contours(image))
+        risks = index.assess_many([(200, 200), (180, 190)], RISK_RINGS)
+    """
+
+    def __init__(self, isolated_contours: np.ndarray):
+        mask = isolated_contours == 255
+        self.shape = mask.shape
+        # prefix[y, x]: contour pixels in row y left of column x.
+        self.prefix = np.zeros((mask.shape[0], mask.shape[1] + 1), dtype=np.int32)
+        np.cumsum(mask, axis=1, dtype=np.int32, out=self.prefix[:, 1:])
+
+    def disk_count(self, center: Tuple[float, float], radius: float) -> int:
+        """
+        Number of contour pixels closer than radius to center (x, y).
+        """
+        if radius <= 0:
+            return 0
+        height, width = self.shape
+        cx, cy = center
+        ys = np.arange(max(0, math.floor(cy - radius)), min(height, math.ceil(cy + radius) + 1))
+        if len(ys) == 0:
+            return 0
+        dy = ys - cy
+        half_width = np.sqrt(np.maximum(radius * radius - dy * dy, 0.0))
+        lo = np.ceil(cx - half_width).astype(np.int64)
+        hi = np.floor(cx + half_width).astype(np.int64)
+
+        # The float extents can be one column off; fix them with the exact test.
+        def inside(x):
+            dx = x - cx
+            return np.sqrt(dx * dx + dy * dy, dtype=np.float64) < radius
+        lo = np.where(inside(lo - 1), lo - 1, np.where(inside(lo), lo, lo + 1))
+        hi = np.where(inside(hi + 1), hi + 1, np.where(inside(hi), hi, hi - 1))
+
+        lo = np.clip(lo, 0, width)
+        hi = np.clip(hi + 1, 0, width)
+        spans = hi > lo
+        return int((self.prefix[ys[spans], hi[spans]] - self.prefix[ys[spans], lo[spans]]).sum())
 
-def extract_contour_lines(binary_img, epsilon=1.5):
-    contours, _ = cv2.findContours(
-        binary_img,
-        cv2.RETR_EXTERNAL,
-        cv2.CHAIN_APPROX_NONE
-    )
+    def ring_counts(self, center: Tuple[float, float], rings: List[Tuple[int, int, int, str]]) -> np.ndarray:
+        """
+        Contour pixels in each ring (r_min <= distance < r_max) around center.
+        The rings must not overlap (as with first-match ring assignment).
+        """
+        bounds = sorted((r[0], r[1]) for r in rings)
+        if any(prev_max > next_min for (_, prev_max), (next_min, _) in zip(bounds, bounds[1:])):
+            raise ValueError("RingIndex requires non-overlapping rings")
+        disks = {}
+        for r_min, r_max, _, _ in rings:
+            for radius in (r_min, r_max):
+                if radius not in disks:
+                    disks[radius] = self.disk_count(center, radius)
+        return np.array([disks[r[1]] - disks[r[0]] for r in rings], dtype=np.int64)
+
+    def assess(self, center: Tuple[float, float], rings: List[Tuple[int, int, int, str]] = RISK_RINGS) -> Dict:
+        """
+        Same result as assess_ring_risk_from_mask for the indexed mask.
+        """
+        return _risk_from_counts(self.ring_counts(center, rings), rings)
+
+    def assess_many(self, centers, rings: List[Tuple[int, int, int, str]] = RISK_RINGS) -> List[Dict]:
+        """
+        Risk dictionaries for several centres, in order.
+        """
+        return [self.assess(center, rings) for center in centers]
+
+def extract_contour_lines(binary_img, epsilon=POLYLINE_EPSILON) -> List[np.ndarray]:
+    """
+    Traces the outlines of the contour lines in a binary mask and simplifies
+    them with approxPolyDP, from thousands of pixels to a few hundred vertices.
+
+    Every outline is closed (its first vertex is repeated at the end). A line
+    drawn a few pixels wide is traced on both sides, so the outlines are about
+    twice as long as the line itself.
+
+    Returns: A list of (N, 2) integer arrays of (x, y) vertices.
+    """
+    # RETR_LIST also keeps the outlines nested in closed contour loops.
+    contours, _ = cv2.findContours(binary_img, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)
     contour_lines = []
     for cnt in contours:
         # Simplify pixel chain → polyline
-        simplified = cv2.approxPolyDP(cnt, epsilon, closed=False)
+        simplified = cv2.approxPolyDP(cnt, epsilon, closed=True).reshape(-1, 2)
+        if len(simplified) >= 2:  # valid line
+            contour_lines.append(np.vstack([simplified, simplified[:1]]))
+    return contour_lines
 
-        # Convert to list of (x, y)
-        line = [(int(p[0][0]), int(p[0][1])) for p in simplified]
+def _ring_lengths(contour_lines, center: Tuple[float, float], rings) -> np.ndarray:
+    """
+    Length of the polylines inside each ring (r_min <= distance < r_max, first
+    match wins). Every segment is split where it crosses a ring circle, and
+    each piece is assigned to the ring of its midpoint.
+    """
+    if not contour_lines:
+        return np.zeros(len(rings))
+    points = np.concatenate(contour_lines).astype(np.float64)
+    # Consecutive points form the segments, except across two lines.
+    within_line = np.ones(len(points) - 1, dtype=bool)
+    within_line[np.cumsum([len(line) for line in contour_lines])[:-1] - 1] = False
+    segments = np.stack([points[:-1][within_line], points[1:][within_line]], axis=1)
+    start = segments[:, 0] - np.asarray(center, dtype=np.float64)
+    direction = segments[:, 1] - segments[:, 0]
 
-        if len(line) > 2:  # valid line
-            contour_lines.append(line)
-    return contour_lines
+    # |start + t * direction|^2 = r^2 is a quadratic a t^2 + b t + c = 0 in t.
+    a = (direction * direction).sum(axis=1)[:, None]
+    b = 2 * (start * direction).sum(axis=1)[:, None]
+    c = (start * start).sum(axis=1)[:, None]
+    radii = np.unique([r for ring in rings for r in ring[:2] if r > 0]).astype(np.float64)
+    root = np.sqrt(np.maximum(b * b - 4 * a * (c - radii * radii), 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossings = np.concatenate([(-b - root) / (2 * a), (-b + root) / (2 * a)], axis=1)
+    # Segments missing a circle get a harmless extra split; zero-length ones none.
+    crossings = np.clip(np.nan_to_num(crossings), 0.0, 1.0)
+
+    ends = np.broadcast_to([0.0, 1.0], (len(segments), 2))
+    ts = np.sort(np.concatenate([ends, crossings], axis=1), axis=1)
+    pieces = np.diff(ts, axis=1) * np.sqrt(a)
+    midpoints = start[:, None, :] + ((ts[:, 1:] + ts[:, :-1]) / 2)[..., None] * direction[:, None, :]
+    labels = _ring_labels(np.sqrt((midpoints * midpoints).sum(axis=-1)), rings)
+    return np.bincount(labels.ravel(), weights=pieces.ravel(), minlength=len(rings) + 1)[:len(rings)]
+
+def _ring_window(isolated_contours: np.ndarray, center: Tuple[int, int], rings) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Crops the mask to the square around the outermost ring, so that only the
+    contours that can fall in a ring are traced. Outlines closed along the crop
+    edge lie at or beyond the outer radius, so the ring lengths only change
+    where approxPolyDP moves a vertex near the edge (by at most its epsilon).
+
+    Returns: The cropped mask and the center in its coordinates.
+    """
+    reach = int(math.ceil(max(r[1] for r in rings)))
+    cx, cy = center
+    x0, y0 = max(0, cx - reach), max(0, cy - reach)
+    return isolated_contours[y0:cy + reach + 1, x0:cx + reach + 1], (cx - x0, cy - y0)
+
+def _isolate_ring_window(contour_img: np.ndarray, center: Tuple[int, int], rings,
+                         tile_size: int = SCORING_TILE_SIZE) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Isolates the contours of the square around the outermost ring only, with
+    a TILE_HALO border of map around it (as _isolated_tiles does), so the
+    result equals _ring_window of the whole-image mask without isolating the
+    rest of the map.
+
+    Returns: The isolated window and the center in its coordinates.
+    """
+    reach = int(math.ceil(max(r[1] for r in rings)))
+    height, width = contour_img.shape[:2]
+    cx, cy = center
+    x0, y0 = max(0, cx - reach), max(0, cy - reach)
+    x1, y1 = min(width, cx + reach + 1), min(height, cy + reach + 1)
+    hx0, hy0 = max(0, x0 - TILE_HALO), max(0, y0 - TILE_HALO)
+    hx1, hy1 = min(width, x1 + TILE_HALO), min(height, y1 + TILE_HALO)
+    region = contour_img[hy0:hy1, hx0:hx1]
+    if max(region.shape[:2]) > tile_size:
+        isolated = subtract_roads_from_contours_tiled(region, tile_size)
+    else:
+        isolated = subtract_roads_from_contours(region)
+    return isolated[y0 - hy0:y1 - hy0, x0 - hx0:x1 - hx0], (cx - x0, cy - y0)
+
+def assess_ring_risk_by_contours(contour_lines, center: Tuple[float, float], rings: List[Tuple[int, int, int, str]],
+                                 metres_per_pixel: float = METRES_PER_PIXEL):
+    """
+    Polyline version of assess_ring_risk: the "count" of a ring is the length
+    (pixels) of contour line inside it rather than the number of mask pixels,
+    so it does not depend on how thick the lines are drawn, and the scores are
+    not on the same scale as the pixel engine's.
+
+    Each ring also gets a "slope" (rise over run) from the spacing of its
+    contour lines: a ring of area A holding a length L of contours spaced s
+    apart has s = A / L, so slope = CONTOUR_INTERVAL_METRES / (s * metres_per_pixel).
+
+    Args:
+        contour_lines: Closed outlines from extract_contour_lines.
+        center: (x, y) pixel of the property.
+        rings: (r_min, r_max, factor, name) ring definitions.
+        metres_per_pixel: Ground size of a pixel of the map.
+    """
+    # Outlines run along both sides of each line.
+    lengths = _ring_lengths(contour_lines, center, rings) / 2
+    risk_data = _risk_from_counts(np.rint(lengths), rings, metres_per_pixel / METRES_PER_PIXEL)
+    for (r_min, r_max, _, name), length in zip(rings, lengths):
+        area = math.pi * (r_max ** 2 - r_min ** 2)
+        risk_data[name]["slope"] = float(CONTOUR_INTERVAL_METRES * length / (area * metres_per_pixel)) if area > 0 else 0.0
+    return risk_data
 
 def visualize_colored_contours(contour_lines, image_shape=None):
+    # Debugging aid only, so matplotlib is not a load-time dependency.
+    from matplotlib import pyplot as plt
+    import random
+
     plt.figure(figsize=(8, 8))
 
     for line in contour_lines:
@@ -176,30 +521,185 @@ def visualize_colored_contours(contour_lines, image_shape=None):
     plt.axis("equal")
     plt.show()
 
-def calculate(image_path):
+def _scoring_frame(shape: Tuple[int, int], box_side_metres: Optional[float]):
+    """
+    Returns the (center, rings, metres_per_pixel) to score an image of the given
+    (height, width) with: the 400px constants, or the image centre and
+    RISK_RINGS_METRES in its pixels when the map's ground width is known.
+    """
+    if box_side_metres is None:
+        return CENTER_PIXEL, RISK_RINGS, METRES_PER_PIXEL
+    height, width = shape
+    metres_per_pixel = box_side_metres / width
+    return (width // 2, height // 2), rings_in_pixels(RISK_RINGS_METRES, metres_per_pixel), metres_per_pixel
+
+def calculate(image, timings: Dict[str, float] = None, engine: str = "pixel",
+              box_side_metres: Optional[float] = None, tile_size: int = SCORING_TILE_SIZE):
+    """
+    Scores the elevation risk of a contour map.
+
+    Args:
+        image: The contour map as a BGR ndarray, encoded bytes or a file path.
+        timings: If given, filled with the seconds spent in each step
+            ("decode", "isolation", "scoring"). Large maps scored with the
+            pixel engine isolate and count each tile in one step, timed as
+            "tiled_scoring" instead of "isolation" and "scoring".
+        engine: "pixel" counts contour pixels per ring, "polyline" measures
+            contour line lengths and slopes per ring (see
+            assess_ring_risk_by_contours).
+        box_side_metres: Ground width of the map. If given, the property is
+            the image centre and RISK_RINGS_METRES are scaled to the image
+            size, so maps of any export size are scored alike; otherwise the
+            400px CENTER_PIXEL and RISK_RINGS are used as they are.
+        tile_size: Images larger than this are processed in tiles of this
+            size, bounding the working memory.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown scoring engine '{engine}', expected one of {ENGINES}")
     try:
-        # 1. Image Processing: Isolate Contours
-        isolated_contours = subtract_roads_from_contours(image_path)
+        start = time.perf_counter()
+        image = load_image(image)
+        decoded = time.perf_counter()
 
-        # c_lines = extract_contour_lines(isolated_contours, epsilon=2.0)
+        center, rings, metres_per_pixel = _scoring_frame(image.shape[:2], box_side_metres)
+        pixel_scale = metres_per_pixel / METRES_PER_PIXEL
+        tiled = max(image.shape[:2]) > tile_size
 
-        # visualize_colored_contours(c_lines, image_shape=isolated_contours.shape)
-        
-        # 2. Extract Contour Pixel Coordinates
-        contour_pixels = get_contour_pixels(isolated_contours)
+        if engine == "pixel" and tiled:
+            # Isolation and ring counting are done together, tile by tile.
+            risk_results = assess_ring_risk_tiled(image, center, rings, tile_size, pixel_scale)
+            if timings is not None:
+                timings.update(decode=decoded - start, tiled_scoring=time.perf_counter() - decoded)
+            return risk_results
+        elif engine == "polyline":
+            # Only the contours that can fall in a ring are isolated and traced.
+            window, window_center = _isolate_ring_window(image, center, rings, tile_size)
+            isolated = time.perf_counter()
+            c_lines = extract_contour_lines(window)
+            # visualize_colored_contours(c_lines, image_shape=window.shape)
+            risk_results = assess_ring_risk_by_contours(c_lines, window_center, rings, metres_per_pixel)
+        else:
+            # 1. Image Processing: Isolate Contours
+            isolated_contours = subtract_roads_from_contours(image)
+            isolated = time.perf_counter()
 
-        # 3. Risk Assessment: Calculate Contour Density in Rings
-        risk_results = assess_ring_risk(contour_pixels, CENTER_PIXEL, RISK_RINGS)
-        # risk_results_by_contours = assess_ring_risk_by_contours(c_lines, CENTER_PIXEL, RISK_RINGS)
+            # 2. Risk Assessment: Calculate Contour Density in Rings
+            risk_results = assess_ring_risk_from_mask(isolated_contours, center, rings, pixel_scale)
         # logger.debug(f"Risk Results: {risk_results}")
+        if timings is not None:
+            timings.update(
+                decode=decoded - start,
+                isolation=isolated - decoded,
+                scoring=time.perf_counter() - isolated,
+            )
         return risk_results
         
     except FileNotFoundError as e:
-        logger.error(f"Fatal Error: {e}. Please ensure '{image_path}' are in the correct directory.")
+        logger.error(f"Fatal Error: {e}. Please ensure the contour image is in the correct directory.")
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e}")
 
 
+# --- BATCH SCORING ---
+
+@dataclass
+class ScoreResult:
+    """Outcome of scoring one image of a batch; exactly one of risk/error is set."""
+    index: int
+    risk: Optional[Dict] = None
+    error: Optional[str] = None
+    # The isolated contour mask, when requested with return_masks.
+    mask: Optional[np.ndarray] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def score_mask(isolated_contours: np.ndarray, box_side_metres: Optional[float] = None) -> Dict:
+    """
+    Scores an isolated contour mask (e.g. one kept in a raster store) like
+    calculate scores the image it was isolated from, without decoding or
+    isolating anything.
+    """
+    center, rings, metres_per_pixel = _scoring_frame(isolated_contours.shape[:2], box_side_metres)
+    return assess_ring_risk_from_mask(isolated_contours, center, rings, metres_per_pixel / METRES_PER_PIXEL)
+
+def _score_one(image, box_side_metres: Optional[float] = None,
+               return_mask: bool = False) -> Tuple[Optional[Dict], Optional[np.ndarray], Optional[str]]:
+    """
+    Scores one image, returning (risk, mask, None) or (None, None, error)
+    instead of raising. The mask is only returned with return_mask.
+    """
+    try:
+        image = load_image(image)
+        tiled = max(image.shape[:2]) > SCORING_TILE_SIZE
+        if tiled and not return_mask:
+            center, rings, metres_per_pixel = _scoring_frame(image.shape[:2], box_side_metres)
+            return assess_ring_risk_tiled(image, center, rings, pixel_scale=metres_per_pixel / METRES_PER_PIXEL), None, None
+        if tiled:
+            isolated_contours = subtract_roads_from_contours_tiled(image)
+        else:
+            isolated_contours = subtract_roads_from_contours(image)
+        return score_mask(isolated_contours, box_side_metres), isolated_contours if return_mask else None, None
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+
+def _init_scoring_worker():
+    # One OpenCV thread per process; the pool provides the parallelism.
+    cv2.setNumThreads(1)
+
+def iter_score_images(images: Iterable, max_workers: Optional[int] = None, chunksize: int = 4,
+                      box_side_metres: Optional[float] = None, return_masks: bool = False) -> Iterator[ScoreResult]:
+    """
+    Scores many contour maps across a pool of processes, yielding a
+    ScoreResult per image in input order as soon as it is ready.
+
+    Paths are sent to the workers, which read and decode the images themselves;
+    encoded bytes and ndarrays are pickled to them. The workers are spawned
+    (not forked), so this is safe to call from a threaded process. At most a
+    few chunks per worker are in flight, so the results (and masks) held at
+    once are bounded however many images there are.
+
+    Args:
+        images: Contour maps as file paths, encoded bytes or BGR ndarrays.
+        max_workers: Number of processes, defaults to the number of cores.
+            With one worker (or one image) the batch is scored in-process.
+        chunksize: Images sent to a worker at a time.
+        box_side_metres: Ground width of the maps, as in calculate.
+        return_masks: Also return the isolated contour masks (e.g. to store
+            them), which are pickled back from the workers.
+    """
+    images = [str(image) if isinstance(image, os.PathLike) else image for image in images]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(images))
+    score_one = partial(_score_one, box_side_metres=box_side_metres, return_mask=return_masks)
+    if max_workers <= 1:
+        for index, (risk, mask, error) in enumerate(map(score_one, images)):
+            yield ScoreResult(index=index, risk=risk, error=error, mask=mask)
+        return
+
+    logger.info(f"Scoring {len(images)} images on {max_workers} processes ...")
+    window = max_workers * chunksize * 2
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_scoring_worker
+    ) as executor:
+        for start in range(0, len(images), window):
+            outcomes = executor.map(score_one, images[start:start + window], chunksize=chunksize)
+            for index, (risk, mask, error) in enumerate(outcomes, start=start):
+                yield ScoreResult(index=index, risk=risk, error=error, mask=mask)
+
+def score_images(images: Iterable, max_workers: Optional[int] = None, chunksize: int = 4,
+                 box_side_metres: Optional[float] = None, return_masks: bool = False) -> List[ScoreResult]:
+    """
+    Scores many contour maps across a pool of processes (see iter_score_images).
+
+    Returns:
+        list: A ScoreResult per image, in input order.
+    """
+    return list(iter_score_images(images, max_workers, chunksize, box_side_metres, return_masks))
+
+
 # --- MAIN EXECUTION ---
 
 if __name__ == "__main__":
@@ -1,18 +1,84 @@
 
 
-from ap_agent_api.config import PROPERTY_RESULTS_DIR
+from ap_agent_api.config import RESULT_BLOB_DIR
 from pathlib import Path
+import hashlib
+import re
 
-def get_property_directory(property_address) -> str:
+# Street type variants -> canonical abbreviation used for address matching.
+STREET_TYPE_ABBREVIATIONS = {
+    "street": "st",
+    "road": "rd",
+    "avenue": "ave",
+    "av": "ave",
+    "crescent": "cres",
+    "cr": "cres",
+    "drive": "dr",
+    "court": "ct",
+    "place": "pl",
+    "terrace": "tce",
+    "parade": "pde",
+    "lane": "ln",
+    "highway": "hwy",
+    "boulevard": "bvd",
+    "boulevarde": "bvd",
+    "close": "cl",
+    "grove": "gr",
+    "circuit": "cct",
+    "square": "sq",
+}
+
+def get_property_key(property_address) -> str:
     """
-    Get the directory path for a given property address.
+    Get the key under which results for a property address are stored: the
+    SHA-256 of its normalized address, so the same street in different
+    suburbs does not collide.
+
+    Args:
+        property_address: Property address object.
+
+    Returns:
+        str: The property key (also the name of its blob directory).
+    """
+    return hashlib.sha256(normalize_address(property_address).encode("utf-8")).hexdigest()
+
+def get_property_directory(property_address) -> Path:
+    """
+    Get the blob directory (layer images) for a given property address.
     
     Args:
-        property_address: Property address object with street attribute.
+        property_address: Property address object.
         
     Returns:
-        str: The full directory path for the property.
+        Path: The full directory path for the property.
     """
-    output_dir = Path(PROPERTY_RESULTS_DIR) / (property_address.street.replace(" ", "_"))
+    key = get_property_key(property_address)
+    output_dir = Path(RESULT_BLOB_DIR) / key[:2] / key
     output_dir.mkdir(parents=True, exist_ok=True)
-    return output_dir
\ No newline at end of file
+    return output_dir
+
+def normalize_address(address) -> str:
+    """
+    Normalize an address so that trivially different spellings compare equal.
+
+    Lower-cases, drops punctuation, collapses whitespace and maps street type
+    variants ("Street", "St.", "ST") to one abbreviation.
+
+    Args:
+        address: Property address object or an address string.
+
+    Returns:
+        str: The normalized address, e.g. "1c raymel cres, campbelltown, sa, 5074".
+    """
+    if isinstance(address, str):
+        parts = address.split(",")
+    else:
+        parts = [address.street, address.suburb, address.state, address.postcode]
+
+    normalized_parts = []
+    for part in parts:
+        words = re.sub(r"[^\w\s/-]", " ", part.lower()).split()
+        words = [STREET_TYPE_ABBREVIATIONS.get(word, word) for word in words]
+        if words:
+            normalized_parts.append(" ".join(words))
+    return ", ".join(normalized_parts)
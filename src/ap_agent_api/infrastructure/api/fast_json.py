@@ -0,0 +1,39 @@
+"""
+Fast JSON responses.
+
+FastAPI validates a returned model against the response_model again and then
+serializes it through jsonable_encoder and json.dumps. Returning these
+responses skips that work: models are dumped once by pydantic-core, other
+content by orjson, and results that are already serialized are spliced into
+the response envelope as they are.
+"""
+
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+
+from ap_agent_api.infrastructure import serialization
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that serializes with pydantic-core / orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return serialization.dumps(content)
+
+
+class RawJSONResponse(JSONResponse):
+    """JSONResponse for a body that is already serialized JSON bytes."""
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+def envelope_response(message: str, data_json: bytes, success: bool = True,
+                      timestamp: Optional[str] = None) -> RawJSONResponse:
+    """
+    Builds a BaseResponse-shaped body ({"success", "message", "timestamp",
+    "data"}) around data that is already serialized, without parsing it.
+    """
+    head = serialization.dumps({"success": success, "message": message, "timestamp": timestamp})
+    return RawJSONResponse(content=head[:-1] + b',"data":' + data_json + b"}")
@@ -4,14 +4,18 @@ FastAPI main application module.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi import HTTPException
 from fastapi.openapi.utils import get_openapi
 from fastapi.openapi.docs import get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 import logging
 
-from .routers import property_router, elevation_risk_router
+from .routers import property_router, elevation_risk_router, geocode_router, batch_router, jobs_router
+from ap_agent_api.application import elevation_risk_service, job_service
+from ap_agent_api.infrastructure import gis_image_generate, http_clients, metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +37,21 @@ tags_metadata = [
     },
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: starts the background job workers, and releases them,
+    pooled HTTP connections and worker pools on shutdown.
+    """
+    job_manager = job_service.get_job_manager()
+    await job_manager.start()
+    yield
+    logger.info("Shutting down: closing HTTP sessions and worker pools")
+    await job_manager.stop()
+    http_clients.close_sessions()
+    gis_image_generate.shutdown_executors(wait=False)
+    elevation_risk_service.shutdown_executors(wait=False)
+
 # Create FastAPI app with enhanced Swagger configuration
 app = FastAPI(
     title="Property AI Agent API",
@@ -63,7 +82,8 @@ The API returns comprehensive property data including risk factors and recommend
     openapi_tags=tags_metadata,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -88,6 +108,24 @@ app.include_router(
     tags=["risks"]
 )
 
+app.include_router(
+    geocode_router.router,
+    prefix="/geocode",
+    tags=["geocode"]
+)
+
+app.include_router(
+    batch_router.router,
+    prefix="",
+    tags=["batch"]
+)
+
+app.include_router(
+    jobs_router.router,
+    prefix="/jobs",
+    tags=["jobs"]
+)
+
 @app.get("/", tags=["health"])
 async def root():
     """
@@ -113,9 +151,18 @@ async def health_check():
         "status": "healthy", 
         "service": "property-ai-agent-api",
         "version": "0.1.0",
-        "timestamp": "2025-12-15T00:00:00Z"
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Prometheus metrics: stage latencies (geocoding, layer fetches, contour
+    decoding, isolation and scoring, agent runs), cache hit ratios and
+    upstream error counts.
+    """
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 # Custom OpenAPI schema for enhanced Swagger documentation
 def custom_openapi():
     if app.openapi_schema:
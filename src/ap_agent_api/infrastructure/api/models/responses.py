@@ -4,8 +4,10 @@ API response models.
 
 from pydantic import BaseModel, Field
 from typing import Optional, Any, List, Dict
-from ap_agent_api.domain.models.property import PropertyData
+from ap_agent_api.domain.models.property import PropertyAddress, PropertyData
 from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+from ap_agent_api.domain.models.geocode import GeocodeResult
+from ap_agent_api.domain.models.job import Job
 
 class BaseResponse(BaseModel):
     """Base response model for all API responses."""
@@ -29,6 +31,27 @@ class ElevationRiskResponse(BaseResponse):
     success: bool = True
     data: Optional[ElevationRiskAssessment] = None
 
+class ScoredProperty(BaseModel):
+    """A stored elevation risk assessment and when it was made."""
+    address: PropertyAddress
+    fetched_at: float = Field(..., description="Unix time the assessment was made")
+    elevation_risk: ElevationRiskAssessment
+
+class ScoredPropertiesResponse(BaseResponse):
+    """Response model for querying stored elevation risk assessments."""
+    success: bool = True
+    data: List[ScoredProperty] = Field(default_factory=list)
+
+class BatchGeocodeResponse(BaseResponse):
+    """Response model for the batch geocoding endpoint."""
+    success: bool = True
+    data: List[GeocodeResult] = Field(default_factory=list)
+
+class JobResponse(BaseResponse):
+    """Response model for the background job endpoints."""
+    success: bool = True
+    data: Optional[Job] = None
+
 class ValidationErrorResponse(BaseResponse):
     """Validation error response model."""
     success: bool = False
@@ -40,4 +63,11 @@ class PropertySearchRequest(BaseModel):
     address: str
     include_risk_assessment: bool = True
     include_financial_data: bool = True
-    include_zoning_info: bool = True
\ No newline at end of file
+    include_zoning_info: bool = True
+
+class BatchAssessmentRequest(BaseModel):
+    """Request model for scoring a portfolio of addresses."""
+    addresses: List[PropertyAddress] = Field(..., min_length=1)
+    include_property_search: bool = Field(
+        False, description="Also run the AI property search for each address"
+    )
@@ -0,0 +1,80 @@
+"""
+Bulk portfolio scoring endpoints.
+"""
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+import logging
+
+from ap_agent_api.application.batch_service import score_portfolio
+from ap_agent_api.config import BATCH_MAX_ADDRESSES
+from ..models.responses import BatchAssessmentRequest
+
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    summary="Score a Portfolio of Properties",
+    description=f"""
+    **Elevation risk (and optionally the AI property search) for many addresses at once**
+
+    Results are streamed back as newline-delimited JSON, one `BatchItemResult` per line,
+    in completion order. Each line carries the `index` of its address in the request.
+    Properties with stored results come back immediately. At most {BATCH_MAX_ADDRESSES}
+    addresses per request.
+
+    **Example Request:**
+    ```json
+    {{
+        "addresses": [
+            {{
+                "street": "1c Raymel Crescent",
+                "suburb": "Campbelltown",
+                "state": "SA",
+                "postcode": "5074"
+            }}
+        ],
+        "include_property_search": false
+    }}
+    ```
+    """,
+    response_description="Newline-delimited JSON stream of per-address results",
+    responses={
+        200: {
+            "description": "Stream of per-address results",
+            "content": {"application/x-ndjson": {}},
+        },
+        422: {
+            "description": "Validation error - Invalid address format or too many addresses",
+        },
+    }
+)
+async def score_batch(request: BatchAssessmentRequest) -> StreamingResponse:
+    """
+    Score a list of property addresses.
+
+    Args:
+        request: Addresses to score and the assessments to run
+
+    Returns:
+        StreamingResponse: One JSON line per address, as each completes
+
+    Raises:
+        HTTPException: If the batch is larger than BATCH_MAX_ADDRESSES
+    """
+    if len(request.addresses) > BATCH_MAX_ADDRESSES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch of {len(request.addresses)} addresses exceeds the limit of {BATCH_MAX_ADDRESSES}"
+        )
+
+    logger.info(f"Starting batch scoring for {len(request.addresses)} addresses")
+
+    async def stream():
+        async for item in score_portfolio(request.addresses, request.include_property_search):
+            yield item.model_dump_json(by_alias=True) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -3,17 +3,24 @@ Property-related API endpoints.
 """
 
 from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
 import os
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from ap_agent_api.domain.models.property import PropertyAddress, PropertyData
 from ap_agent_api.domain.models.risks import ElevationRiskAssessment
-from ap_agent_api.application.elevation_risk_service import run_elevation_risk_assessment
-from ..models.responses import ElevationRiskResponse, ErrorResponse
+from ap_agent_api.application.elevation_risk_service import (
+    ELEVATION_RISK_FILENAME, get_stored_elevation_risk_json, run_and_save_elevation_risk_assessment,
+    stream_elevation_risk_assessment
+)
+from ..fast_json import FastJSONResponse, envelope_response
+from ..streaming import stage_event_response, STREAM_RESPONSES
+from ..models.responses import ElevationRiskResponse, ErrorResponse, ScoredPropertiesResponse, ScoredProperty
 from ap_agent_api.config import PROPERTY_RESULTS_DIR
 
 
@@ -93,32 +100,21 @@ async def assess_elevation_risk(address: PropertyAddress) -> ElevationRiskRespon
     try:
         logger.info(f"Starting elevation risk assessment for: {address.street}, {address.suburb}, {address.state}")
         
-        file_repo = PropertyFileRepository()
-        filename = 'elevation_risk.json'
-        # check if results already exist
-        risk_data = file_repo.load(address, filename=filename)
-        
-        if risk_data:
-            logger.info(f"Property data loaded from existing file for: {address.street}")
-            risk_data = ElevationRiskAssessment.model_validate_json(risk_data)
-            return ElevationRiskResponse(
-                success=True,
-                message="Property data loaded from existing file",
-                data=risk_data
-            )
+        # Fresh stored results are returned as stored, without re-validating
+        # or re-serializing them.
+        stored_json = await get_stored_elevation_risk_json(address)
+        if stored_json is not None:
+            return envelope_response("Property data loaded from existing file", stored_json)
 
-        # Call the application service
-        risk_data = await run_elevation_risk_assessment(address)
+        risk_data = await run_and_save_elevation_risk_assessment(address)
 
-        file_path = file_repo.save(property_address=address, data=risk_data.model_dump(), filename=filename)
-        
-        logger.info(f"Elevation risk assessment completed successfully for: {address.street} and saved to {file_path}")
+        logger.info(f"Elevation risk assessment completed successfully for: {address.street}")
         
-        return ElevationRiskResponse(
+        return FastJSONResponse(ElevationRiskResponse(
             success=True,
             message="Elevation risk assessment completed successfully",
             data=risk_data
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Elevation risk assessment failed for {address.street}: {str(e)}", exc_info=True)
@@ -127,6 +123,65 @@ async def assess_elevation_risk(address: PropertyAddress) -> ElevationRiskRespon
             detail=f"Elevation risk assessment failed: {str(e)}"
         )
 
+@router.post(
+    "/elevation-risk/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream Elevation Risk Assessment Progress",
+    description="""
+    **Same as `/elevation-risk`, reporting each stage as it completes**
+
+    Events are streamed as newline-delimited JSON, or as Server-Sent Events when the
+    request has `Accept: text/event-stream`. Each event has a `stage`, the `elapsed`
+    seconds and stage `data`:
+    - `geocoded`: the WGS 84 location of the address
+    - `layers_fetched`: per-layer fetch outcome and timing
+    - `risk_scored`: the assessment, and whether it came from the results store
+    - `error`: the elevation risk assessment failed (last event)
+    """,
+    response_description="Stream of stage events",
+    responses=STREAM_RESPONSES
+)
+async def assess_elevation_risk_stream(address: PropertyAddress, request: Request):
+    """
+    Stream the elevation risk assessment for a property address.
+    """
+    logger.info(f"Starting streamed elevation risk assessment for: {address.street}, {address.suburb}, {address.state}")
+    return stage_event_response(request, stream_elevation_risk_assessment(address))
+
+@router.get(
+    "/elevation-risk",
+    response_model=ScoredPropertiesResponse,
+    summary="List Stored Elevation Risk Assessments",
+    description="""
+    **Elevation risk assessments already in the result store, newest first**
+
+    For example, all properties in a suburb scored in the last week:
+    `GET /risks/elevation-risk?suburb=Campbelltown&state=SA&days=7`
+    """,
+    response_description="Stored assessments matching the filters"
+)
+async def list_elevation_risks(
+    suburb: Optional[str] = Query(None, description="Suburb (case-insensitive)"),
+    state: Optional[str] = Query(None, description="State (case-insensitive)"),
+    days: Optional[float] = Query(None, gt=0, description="Only assessments made within this many days"),
+) -> ScoredPropertiesResponse:
+    """
+    List stored elevation risk assessments.
+    """
+    # The store query runs off the event loop.
+    results = await asyncio.to_thread(
+        PropertyFileRepository().find,
+        ELEVATION_RISK_FILENAME, ElevationRiskAssessment, suburb=suburb, state=state, max_age_days=days
+    )
+    return ScoredPropertiesResponse(
+        success=True,
+        message=f"Found {len(results)} stored elevation risk assessments",
+        data=[
+            ScoredProperty(address=address, fetched_at=fetched_at, elevation_risk=risk)
+            for address, fetched_at, risk in results
+        ]
+    )
+
 @router.get(
     "/health",
     response_model=Dict[str, Any],
@@ -144,5 +199,7 @@ async def elevation_risk_service_health():
             "property_search",
             "risk_assessment",
             "property_details_extraction"
-        ]
+        ],
+        "result_cache": PropertyFileRepository.cache_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
\ No newline at end of file
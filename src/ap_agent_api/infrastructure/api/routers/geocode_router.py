@@ -0,0 +1,95 @@
+"""
+Geocoding API endpoints.
+"""
+
+from fastapi import APIRouter, HTTPException, status
+import logging
+from typing import List
+
+from ap_agent_api.config import BATCH_MAX_ADDRESSES
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.application.geocoding_service import run_batch_geocode
+from ..models.responses import BatchGeocodeResponse
+
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post(
+    "/batch",
+    response_model=BatchGeocodeResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Batch Geocode Addresses",
+    description=f"""
+    **Geocode many property addresses in bulk**
+
+    Addresses are packed into as few `geocodeAddresses` requests as the locator's
+    maximum batch size allows. Results are returned in request order. At most
+    {BATCH_MAX_ADDRESSES} addresses per request.
+
+    **Example Request:**
+    ```json
+    [
+        {{
+            "street": "1c Raymel Crescent",
+            "suburb": "Campbelltown",
+            "state": "SA",
+            "postcode": "5074"
+        }},
+        {{
+            "street": "1A Ormbsy Street",
+            "suburb": "Windsor Gardens",
+            "state": "SA",
+            "postcode": "5087"
+        }}
+    ]
+    ```
+    """,
+    response_description="WGS 84 coordinates for each address, in request order",
+    responses={
+        422: {
+            "description": "Validation error - Invalid address format or too many addresses",
+        },
+        500: {
+            "description": "Internal server error - Geocoding service failed",
+        }
+    }
+)
+async def batch_geocode(addresses: List[PropertyAddress]) -> BatchGeocodeResponse:
+    """
+    Geocode a list of property addresses.
+
+    Args:
+        addresses: Property addresses to geocode
+
+    Returns:
+        BatchGeocodeResponse: One geocode result per address
+
+    Raises:
+        HTTPException: If the batch is larger than BATCH_MAX_ADDRESSES, or the
+            geocoding fails or encounters an error
+    """
+    if len(addresses) > BATCH_MAX_ADDRESSES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch of {len(addresses)} addresses exceeds the limit of {BATCH_MAX_ADDRESSES}"
+        )
+
+    try:
+        logger.info(f"Starting batch geocode for {len(addresses)} addresses")
+
+        results = await run_batch_geocode(addresses)
+        matched = sum(result.found for result in results)
+
+        return BatchGeocodeResponse(
+            success=True,
+            message=f"Geocoded {matched} of {len(results)} addresses",
+            data=results
+        )
+
+    except Exception as e:
+        logger.error(f"Batch geocode failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch geocode failed: {str(e)}"
+        )
@@ -0,0 +1,88 @@
+"""
+Background job API endpoints.
+"""
+
+from fastapi import APIRouter, HTTPException, status
+import logging
+
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.application.job_service import get_job_manager, SEARCH_JOB, ELEVATION_RISK_JOB
+from ..models.responses import JobResponse
+
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+_SUBMIT_DESCRIPTION = """
+    **Queue a {what} and return its job ID right away**
+
+    Poll `GET /jobs/{{job_id}}` until its `status` is `succeeded` or `failed`. When it has
+    succeeded, the job's `result.data` holds the same data as `{endpoint}`.
+
+    **Example Request:**
+    ```json
+    {{
+        "street": "1c Raymel Crescent",
+        "suburb": "Campbelltown",
+        "state": "SA",
+        "postcode": "5074"
+    }}
+    ```
+    """
+
+async def _submit(kind: str, address: PropertyAddress) -> JobResponse:
+    job = await get_job_manager().submit(kind, {"address": address.model_dump()})
+    return JobResponse(success=True, message=f"{kind} job queued", data=job)
+
+@router.post(
+    "/search",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a Property Search",
+    description=_SUBMIT_DESCRIPTION.format(what="property search", endpoint="/search"),
+    response_description="The queued job"
+)
+async def submit_search_job(address: PropertyAddress) -> JobResponse:
+    """
+    Queue a property search for the address.
+    """
+    logger.info(f"Queueing property search for: {address.street}, {address.suburb}, {address.state}")
+    return await _submit(SEARCH_JOB, address)
+
+@router.post(
+    "/elevation-risk",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue an Elevation Risk Assessment",
+    description=_SUBMIT_DESCRIPTION.format(what="elevation risk assessment", endpoint="/risks/elevation-risk"),
+    response_description="The queued job"
+)
+async def submit_elevation_risk_job(address: PropertyAddress) -> JobResponse:
+    """
+    Queue an elevation risk assessment for the address.
+    """
+    logger.info(f"Queueing elevation risk assessment for: {address.street}, {address.suburb}, {address.state}")
+    return await _submit(ELEVATION_RISK_JOB, address)
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="Get Job Status",
+    description="Returns the job's status and, once it has finished, its result or error.",
+    responses={
+        404: {
+            "description": "No job with this ID",
+        },
+    }
+)
+async def get_job(job_id: str) -> JobResponse:
+    """
+    Get the status (and result) of a job.
+
+    Raises:
+        HTTPException: If there is no such job
+    """
+    job = await get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job not found: {job_id}")
+    return JobResponse(success=True, message=f"Job is {job.status.value}", data=job)
@@ -3,15 +3,20 @@ Property-related API endpoints.
 """
 
 from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 import logging
 import os
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any
 
 from ap_agent_api.domain.models.property import PropertyAddress, PropertyData
-from ap_agent_api.application.property_search_service import run_property_search
+from ap_agent_api.application.property_search_service import (
+    get_stored_property_search_json, run_and_save_property_search, stream_property_search
+)
+from ..fast_json import FastJSONResponse, envelope_response
+from ..streaming import stage_event_response, STREAM_RESPONSES
 from ..models.responses import PropertySearchResponse, ErrorResponse
 from ap_agent_api.config import PROPERTY_RESULTS_DIR
 
@@ -106,33 +111,21 @@ async def search_property(address: PropertyAddress) -> PropertySearchResponse:
     try:
         logger.info(f"Starting property search for: {address.street}, {address.suburb}, {address.state}")
         
-        file_repo = PropertyFileRepository()
-        filename = 'property_details.json'
-
-        # check if results already exist
-        property_data = file_repo.load(address, filename=filename)
-        
-        if property_data:
-            logger.info(f"Property data loaded from existing file for: {address.street}")
-            property_data = PropertyData.model_validate_json(property_data)
-            return PropertySearchResponse(
-                success=True,
-                message="Property data loaded from existing file",
-                data=property_data
-            )
+        # Fresh stored results are returned as stored, without re-validating
+        # or re-serializing them.
+        stored_json = await get_stored_property_search_json(address)
+        if stored_json is not None:
+            return envelope_response("Property data loaded from existing file", stored_json)
 
-        # Call the application service
-        property_data = await run_property_search(address)
+        property_data = await run_and_save_property_search(address)
 
-        file_path = file_repo.save(property_address=address, data=property_data.model_dump(), filename=filename)
-        
-        logger.info(f"Property search completed successfully for: {address.street} and saved to {file_path}")
+        logger.info(f"Property search completed successfully for: {address.street}")
         
-        return PropertySearchResponse(
+        return FastJSONResponse(PropertySearchResponse(
             success=True,
             message="Property search completed successfully",
             data=property_data
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Property search failed for {address.street}: {str(e)}", exc_info=True)
@@ -141,6 +134,31 @@ async def search_property(address: PropertyAddress) -> PropertySearchResponse:
             detail=f"Property search failed: {str(e)}"
         )
 
+@router.post(
+    "/search/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream Property Search Progress",
+    description="""
+    **Same as `/search`, reporting each stage as it completes**
+
+    Events are streamed as newline-delimited JSON, or as Server-Sent Events when the
+    request has `Accept: text/event-stream`. Each event has a `stage`, the `elapsed`
+    seconds and stage `data`:
+    - `agent_step`: the agent called a tool or produced a message
+    - `agent_output`: a chunk of the agent's (JSON) output text
+    - `search_completed`: the property data, and whether it came from the results store
+    - `error`: the property search failed (last event)
+    """,
+    response_description="Stream of stage events",
+    responses=STREAM_RESPONSES
+)
+async def search_property_stream(address: PropertyAddress, request: Request):
+    """
+    Stream the property search for a property address.
+    """
+    logger.info(f"Starting streamed property search for: {address.street}, {address.suburb}, {address.state}")
+    return stage_event_response(request, stream_property_search(address))
+
 @router.get(
     "/health",
     response_model=Dict[str, Any],
@@ -158,5 +176,7 @@ async def property_service_health():
             "property_search",
             "risk_assessment",
             "property_details_extraction"
-        ]
+        ],
+        "result_cache": PropertyFileRepository.cache_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
\ No newline at end of file
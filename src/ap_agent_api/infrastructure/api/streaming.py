@@ -0,0 +1,46 @@
+"""
+Streaming responses for stage events.
+"""
+
+from contextlib import aclosing
+from typing import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from ap_agent_api.domain.models.events import StageEvent
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+def stage_event_response(request: Request, events: AsyncIterator[StageEvent]) -> StreamingResponse:
+    """
+    Streams the events as Server-Sent Events if the client accepts
+    text/event-stream, otherwise as newline-delimited JSON.
+    """
+    # Closing the events as soon as the body is closed (the client disconnected)
+    # stops their producer, instead of leaving it to garbage collection.
+    if SSE_MEDIA_TYPE in request.headers.get("accept", ""):
+        async def body():
+            async with aclosing(events):
+                async for event in events:
+                    yield f"event: {event.stage}\ndata: {event.model_dump_json()}\n\n"
+        # Stop proxies from buffering the stream.
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        return StreamingResponse(body(), media_type=SSE_MEDIA_TYPE, headers=headers)
+
+    async def body():
+        async with aclosing(events):
+            async for event in events:
+                yield event.model_dump_json() + "\n"
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
+
+STREAM_RESPONSES = {
+    200: {
+        "description": "Stream of stage events",
+        "content": {NDJSON_MEDIA_TYPE: {}, SSE_MEDIA_TYPE: {}},
+    },
+    422: {
+        "description": "Validation error - Invalid address format",
+    },
+}
@@ -1,59 +1,262 @@
-from importlib.metadata import files
 import json
+import os.path
+import time
 from pathlib import Path
-from datetime import datetime
-import os.path, time
-from ap_agent_api.domain.utils import get_property_directory
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ap_agent_api.config import (
+    PROPERTY_RESULTS_DIR, RESULT_CACHE_MAXSIZE, RESULT_CACHE_TTL_SECONDS,
+    ELEVATION_RISK_TTL_DAYS, PROPERTY_DETAILS_TTL_DAYS
+)
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.domain.utils import get_property_directory, get_property_key
+from ap_agent_api.infrastructure import metrics, serialization
+from ap_agent_api.infrastructure.result_cache import LRUCache
+from ap_agent_api.infrastructure.result_store import ResultStore, StoredResult, get_result_store
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Results older than this are fetched again, per artifact (results file stem).
+RESULT_TTL_DAYS = {
+    "elevation_risk": ELEVATION_RISK_TTL_DAYS,
+    "property_details": PROPERTY_DETAILS_TTL_DAYS,
+}
+DEFAULT_RESULT_TTL_DAYS = 10
+
+def _artifact(filename: str) -> str:
+    return Path(filename).stem
+
+def _ttl_seconds(artifact: str) -> float:
+    return RESULT_TTL_DAYS.get(artifact, DEFAULT_RESULT_TTL_DAYS) * 24 * 3600
+
+# Written to every old per-street results directory by the property search.
+LEGACY_DETAILS_FILENAME = "property_details.json"
+
+def _legacy_path(property_address, filename) -> Optional[Path]:
+    """
+    Returns the path of a file in the old per-street results directory of the
+    address, or None. The directory was keyed by street only, so it is only
+    used when its property details name the same suburb, state and postcode;
+    otherwise it may belong to the same street in another suburb.
+    """
+    directory = PROPERTY_RESULTS_DIR / property_address.street.replace(" ", "_")
+    file_path = directory / filename
+    if not file_path.exists():
+        return None
+    try:
+        address = json.loads((directory / LEGACY_DETAILS_FILENAME).read_text())["address"]
+        legacy_address = PropertyAddress(**address)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring {file_path}: its address cannot be confirmed ({type(e).__name__}: {e})")
+        return None
+    same_address = all(
+        getattr(legacy_address, field).strip().lower() == getattr(property_address, field).strip().lower()
+        for field in ("street", "suburb", "state", "postcode")
+    )
+    if not same_address:
+        logger.debug(f"Ignoring {file_path}: it belongs to {legacy_address.street}, {legacy_address.suburb}")
+        return None
+    return file_path
 
 class PropertyFileRepository:
 
+    # Validated models and their serialized JSON, shared by every repository
+    # instance in the process and keyed by the store they came from. Entries
+    # come from the store or from save(), so cache hits are trusted and never
+    # re-validated.
+    _cache = LRUCache(maxsize=RESULT_CACHE_MAXSIZE, ttl=RESULT_CACHE_TTL_SECONDS)
+
+    def __init__(self, store: Optional[ResultStore] = None):
+        self.store = store or get_result_store()
+
+    def _cache_key(self, property_address, artifact: str, *kind: str) -> tuple:
+        return (str(self.store.path), get_property_key(property_address), artifact) + kind
+
     def save(self, property_address, data, filename) -> str:
         """
-        Save the property data to a JSON file.
+        Save the property data to the result store, stamped with the current time.
+
+        Args:
+            data: A pydantic model (stored serialized by alias, as the API
+                returns it) or a JSON-serializable dict
         """
-        # output_dir = self.base_dir / (property_address.street.replace(" ", "_"))
-        output_dir = get_property_directory(property_address)
-        file_path = output_dir / filename
-        # output_data = property_results.model_dump()
-        with open(file_path, "w") as f:
-            json.dump(data, f)
-        return str(file_path)
-    
+        artifact = _artifact(filename)
+        key = get_property_key(property_address)
+        model_key = self._cache_key(property_address, artifact)
+        json_key = self._cache_key(property_address, artifact, "json")
+        data_json = serialization.dumps(data)
+        self.store.put(property_address, artifact, data_json.decode("utf-8"))
+        self._cache.invalidate(model_key)
+        self._cache.invalidate(json_key)
+        if isinstance(data, BaseModel):
+            ttl = _ttl_seconds(artifact)
+            self._cache.put(model_key, data, ttl=ttl)
+            self._cache.put(json_key, data_json, ttl=ttl)
+        return f"{self.store.path}:{artifact}/{key}"
+
     def load(self, property_address, filename):
         """
-        Load property data from file if it exists and was created within the last 10 days.
-        
+        Load property data if it was fetched within the artifact's TTL.
+
         Args:
-            property_address: Property address object with street attribute
-            
+            property_address: Property address object
+            filename: Name of the results file (its stem names the artifact)
+
         Returns:
-            dict: Property data if file exists and is within 10 days, None otherwise
+            str: The JSON data if it is fresh, None otherwise
         """
-        output_dir = get_property_directory(property_address)
-        file_path = output_dir / filename
-        
-        # Check if file exists
-        if not file_path.exists():
+        result = self._load_fresh(property_address, _artifact(filename), filename)
+        return result.data if result is not None else None
+
+    def load_model(self, property_address, filename, model_cls):
+        """
+        Load property data as a validated model, serving hot addresses from the
+        in-process LRU cache without touching the store.
+
+        Args:
+            property_address: Property address object
+            filename: Name of the results file (its stem names the artifact)
+            model_cls: Pydantic model class to validate the data with
+
+        Returns:
+            model_cls: The validated data, or None if there is no fresh result
+        """
+        artifact = _artifact(filename)
+        key = self._cache_key(property_address, artifact)
+        model = self._cache.get(key)
+        if model is not None:
+            return model
+
+        result = self._load_fresh(property_address, artifact, filename)
+        if result is None:
+            return None
+
+        model = model_cls.model_validate_json(result.data)
+        # Never keep an entry past the point where the result itself goes stale.
+        self._cache.put(key, model, ttl=result.fetched_at + _ttl_seconds(artifact) - time.time())
+        return model
+
+    def load_json(self, property_address, filename, model_cls) -> Optional[bytes]:
+        """
+        Load property data as JSON bytes ready to be returned by the API
+        (serialized by alias), without parsing or dumping it on cache hits.
+
+        Args:
+            property_address: Property address object
+            filename: Name of the results file (its stem names the artifact)
+            model_cls: Pydantic model class that validates the stored data
+
+        Returns:
+            bytes: The JSON data, or None if there is no fresh result
+        """
+        artifact = _artifact(filename)
+        data_json = self._cache.get(self._cache_key(property_address, artifact, "json"))
+        if data_json is not None:
+            return data_json
+
+        result = self._load_fresh(property_address, artifact, filename)
+        if result is None:
+            return None
+
+        # Stored rows may predate the alias format (or be legacy files), so they
+        # are validated and re-serialized once before being cached.
+        model = model_cls.model_validate_json(result.data)
+        data_json = serialization.dumps(model)
+        ttl = result.fetched_at + _ttl_seconds(artifact) - time.time()
+        self._cache.put(self._cache_key(property_address, artifact), model, ttl=ttl)
+        self._cache.put(self._cache_key(property_address, artifact, "json"), data_json, ttl=ttl)
+        return data_json
+
+    def find(self, filename, model_cls, suburb: Optional[str] = None, state: Optional[str] = None,
+             max_age_days: Optional[float] = None, limit: Optional[int] = 1000) -> List[Tuple[PropertyAddress, float, object]]:
+        """
+        Find stored results, newest first, e.g. all properties in a suburb
+        scored in the last week.
+
+        Args:
+            filename: Name of the results file (its stem names the artifact)
+            model_cls: Pydantic model class to validate the data with
+            suburb, state: Only results for this suburb/state (case-insensitive)
+            max_age_days: Only results fetched within this many days
+            limit: Maximum number of results, None for all
+
+        Returns:
+            list: (address, fetched_at, model) tuples
+        """
+        since = time.time() - max_age_days * 24 * 3600 if max_age_days is not None else None
+        results = self.store.find(_artifact(filename), suburb=suburb, state=state, since=since, limit=limit)
+        return [
+            (
+                PropertyAddress(street=r.street, suburb=r.suburb, state=r.state, postcode=r.postcode),
+                r.fetched_at,
+                model_cls.model_validate_json(r.data),
+            )
+            for r in results
+        ]
+
+    def find_addresses(self, filename, suburb: Optional[str] = None, state: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[PropertyAddress]:
+        """
+        Addresses that have a stored result (of any age), newest first.
+        """
+        results = self.store.find(_artifact(filename), suburb=suburb, state=state, limit=limit)
+        return [
+            PropertyAddress(street=r.street, suburb=r.suburb, state=r.state, postcode=r.postcode)
+            for r in results
+        ]
+
+    def find_image(self, property_address, filename) -> Optional[Path]:
+        """
+        Returns the path of a stored layer image (e.g. "contour_map.png") of the
+        address, looking in its blob directory, then in the old per-street
+        results directory (if it is confirmed to be this address's, see
+        _legacy_path). None if there is no such image.
+        """
+        path = get_property_directory(property_address) / filename
+        if path.exists():
+            return path
+        return _legacy_path(property_address, filename)
+
+    @classmethod
+    def cache_stats(cls):
+        """
+        Hit/miss counters of the in-process result cache.
+        """
+        return cls._cache.stats()
+
+    def _load_fresh(self, property_address, artifact, filename) -> Optional[StoredResult]:
+        result = self.store.get(property_address, artifact)
+        if result is None:
+            result = self._import_legacy(property_address, artifact, filename)
+        if result is None or time.time() - result.fetched_at > _ttl_seconds(artifact):
+            return None
+        return result
+
+    def _import_legacy(self, property_address, artifact, filename) -> Optional[StoredResult]:
+        """
+        Copies a result from the old per-street results directory into the
+        store, keeping its mtime as the fetch time. Only done when the directory
+        is confirmed to be this address's (see _legacy_path); the file is left
+        in place.
+        """
+        file_path = _legacy_path(property_address, filename)
+        if file_path is None:
             return None
-        
         try:
-            # Get file modification time
-            file_mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            current_time = datetime.now()
-            
-            # Calculate the difference in days
-            time_diff = (current_time - file_mod_time).days
-            
-            # If file was modified within the last 10 days, load and return data
-            if time_diff <= 10:
-                with open(file_path, "r") as f:
-                    data = f.read()
-                return data
-            else:
-                # File is older than 10 days
-                return None
-                
+            fetched_at = os.path.getmtime(file_path)
+            data = file_path.read_text()
+            json.loads(data)
         except (OSError, json.JSONDecodeError) as e:
             # Handle file access or JSON parsing errors
-            print(f"Error loading property data from {file_path}: {e}")
-            return None
\ No newline at end of file
+            logger.warning(f"Error loading legacy property data from {file_path}: {e}")
+            return None
+
+        self.store.put(property_address, artifact, data, fetched_at=fetched_at)
+        logger.info(f"Imported legacy result {file_path} into the result store")
+        return self.store.get(property_address, artifact)
+
+
+metrics.register_cache("result", PropertyFileRepository.cache_stats)
@@ -0,0 +1,103 @@
+"""
+Persistent geocode cache.
+
+Street addresses never move, so geocoder results are kept in a small SQLite
+database keyed by the normalized address. Both the WGS 84 result and its Web
+Mercator transform are stored. Addresses the geocoder does not find are
+cached too, but only for GEOCODE_NEGATIVE_TTL_SECONDS; failed requests are not
+cached at all.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from ap_agent_api.config import GEOCODE_CACHE_PATH, GEOCODE_NEGATIVE_TTL_SECONDS
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GeocodeCacheEntry:
+    """A cached geocoder result; the coordinates are None for a negative entry."""
+    wgs84_x: Optional[float]
+    wgs84_y: Optional[float]
+    wm_x: Optional[float]
+    wm_y: Optional[float]
+    cached_at: float
+
+    @property
+    def found(self) -> bool:
+        return self.wgs84_x is not None
+
+
+class GeocodeCache:
+
+    def __init__(self, path: Path = GEOCODE_CACHE_PATH, negative_ttl: float = GEOCODE_NEGATIVE_TTL_SECONDS):
+        self.path = Path(path)
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS geocode (
+                    address_key TEXT PRIMARY KEY,
+                    wgs84_x REAL,
+                    wgs84_y REAL,
+                    wm_x REAL,
+                    wm_y REAL,
+                    cached_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get(self, address_key: str) -> Optional[GeocodeCacheEntry]:
+        """
+        Returns the cached entry, or None on a miss or an expired negative entry.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT wgs84_x, wgs84_y, wm_x, wm_y, cached_at FROM geocode WHERE address_key = ?",
+                (address_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = GeocodeCacheEntry(*row)
+        if not entry.found and time.time() - entry.cached_at > self.negative_ttl:
+            return None
+        return entry
+
+    def put(self, address_key: str, wgs84_x=None, wgs84_y=None, wm_x=None, wm_y=None):
+        """
+        Stores a geocoder result. Leave the coordinates as None to cache a failed lookup.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?, ?)",
+                (address_key, wgs84_x, wgs84_y, wm_x, wm_y, time.time())
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[GeocodeCache] = None
+_cache_lock = threading.Lock()
+
+def get_geocode_cache() -> GeocodeCache:
+    """
+    Returns the process-wide geocode cache.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = GeocodeCache()
+        return _cache
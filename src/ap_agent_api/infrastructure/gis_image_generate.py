@@ -1,13 +1,24 @@
 import requests
 import json
-from pyproj import CRS, Transformer
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
 # from ap_agent_api.config import PROPERTY_RESULTS_DIR
+from ap_agent_api.config import (
+    LAYER_FETCH_CONCURRENT, LAYER_FETCH_WORKERS, GEOCODE_CACHE_ENABLED, MAP_FETCH_MODE, IMAGE_PERSIST_MODE,
+    MAP_EXPORT_SIZE, GEOCODE_MAX_BATCH_SIZE
+)
 from ap_agent_api.domain.models.property import PropertyAddress
-from ap_agent_api.domain.utils import get_property_directory
-import numpy as np
+from ap_agent_api.domain.utils import get_property_directory, normalize_address
+from ap_agent_api.infrastructure.geocode_cache import get_geocode_cache
+from ap_agent_api.infrastructure.http_clients import get_session, get_curl_session
+from ap_agent_api.infrastructure import metrics
 import coloredlogs, logging
-from curl_cffi import requests as c_requests
 
 logger = logging.getLogger(__name__)
 # coloredlogs.install(level='DEBUG', logger=logger)
@@ -19,9 +30,10 @@ logger = logging.getLogger(__name__)
 ADDRESS = "1A Ormbsy Street, Widsor Gardens"
 # 2. Target Coordinate Systems
 # WGS 84 (Latitude/Longitude) - WKID 4326
-WGS84 = CRS.from_epsg(4326)
+# (pyproj is only imported when the first transformer is built)
+WGS84 = "EPSG:4326"
 # Web Mercator - WKID 3857 (Used by the Map Server)
-WMERC = CRS.from_epsg(3857)
+WMERC = "EPSG:3857"
 
 # 3. Box Size (Level 17 Tile Dimension)
 # to get the box size we have to fetch the informaiton from 
@@ -48,66 +60,249 @@ HEIGHT_MAP = "https://en-us.topographic-map.com/?_path=api.maps.getOverlay"
 GEOCODE_SERVICE_URL = "https://location.sa.gov.au/arcgis/rest/services/Locators/SAGAF_PLUS/GeocodeServer/geocodeAddresses"
 
 # --- STEP 1: Get Geocode Address (from x.com / Geohub) ---
-def get_geocode_from_service(address):
+_geocode_batch_size: Optional[int] = None
+
+def _address_fields(address) -> Tuple[str, str]:
     """
-    Submits the address to the geocoding service and returns coordinates (in WGS 84).
+    Returns the (Street, City) geocoder fields for a PropertyAddress or an
+    "street, suburb, ..." address string.
     """
-    logger.debug(f"1. Geocoding Address: {address}")
-    
-    # Structure the address for batch geocoding (as discussed)
-    addresses_payload = {
-        "records": [
-            {
-                "attributes": {
-                    "OBJECTID": 1,
-                    "Street": address.split(',')[0].strip(),
-                    "City": address.split(',')[1].strip(),
-                }
+    if isinstance(address, PropertyAddress):
+        return address.street.strip(), address.suburb.strip()
+    parts = address.split(',')
+    return parts[0].strip(), parts[1].strip()
+
+def get_geocode_batch_size() -> int:
+    """
+    Returns the locator's MaxBatchSize, falling back to GEOCODE_MAX_BATCH_SIZE.
+    The locator is asked once per process; a failed lookup keeps the fallback.
+    """
+    global _geocode_batch_size
+    if _geocode_batch_size is None:
+        locator_url = GEOCODE_SERVICE_URL.rsplit('/', 1)[0]
+        try:
+            response = get_session().get(locator_url, params={"f": "json"}, timeout=10)
+            response.raise_for_status()
+            max_batch_size = response.json()["locatorProperties"]["MaxBatchSize"]
+            _geocode_batch_size = int(max_batch_size)
+        except (requests.exceptions.RequestException, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"   -> Could not read the locator batch size, using {GEOCODE_MAX_BATCH_SIZE}: {e}")
+            _geocode_batch_size = GEOCODE_MAX_BATCH_SIZE
+    return _geocode_batch_size
+
+def _geocode_batch(addresses) -> Dict[int, Tuple[float, float]]:
+    """
+    Geocodes one batch in a single geocodeAddresses request.
+
+    Returns: OBJECTID (1-based position in the batch) -> (x, y) in WGS 84, for matched records only.
+    """
+    records = []
+    for object_id, address in enumerate(addresses, start=1):
+        street, city = _address_fields(address)
+        records.append({
+            "attributes": {
+                "OBJECTID": object_id,
+                "Street": street,
+                "City": city,
             }
-        ]
-    }
-    
+        })
+
     params = {
-        "addresses": json.dumps(addresses_payload),
+        "addresses": json.dumps({"records": records}),
         "f": "json"
     }
 
-    try:
-        response = requests.post(GEOCODE_SERVICE_URL, data=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Extract location from the best match (first candidate)
-        if data and 'locations' in data and data['locations']:
-            wgs84_x = data['locations'][0]['location']['x']
-            wgs84_y = data['locations'][0]['location']['y']
-            logger.debug(f"   -> WGS 84 Coordinates (Lat/Lon): X={wgs84_x}, Y={wgs84_y}")
-            return wgs84_x, wgs84_y
-        else:
-            logger.error("   -> ERROR: Geocoding failed or no matches found.")
-            return None, None
-            
-    except requests.exceptions.RequestException as e:
-        logger.error(f"   -> ERROR during geocoding request: {e}")
-        return None, None
+    with metrics.GEOCODE_SECONDS.time():
+        response = get_session().post(GEOCODE_SERVICE_URL, data=params, timeout=10 + len(records) // 10)
+    response.raise_for_status()
+    data = response.json()
+
+    matches = {}
+    for location in data.get('locations') or []:
+        attributes = location.get('attributes') or {}
+        point = location.get('location') or {}
+        # Single-record requests have no ResultID on some locator versions.
+        object_id = attributes.get('ResultID', 1 if len(records) == 1 else None)
+        if object_id is None or object_id in matches or attributes.get('Status') == 'U':
+            continue
+        x, y = point.get('x'), point.get('y')
+        if isinstance(x, (int, float)) and isinstance(y, (int, float)) and x == x and y == y:
+            matches[int(object_id)] = (x, y)
+    return matches
+
+def _geocode_from_service_batched(addresses, batch_size: Optional[int] = None, return_failed: bool = False) -> List[Tuple[Optional[float], Optional[float]]]:
+    """
+    Geocodes many addresses using the geocodeAddresses batch operation.
+
+    Args:
+        addresses: PropertyAddress objects or "street, suburb, ..." strings.
+        batch_size: Records per request, defaults to the locator's MaxBatchSize.
+
+    Returns:
+        list: (x, y) WGS 84 coordinates in input order, (None, None) where
+        the address was not matched or its batch failed. With return_failed,
+        also the set of input positions whose request failed.
+    """
+    addresses = list(addresses)
+    batch_size = batch_size or get_geocode_batch_size()
+    results: List[Tuple[Optional[float], Optional[float]]] = [(None, None)] * len(addresses)
+    failed = set()
+
+    for offset in range(0, len(addresses), batch_size):
+        batch = addresses[offset:offset + batch_size]
+        logger.debug(f"1. Geocoding {len(batch)} addresses (batch starting at {offset})")
+        try:
+            matches = _geocode_batch(batch)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"   -> ERROR during geocoding request: {e}")
+            metrics.UPSTREAM_ERRORS.inc(upstream="geocode")
+            failed.update(range(offset, offset + len(batch)))
+            continue
+        for object_id, coords in matches.items():
+            if 1 <= object_id <= len(batch):
+                results[offset + object_id - 1] = coords
+    if return_failed:
+        return results, failed
+    return results
+
+def get_geocode_from_service(address, return_failed: bool = False):
+    """
+    Submits the address to the geocoding service and returns coordinates (in WGS 84).
+    With return_failed, also whether the request itself failed (as opposed to
+    the address not being found).
+    """
+    logger.debug(f"1. Geocoding Address: {address}")
+
+    results, failed = _geocode_from_service_batched([address], batch_size=1, return_failed=True)
+    wgs84_x, wgs84_y = results[0]
+    if failed:
+        logger.error("   -> ERROR: Geocoding request failed.")
+    elif wgs84_x is None:
+        logger.error("   -> ERROR: No geocoding matches found.")
+    else:
+        logger.debug(f"   -> WGS 84 Coordinates (Lat/Lon): X={wgs84_x}, Y={wgs84_y}")
+    if return_failed:
+        return wgs84_x, wgs84_y, bool(failed)
+    return wgs84_x, wgs84_y
 
 
 # --- STEP 2: Convert WGS 84 to WKID 3857 (Web Mercator) ---
+# Transformer construction is far more expensive than a transform, so each
+# thread builds its own once (pyproj transformers are not thread-safe).
+_transformers = threading.local()
+
+def get_wgs84_to_wmerc_transformer():
+    """
+    Returns the calling thread's cached WGS 84 -> Web Mercator transformer.
+    """
+    transformer = getattr(_transformers, "wgs84_to_wmerc", None)
+    if transformer is None:
+        from pyproj import Transformer
+        transformer = Transformer.from_crs(WGS84, WMERC, always_xy=True)
+        _transformers.wgs84_to_wmerc = transformer
+    return transformer
+
 def transform_coordinates(wgs84_x, wgs84_y):
     """
     Converts WGS 84 (4326) coordinates to Web Mercator (3857) using pyproj.
     """
     logger.debug("2. Converting WGS 84 (4326) to Web Mercator (3857)")
     
-    # Create a transformer object
-    transformer = Transformer.from_crs(WGS84, WMERC, always_xy=True)
-    
     # Perform the transformation
-    wm_x, wm_y = transformer.transform(wgs84_x, wgs84_y)
+    wm_x, wm_y = get_wgs84_to_wmerc_transformer().transform(wgs84_x, wgs84_y)
     
     logger.debug(f"   -> Web Mercator Coordinates: X={wm_x:.4f}, Y={wm_y:.4f}")
     return wm_x, wm_y
 
+def transform_coordinates_array(lons, lats):
+    """
+    Vectorized transform_coordinates: converts arrays of WGS 84 longitudes and
+    latitudes to Web Mercator in a single call.
+
+    Returns:
+        tuple: (wm_x, wm_y) float64 arrays with the shape of the inputs.
+    """
+    import numpy as np
+
+    lons = np.asarray(lons, dtype=np.float64)
+    lats = np.asarray(lats, dtype=np.float64)
+    wm_x, wm_y = get_wgs84_to_wmerc_transformer().transform(lons, lats)
+    return np.asarray(wm_x), np.asarray(wm_y)
+
+
+# --- Cached geocoding (STEP 1 + STEP 2) ---
+def _geocode_cache_key(address) -> str:
+    street, city = _address_fields(address)
+    return normalize_address(f"{street}, {city}")
+
+def geocode_addresses(addresses, batch_size: Optional[int] = None) -> List[Tuple[Optional[float], Optional[float]]]:
+    """
+    Geocodes many addresses, serving repeat and near-duplicate addresses from the
+    persistent geocode cache and batching only the misses to the geocoder.
+
+    Returns:
+        list: (x, y) WGS 84 coordinates in input order, (None, None) if not found.
+    """
+    addresses = list(addresses)
+    if not GEOCODE_CACHE_ENABLED:
+        return _geocode_from_service_batched(addresses, batch_size)
+
+    cache = get_geocode_cache()
+    keys = [_geocode_cache_key(address) for address in addresses]
+    results: List[Tuple[Optional[float], Optional[float]]] = [(None, None)] * len(addresses)
+
+    # Look up every distinct address once; duplicates share the result.
+    misses: Dict[str, List[int]] = {}
+    for index, key in enumerate(keys):
+        entry = cache.get(key)
+        if entry is not None:
+            results[index] = (entry.wgs84_x, entry.wgs84_y)
+        else:
+            misses.setdefault(key, []).append(index)
+    logger.debug(f"   -> Geocode cache: {len(addresses) - sum(map(len, misses.values()))} hits, {len(misses)} misses")
+
+    if misses:
+        miss_keys = list(misses)
+        fetched, failed = _geocode_from_service_batched(
+            [addresses[misses[key][0]] for key in miss_keys], batch_size, return_failed=True
+        )
+        for position, (key, (wgs84_x, wgs84_y)) in enumerate(zip(miss_keys, fetched)):
+            if position in failed:
+                # Request errors are not a verdict on the address; do not cache them.
+                continue
+            if wgs84_x is None:
+                cache.put(key)
+            else:
+                wm_x, wm_y = transform_coordinates(wgs84_x, wgs84_y)
+                cache.put(key, wgs84_x, wgs84_y, wm_x, wm_y)
+            for index in misses[key]:
+                results[index] = (wgs84_x, wgs84_y)
+    return results
+
+def geocode_address(address) -> Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]:
+    """
+    Geocodes a single address through the persistent cache.
+
+    Returns:
+        tuple: (wgs84_x, wgs84_y, wm_x, wm_y), all None if the address was not found.
+    """
+    if GEOCODE_CACHE_ENABLED:
+        key = _geocode_cache_key(address)
+        cache = get_geocode_cache()
+        entry = cache.get(key)
+        if entry is not None:
+            logger.debug(f"1. Geocode cache hit for: {address}")
+            return entry.wgs84_x, entry.wgs84_y, entry.wm_x, entry.wm_y
+
+    wgs84_x, wgs84_y, failed = get_geocode_from_service(address, return_failed=True)
+    wm_x = wm_y = None
+    if wgs84_x is not None:
+        wm_x, wm_y = transform_coordinates(wgs84_x, wgs84_y)
+    # Request errors are not a verdict on the address; do not cache them.
+    if GEOCODE_CACHE_ENABLED and not failed:
+        cache.put(key, wgs84_x, wgs84_y, wm_x, wm_y)
+    return wgs84_x, wgs84_y, wm_x, wm_y
+
 
 # --- STEP 3: Calculate Bounding Box (Xmin, Ymin, Xmax, Ymax) ---
 def calculate_bounding_box(wm_x, wm_y, box_side):
@@ -142,7 +337,7 @@ def get_map_image(bbox_string, url, layers=None):
     export_params = {
         "bbox": bbox_string,         # The calculated bounding box
         "bboxSR": 3857,              # The Spatial Reference of the bbox (Web Mercator)
-        # "size": "600,600",           # Output image size in pixels (600x600 for a clear square)
+        "size": f"{MAP_EXPORT_SIZE},{MAP_EXPORT_SIZE}",  # Output image size in pixels
         "f": "image"                 # Output format is image (PNG)
     }
     if layers:
@@ -150,7 +345,7 @@ def get_map_image(bbox_string, url, layers=None):
 
     try:
         # Use GET request for image export
-        response = requests.get(url, params=export_params, timeout=20)
+        response = get_session().get(url, params=export_params, timeout=20)
         response.raise_for_status()
 
         return response.content
@@ -158,13 +353,21 @@ def get_map_image(bbox_string, url, layers=None):
     except requests.exceptions.RequestException as e:
         print(f"   -> ERROR requesting map image: {e}")
 
+# Earth radius in meters, as used in the Web Mercator projection
+WEB_MERCATOR_RADIUS = 6378137.0
+
 def web_mercator_to_latlon(x, y):
     """
-    Converts a single coordinate pair from Web Mercator (EPSG:3857) 
-    to Latitude/Longitude (WGS84 or EPSG:4326).
+    Converts Web Mercator (EPSG:3857) coordinates to Latitude/Longitude
+    (WGS84 or EPSG:4326). Accepts a single pair or NumPy arrays of x and y,
+    which are converted element-wise in one call.
     """
-    # Earth radius in meters, as used in the Web Mercator projection
-    R = 6378137.0  
+    import numpy as np
+
+    if not np.isscalar(x) or not np.isscalar(y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+    R = WEB_MERCATOR_RADIUS
     # Longitude (lambda) conversion: lambda = (X / R) * (180 / pi)
     lon = np.degrees(x / R)
     # Latitude (phi) conversion: phi = arctan(sinh(Y / R)) * (180 / pi)
@@ -189,7 +392,7 @@ def topology_layer(bbox):
         #     "Referer": "https://en-us.topographic-map.com/",
         #     "Accept-Language": "en-US,en;q=0.9"
         # }
-        session = c_requests.Session()
+        session = get_curl_session()
         # Use GET request for image export
         response = session.get(
             HEIGHT_MAP,
@@ -206,6 +409,118 @@ def topology_layer(bbox):
 
 
 
+# --- STEP 5: Fetch all the layers for a Bounding Box ---
+# Layer name -> file name used when the layer is saved.
+LAYER_FILES = {
+    "topology": "topology_map.png",
+    "contour": "contour_map.png",
+    "parcel": "parcel_map.png",
+    "road": "road_map.png",
+}
+
+@dataclass
+class LayerResult:
+    """Outcome of fetching a single map layer."""
+    name: str
+    content: Optional[bytes]
+    elapsed: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.content is not None
+
+_layer_executor: Optional[ThreadPoolExecutor] = None
+_save_executor: Optional[ThreadPoolExecutor] = None
+_layer_executor_lock = threading.Lock()
+
+def _get_layer_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared, bounded thread pool used for concurrent layer fetching.
+    """
+    global _layer_executor
+    with _layer_executor_lock:
+        if _layer_executor is None:
+            _layer_executor = ThreadPoolExecutor(
+                max_workers=LAYER_FETCH_WORKERS,
+                thread_name_prefix="gis-layer"
+            )
+        return _layer_executor
+
+def shutdown_executors(wait: bool = True):
+    """
+    Shuts down the layer fetch, tile fetch and image save pools; they are
+    recreated on next use. Pending image saves are always flushed.
+    """
+    global _layer_executor, _save_executor
+    # Only loaded in the "tiles" map fetch mode; do not import it (and OpenCV) here.
+    tile_cache = sys.modules.get("ap_agent_api.infrastructure.tile_cache")
+    if tile_cache is not None:
+        tile_cache.shutdown_executor(wait=wait)
+    with _layer_executor_lock:
+        if _layer_executor is not None:
+            _layer_executor.shutdown(wait=wait)
+            _layer_executor = None
+        if _save_executor is not None:
+            _save_executor.shutdown(wait=True)
+            _save_executor = None
+
+def _layer_fetchers(bbox, mode: str = MAP_FETCH_MODE) -> Dict[str, Callable[[], Optional[bytes]]]:
+    bbox_str = f"{bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]}"
+    if mode == "tiles":
+        # The basemaps are cached services and can be served from the tile grid.
+        from ap_agent_api.infrastructure import tile_cache
+        get_basemap_image = lambda url: tile_cache.get_tiled_map_image(bbox, url)
+    else:
+        get_basemap_image = lambda url: get_map_image(bbox_str, url)
+    return {
+        "topology": lambda: topology_layer(bbox),
+        "contour": lambda: get_basemap_image(CONTOURMAP_SERVICE_EXPORT_URL),
+        "parcel": lambda: get_basemap_image(PARCELMAP_SERVICE_EXPORT_URL),
+        # The planning atlas road layer is a dynamic service, always exported.
+        "road": lambda: get_map_image(bbox_str, ROAD_SERVICE_EXPORT_URL, layers="show:17"),
+    }
+
+def _fetch_layer(name, fetch) -> LayerResult:
+    """
+    Runs a single layer fetch, timing it and isolating any failure.
+    """
+    start = time.perf_counter()
+    try:
+        content = fetch()
+        error = None if content else "no image returned"
+    except Exception as e:
+        content, error = None, str(e)
+    elapsed = time.perf_counter() - start
+    metrics.LAYER_FETCH_SECONDS.observe(elapsed, layer=name)
+    if error:
+        logger.error(f"   -> ERROR fetching {name} layer after {elapsed:.2f}s: {error}")
+        metrics.UPSTREAM_ERRORS.inc(upstream=f"layer:{name}")
+    else:
+        logger.debug(f"   -> Fetched {name} layer in {elapsed:.2f}s")
+    return LayerResult(name=name, content=content or None, elapsed=elapsed, error=error)
+
+def fetch_layers(bbox, concurrent: bool = LAYER_FETCH_CONCURRENT, mode: str = MAP_FETCH_MODE) -> Dict[str, LayerResult]:
+    """
+    Fetches the topology, contour, parcel and road layers for the bounding box.
+
+    With concurrent=True all the exports are sent in parallel on a bounded thread
+    pool, so the wall-clock time is about that of the slowest layer. A failing
+    layer does not affect the others; its LayerResult carries the error.
+    With mode="tiles" the basemap layers are built from the tile cache.
+    """
+    fetchers = _layer_fetchers(bbox, mode)
+    if concurrent:
+        executor = _get_layer_executor()
+        futures = {name: executor.submit(_fetch_layer, name, fetch) for name, fetch in fetchers.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {name: _fetch_layer(name, fetch) for name, fetch in fetchers.items()}
+
+    timings = ", ".join(f"{r.name}={r.elapsed:.2f}s" for r in results.values())
+    logger.info(f"Layer fetch timings: {timings}")
+    return results
+
 def save_image(image_data, filename):
     """
     Saves the binary image data to a file.
@@ -214,43 +529,111 @@ def save_image(image_data, filename):
         with open(filename, 'wb') as f:
             f.write(image_data)
 
-def run(address: PropertyAddress):
+def _get_save_executor() -> ThreadPoolExecutor:
+    global _save_executor
+    with _layer_executor_lock:
+        if _save_executor is None:
+            _save_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gis-save")
+        return _save_executor
 
-    address_str = f"{address.street}, {address.suburb}, {address.state}"
+def save_layers(layers: Dict[str, LayerResult], output_dir: Path):
+    """
+    Saves every fetched layer image to the property directory.
+    """
+    for name, layer in layers.items():
+        save_image(layer.content, output_dir / LAYER_FILES[name])
+    logger.debug(f"SUCCESS: Contour map image saved in '{output_dir}'")
+
+def _log_save_failure(future: Future, output_dir: Path):
+    # Nothing waits on a background save, so its exception would be lost.
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Could not save the layer images in '{output_dir}'", exc_info=future.exception())
+
+@dataclass
+class GisImages:
+    """The fetched layer images for a property, kept in memory."""
+    # Where the images are saved; None when they are not persisted.
+    output_dir: Optional[Path]
+    bbox: Tuple[float, float, float, float]
+    layers: Dict[str, LayerResult]
+
+    def content(self, name: str) -> Optional[bytes]:
+        return self.layers[name].content
+
+def geocode_property(address: PropertyAddress) -> Tuple[float, float, float, float]:
+    """
+    Geocodes a property address (through the geocode cache).
 
-    # 1. Get WGS84 Geocode
-    wgs84_x, wgs84_y = get_geocode_from_service(address_str)
+    Returns:
+        tuple: (wgs84_x, wgs84_y, wm_x, wm_y)
 
-    if wgs84_x is not None:
-        # 2. Convert to Web Mercator (WKID 3857)
-        wm_x, wm_y = transform_coordinates(wgs84_x, wgs84_y)
+    Raises:
+        ValueError: If the address could not be geocoded.
+    """
+    address_str = f"{address.street}, {address.suburb}, {address.state}"
+
+    # 1. Get WGS84 Geocode and 2. convert it to Web Mercator (WKID 3857)
+    wgs84_x, wgs84_y, wm_x, wm_y = geocode_address(address_str)
 
-        # 3. Calculate Bounding Box
-        bbox = calculate_bounding_box(wm_x, wm_y, BOX_SIDE_METERS)
-        bbox_str = f"{bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]}"
+    if wgs84_x is None:
+        raise ValueError(f"Could not geocode address: {address_str}")
+    return wgs84_x, wgs84_y, wm_x, wm_y
 
-        # get topology layer
-        topology_image = topology_layer(bbox)
+def fetch_images(address: PropertyAddress, wm_x: float, wm_y: float, persist: str = IMAGE_PERSIST_MODE) -> GisImages:
+    """
+    Fetches all the layer images around a Web Mercator point into memory.
 
-        # 4. Get Contour Map Image
-        contour_image = get_map_image(bbox_str, CONTOURMAP_SERVICE_EXPORT_URL)
+    Args:
+        address: Property address, used for the output directory.
+        wm_x, wm_y: Web Mercator coordinates of the property.
+        persist: "sync" saves the images before returning, "async" saves them
+            on a background thread, "none" does not save them (and does not
+            create the output directory).
 
-        #5. Get Elevation Data (Optional - Not Implemented)
-        parcel_image = get_map_image(bbox_str, PARCELMAP_SERVICE_EXPORT_URL)
+    Returns:
+        GisImages: The in-memory layer images.
+    """
+    # 3. Calculate Bounding Box
+    bbox = calculate_bounding_box(wm_x, wm_y, BOX_SIDE_METERS)
 
-        #6. Get Road Map Image
-        road_image = get_map_image(bbox_str, ROAD_SERVICE_EXPORT_URL, layers="show:17")
+    # 4. Get the topology, contour, parcel and road map images
+    layers = fetch_layers(bbox)
 
-        # Save images to files
+    # Save images to files
+    output_dir = None
+    if persist == "sync":
         output_dir = get_property_directory(address)
-        
-        save_image(contour_image, output_dir / "contour_map.png")
-        save_image(parcel_image, output_dir / "parcel_map.png")
-        save_image(road_image, output_dir / "road_map.png")
-        save_image(topology_image, output_dir / "topology_map.png")
-        logger.debug(f"SUCCESS: Contour map image saved in '{output_dir}'")
+        save_layers(layers, output_dir)
+    elif persist == "async":
+        output_dir = get_property_directory(address)
+        future = _get_save_executor().submit(save_layers, layers, output_dir)
+        future.add_done_callback(lambda f: _log_save_failure(f, output_dir))
+    elif persist != "none":
+        raise ValueError(f"Unknown image persist mode: {persist}")
+
+    return GisImages(output_dir=output_dir, bbox=bbox, layers=layers)
+
+def generate_images(address: PropertyAddress, persist: str = IMAGE_PERSIST_MODE) -> GisImages:
+    """
+    Geocodes the address and fetches all its layer images into memory.
+
+    Args:
+        address: Property address.
+        persist: "sync", "async" or "none", see fetch_images.
 
-    return output_dir
+    Returns:
+        GisImages: The in-memory layer images.
+    """
+    _, _, wm_x, wm_y = geocode_property(address)
+    return fetch_images(address, wm_x, wm_y, persist=persist)
+
+def run(address: PropertyAddress):
+    """
+    Fetches the layer images for the address and saves them to its directory.
+
+    Returns: The property directory.
+    """
+    return generate_images(address, persist="sync").output_dir
 
 # --- MAIN EXECUTION ---
 
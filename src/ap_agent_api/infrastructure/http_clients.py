@@ -0,0 +1,80 @@
+"""
+Shared, keep-alive HTTP sessions for the geohub map services and the geocoder.
+
+Sessions are created on first use and reused for the lifetime of the process,
+so every request to lsa1/lsa2.geohub.sa.gov.au and location.sa.gov.au goes over
+a pooled connection instead of paying for a new TCP and TLS handshake.
+close_sessions() is called from the FastAPI app lifespan on shutdown.
+"""
+
+import threading
+from typing import TYPE_CHECKING, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ap_agent_api.config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+if TYPE_CHECKING:
+    # Imported on first use, to keep it out of the API start-up.
+    from curl_cffi import requests as c_requests
+
+import logging
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+# curl_cffi sessions are not thread-safe, so there is one per worker thread.
+_curl_local = threading.local()
+_curl_sessions: List["c_requests.Session"] = []
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the shared requests session, with a connection pool per host.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_curl_session() -> "c_requests.Session":
+    """
+    Returns the calling thread's curl_cffi session (used for browser impersonation).
+    """
+    session = getattr(_curl_local, "session", None)
+    if session is None:
+        from curl_cffi import requests as c_requests
+        session = c_requests.Session()
+        _curl_local.session = session
+        with _lock:
+            _curl_sessions.append(session)
+    return session
+
+
+def close_sessions():
+    """
+    Closes all the shared sessions and their pooled connections.
+    """
+    global _session, _curl_local
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        for session in _curl_sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"Error closing curl session: {e}")
+        _curl_sessions.clear()
+        _curl_local = threading.local()
+    logger.info("Closed shared HTTP sessions")
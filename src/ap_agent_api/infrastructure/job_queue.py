@@ -0,0 +1,239 @@
+"""
+Background job queues.
+
+A JobQueue stores jobs and hands each queued job to exactly one worker.
+InMemoryJobQueue lives in the API process; SQLiteJobQueue persists jobs so
+that they survive restarts and can be shared by the API workers on a host.
+Finished jobs are removed after a retention period.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ap_agent_api.config import JOB_QUEUE_BACKEND, JOB_QUEUE_PATH, JOB_RETENTION_SECONDS, JOB_LEASE_SECONDS
+from ap_agent_api.domain.models.job import Job, JobStatus
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class JobQueue(ABC):
+
+    @abstractmethod
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> Job:
+        """
+        Adds a job and returns it, with its new id.
+        """
+
+    @abstractmethod
+    def claim(self) -> Optional[Job]:
+        """
+        Marks the oldest queued job as running and returns it, or None if
+        nothing is queued. A job is only ever claimed once.
+        """
+
+    @abstractmethod
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        """
+        Marks a running job as succeeded with its result.
+        """
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str):
+        """
+        Marks a running job as failed with its error message.
+        """
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Returns the job, or None if there is no such job.
+        """
+
+    def close(self):
+        pass
+
+
+def _new_job(kind: str, payload: Dict[str, Any]) -> Job:
+    return Job(id=uuid.uuid4().hex, kind=kind, payload=payload, created_at=time.time())
+
+
+class InMemoryJobQueue(JobQueue):
+
+    def __init__(self, retention_seconds: float = JOB_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._queued = deque()
+        # Ids of finished jobs, in the order they finished.
+        self._finished = deque()
+        self._lock = threading.Lock()
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> Job:
+        job = _new_job(kind, payload)
+        with self._lock:
+            self._purge_finished()
+            self._jobs[job.id] = job
+            self._queued.append(job.id)
+        return job.model_copy()
+
+    def _purge_finished(self):
+        expired_before = time.time() - self.retention_seconds
+        while self._finished and self._jobs[self._finished[0]].finished_at <= expired_before:
+            del self._jobs[self._finished.popleft()]
+
+    def claim(self) -> Optional[Job]:
+        with self._lock:
+            if not self._queued:
+                return None
+            job = self._jobs[self._queued.popleft()]
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            return job.model_copy()
+
+    def _finish(self, job_id: str, status: JobStatus, result=None, error=None):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            self._finished.append(job_id)
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        self._finish(job_id, JobStatus.SUCCEEDED, result=result)
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, JobStatus.FAILED, error=error)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job is not None else None
+
+
+class SQLiteJobQueue(JobQueue):
+
+    _COLUMNS = "id, kind, status, payload, result, error, created_at, started_at, finished_at"
+
+    def __init__(self, path: Path = JOB_QUEUE_PATH, retention_seconds: float = JOB_RETENTION_SECONDS,
+                 lease_seconds: float = JOB_LEASE_SECONDS):
+        self.path = Path(path)
+        self.retention_seconds = retention_seconds
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode, so that claim() can take the write lock itself.
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_queued ON jobs (status, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (status, finished_at)")
+
+    def _to_job(self, row) -> Job:
+        id, kind, status, payload, result, error, created_at, started_at, finished_at = row
+        return Job(
+            id=id, kind=kind, status=JobStatus(status),
+            payload=json.loads(payload),
+            result=json.loads(result) if result is not None else None,
+            error=error, created_at=created_at, started_at=started_at, finished_at=finished_at
+        )
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> Job:
+        job = _new_job(kind, payload)
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at <= ?",
+                (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value, time.time() - self.retention_seconds)
+            )
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.kind, job.status.value, json.dumps(job.payload), job.created_at)
+            )
+        return job
+
+    def claim(self) -> Optional[Job]:
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so two processes
+            # cannot select the same queued job.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs of crashed workers never finish; their lease runs out.
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ? AND started_at <= ?",
+                    (JobStatus.QUEUED.value, JobStatus.RUNNING.value, time.time() - self.lease_seconds)
+                )
+                row = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM jobs WHERE status = ? ORDER BY created_at, rowid LIMIT 1",
+                    (JobStatus.QUEUED.value,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                started_at = time.time()
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                    (JobStatus.RUNNING.value, started_at, row[0])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = self._to_job(row)
+        job.status = JobStatus.RUNNING
+        job.started_at = started_at
+        return job
+
+    def _finish(self, job_id: str, status: JobStatus, result=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status.value, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        self._finish(job_id, JobStatus.SUCCEEDED, result=result)
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, JobStatus.FAILED, error=error)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_job_queue(backend: str = JOB_QUEUE_BACKEND) -> JobQueue:
+    """
+    Creates the job queue for the configured backend ("memory" or "sqlite").
+    """
+    if backend == "memory":
+        return InMemoryJobQueue()
+    if backend == "sqlite":
+        return SQLiteJobQueue()
+    raise ValueError(f"Unknown job queue backend: {backend}")
@@ -1,11 +1,15 @@
-from agents import Agent, WebSearchTool
+from typing import TYPE_CHECKING
 
 # from ap_agent_api.domain.models.property import PropertyData
 
+if TYPE_CHECKING:
+    # Imported on first use, to keep it out of the API start-up.
+    from agents import Agent
+
 def create_search_agent(
     instruction: str,
     output_type
-) -> Agent:
+) -> "Agent":
     """
     Factory function to create a property search agent.
     
@@ -16,6 +20,7 @@ def create_search_agent(
     Returns:
         Configured Agent instance for property searching.
     """
+    from agents import Agent, WebSearchTool
     
     # Create agent with WebSearchTool
     agent = Agent(
@@ -0,0 +1,228 @@
+"""
+Prometheus-style metrics.
+
+A small, dependency-free registry of counters, histograms and callback gauges,
+rendered in the Prometheus text exposition format by the /metrics endpoint.
+Metrics are per process.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+# Latency buckets (seconds), from OpenCV kernels (ms) to agent runs (minutes).
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last)], sum, count
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observes the duration of the with-block, also when it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def samples(self):
+        with self._lock:
+            values = sorted((key, ([*entry[0]], entry[1], entry[2])) for key, entry in self._values.items())
+        for key, (bucket_counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time."""
+    type = "gauge"
+
+    def __init__(self, name, documentation, callback: Callable[[], Dict[Tuple[str, ...], float]], labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def samples(self):
+        for key, value in sorted(self.callback().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_callback(self, name, documentation, callback, labelnames=()) -> CallbackGauge:
+        return self.register(CallbackGauge(name, documentation, callback, labelnames))
+
+    def render(self) -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+# Starlette appends "; charset=utf-8" to text responses.
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# --- Pipeline metrics ---
+GEOCODE_SECONDS = REGISTRY.histogram(
+    "propertyai_geocode_request_seconds", "Latency of geocodeAddresses requests to the geocoder."
+)
+LAYER_FETCH_SECONDS = REGISTRY.histogram(
+    "propertyai_layer_fetch_seconds", "Latency of fetching one map layer image.", ["layer"]
+)
+IMAGE_DECODE_SECONDS = REGISTRY.histogram(
+    "propertyai_image_decode_seconds", "Time to decode a contour map image."
+)
+CONTOUR_ISOLATION_SECONDS = REGISTRY.histogram(
+    "propertyai_contour_isolation_seconds", "Time to isolate contour lines from roads and labels."
+)
+RING_SCORING_SECONDS = REGISTRY.histogram(
+    "propertyai_ring_scoring_seconds", "Time to score contour density in the risk rings."
+)
+TILED_SCORING_SECONDS = REGISTRY.histogram(
+    "propertyai_tiled_scoring_seconds",
+    "Time to isolate contour lines and score the risk rings of a large map, tile by tile."
+)
+# The histogram of each step timed by elevation_risk_calculator.calculate.
+SCORING_STEP_SECONDS = {
+    "decode": IMAGE_DECODE_SECONDS,
+    "isolation": CONTOUR_ISOLATION_SECONDS,
+    "scoring": RING_SCORING_SECONDS,
+    "tiled_scoring": TILED_SCORING_SECONDS,
+}
+AGENT_RUN_SECONDS = REGISTRY.histogram(
+    "propertyai_agent_run_seconds", "Duration of property search agent runs.", ["outcome"]
+)
+UPSTREAM_ERRORS = REGISTRY.counter(
+    "propertyai_upstream_errors_total", "Failed calls to upstream services.", ["upstream"]
+)
+
+
+# Caches exposed by register_cache: name -> stats callable.
+_caches: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+def _cache_field(field: str):
+    return lambda: {(name,): stats()[field] for name, stats in list(_caches.items())}
+
+REGISTRY.gauge_callback("propertyai_cache_hits", "Cache hits.", _cache_field("hits"), ["cache"])
+REGISTRY.gauge_callback("propertyai_cache_misses", "Cache misses.", _cache_field("misses"), ["cache"])
+REGISTRY.gauge_callback("propertyai_cache_hit_ratio", "Cache hit ratio.", _cache_field("hit_ratio"), ["cache"])
+
+def register_cache(name: str, stats: Callable[[], Dict[str, float]]):
+    """
+    Exposes a cache's hits, misses and hit ratio, read from stats() (a dict with
+    "hits", "misses" and "hit_ratio", like LRUCache.stats) at scrape time.
+    """
+    _caches[name] = stats
@@ -0,0 +1,219 @@
+"""
+Memory-mapped raster store.
+
+Decoded layer images and derived rasters (e.g. isolated contour masks) are
+appended uncompressed to a single data file, with an SQLite index of where
+each (property key, layer) raster starts and its shape. Reads map the data
+file with np.memmap, so a raw raster is a zero-copy view and batch jobs do
+not pay a PNG decode per image. Binary masks can be bit-packed (one bit per
+pixel); unpacking them is still far cheaper than zlib.
+
+Rasters are never rewritten in place: putting a layer again appends it and
+repoints the index, so readers holding an older array are unaffected. The
+replaced bytes stay in the data file until compact() copies the live rasters
+to a new data file (stats() reports how much would be reclaimed). Writers in
+several processes are serialised by the SQLite write lock.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from ap_agent_api.config import RASTER_STORE_DIR, RASTER_STORE_PACK_MASKS
+from ap_agent_api.domain.utils import get_property_key
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class RasterStore:
+
+    def __init__(self, directory: Path = RASTER_STORE_DIR, pack_masks: bool = RASTER_STORE_PACK_MASKS):
+        self.directory = Path(directory)
+        self.pack_masks = pack_masks
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Data file name -> its memory map
+        self._maps: Dict[str, np.memmap] = {}
+        # Autocommit mode, so that put() can take the write lock itself.
+        self._conn = sqlite3.connect(
+            str(self.directory / "index.sqlite3"), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rasters (
+                    property_key TEXT NOT NULL,
+                    layer TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    nbytes INTEGER NOT NULL,
+                    shape TEXT NOT NULL,
+                    dtype TEXT NOT NULL,
+                    packed INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (property_key, layer)
+                )
+                """
+            )
+            # The data file that puts append to; compact() switches it.
+            self._conn.execute("CREATE TABLE IF NOT EXISTS data_file (name TEXT NOT NULL)")
+            self._conn.execute("INSERT INTO data_file SELECT 'rasters-0.bin' WHERE NOT EXISTS (SELECT 1 FROM data_file)")
+
+    @property
+    def data_path(self) -> Path:
+        """The data file that rasters are currently appended to."""
+        with self._lock:
+            return self.directory / self._data_file()
+
+    def _data_file(self) -> str:
+        return self._conn.execute("SELECT name FROM data_file").fetchone()[0]
+
+    def put(self, property_address, layer: str, raster: np.ndarray) -> None:
+        """
+        Stores (or replaces) a raster of the address. 2D uint8 masks of 0 and
+        255 are bit-packed when pack_masks is set; other arrays are stored raw.
+        """
+        raster = np.ascontiguousarray(raster)
+        packed = self.pack_masks and raster.ndim == 2 and raster.dtype == np.uint8 and \
+            not np.any((raster != 0) & (raster != 255))
+        data = np.packbits(raster != 0, axis=1) if packed else raster
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                data_file = self._data_file()
+                with open(self.directory / data_file, "ab") as f:
+                    offset = f.tell()
+                    f.write(data.tobytes())
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rasters VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (get_property_key(property_address), layer, data_file, offset, data.nbytes,
+                     ",".join(map(str, raster.shape)), raster.dtype.str, int(packed), time.time())
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get(self, property_address, layer: str, newer_than: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Returns the stored raster, or None if there is none (or it was stored
+        before the `newer_than` timestamp, e.g. the mtime of its source image).
+        Raw rasters are read-only views of the memory-mapped data file.
+        """
+        key = get_property_key(property_address)
+        # A compaction in another process can remove the data file between the
+        # index lookup and mapping it; the index then points to the new file.
+        for attempt in range(2):
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT file, offset, nbytes, shape, dtype, packed, stored_at FROM rasters "
+                    "WHERE property_key = ? AND layer = ?",
+                    (key, layer)
+                ).fetchone()
+                if row is None:
+                    return None
+                data_file, offset, nbytes, shape, dtype, packed, stored_at = row
+                if newer_than is not None and stored_at < newer_than:
+                    return None
+                try:
+                    data = self._mapped(data_file, offset + nbytes)[offset:offset + nbytes]
+                    break
+                except FileNotFoundError:
+                    if attempt:
+                        raise
+
+        shape = tuple(int(n) for n in shape.split(","))
+        if packed:
+            height, width = shape
+            bits = np.unpackbits(data.reshape(height, -1), axis=1, count=width)
+            return np.multiply(bits, 255, dtype=np.uint8)
+        return data.view(np.dtype(dtype)).reshape(shape)
+
+    def _mapped(self, data_file: str, end: int) -> np.memmap:
+        # Re-map when the file has grown past the mapped region; arrays from
+        # the older map keep it alive.
+        mapped = self._maps.get(data_file)
+        if mapped is None or len(mapped) < end:
+            mapped = self._maps[data_file] = np.memmap(self.directory / data_file, dtype=np.uint8, mode="r")
+        return mapped
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the "live_bytes" of the indexed rasters and the "file_bytes"
+        of the data file; the difference is what compact() would reclaim.
+        """
+        with self._lock:
+            live_bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM rasters").fetchone()[0]
+            data_path = self.directory / self._data_file()
+            file_bytes = os.path.getsize(data_path) if data_path.exists() else 0
+        return {"live_bytes": live_bytes, "file_bytes": file_bytes}
+
+    def compact(self) -> int:
+        """
+        Copies the indexed rasters to a new data file, repoints the index to it
+        and removes the old one, reclaiming the space of replaced rasters.
+        Puts wait for the compaction; arrays read before it stay valid.
+
+        Returns:
+            int: Bytes reclaimed.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            old_file = self._data_file()
+            old_path = self.directory / old_file
+            file_bytes = os.path.getsize(old_path) if old_path.exists() else 0
+            generation = int(old_file[len("rasters-"):-len(".bin")]) + 1
+            new_file = f"rasters-{generation}.bin"
+            try:
+                rows = self._conn.execute(
+                    "SELECT property_key, layer, file, offset, nbytes FROM rasters ORDER BY file, offset"
+                ).fetchall()
+                offset = 0
+                with open(self.directory / new_file, "wb") as f:
+                    for property_key, layer, data_file, old_offset, nbytes in rows:
+                        source = self._mapped(data_file, old_offset + nbytes)
+                        f.write(source[old_offset:old_offset + nbytes].tobytes())
+                        self._conn.execute(
+                            "UPDATE rasters SET file = ?, offset = ? WHERE property_key = ? AND layer = ?",
+                            (new_file, offset, property_key, layer)
+                        )
+                        offset += nbytes
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._conn.execute("UPDATE data_file SET name = ?", (new_file,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                (self.directory / new_file).unlink(missing_ok=True)
+                raise
+            # Open maps keep the removed file's data readable.
+            self._maps.pop(old_file, None)
+            old_path.unlink(missing_ok=True)
+        logger.info(f"Compacted the raster store to {offset} bytes ({file_bytes - offset} reclaimed)")
+        return file_bytes - offset
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+            self._maps.clear()
+
+
+_store: Optional[RasterStore] = None
+_store_lock = threading.Lock()
+
+def get_raster_store() -> RasterStore:
+    """
+    Returns the process-wide raster store.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RasterStore()
+        return _store
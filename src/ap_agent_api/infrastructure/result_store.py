@@ -0,0 +1,149 @@
+"""
+Indexed result store.
+
+Results are kept as JSON in an SQLite table keyed by (property key, artifact),
+where the property key is the hash of the normalized address (see
+get_property_key). Each row records when the result was fetched, so freshness
+is an explicit per-artifact TTL rather than a file mtime. A properties table
+holds the address fields, so results can be queried by suburb and fetch time.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from ap_agent_api.config import RESULT_STORE_PATH
+from ap_agent_api.domain.utils import get_property_key
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredResult:
+    """A stored result; data is the JSON document."""
+    property_key: str
+    street: str
+    suburb: str
+    state: str
+    postcode: str
+    artifact: str
+    data: str
+    fetched_at: float
+
+
+class ResultStore:
+
+    def __init__(self, path: Path = RESULT_STORE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS properties (
+                    property_key TEXT PRIMARY KEY,
+                    street TEXT NOT NULL,
+                    suburb TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    postcode TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    property_key TEXT NOT NULL REFERENCES properties (property_key),
+                    artifact TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (property_key, artifact)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS properties_suburb ON properties (suburb COLLATE NOCASE, state COLLATE NOCASE)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_fetched ON results (artifact, fetched_at)")
+
+    def put(self, property_address, artifact: str, data: str, fetched_at: Optional[float] = None) -> float:
+        """
+        Stores (or replaces) the JSON result of an artifact for the address.
+
+        Returns:
+            float: The fetched_at timestamp that was recorded.
+        """
+        key = get_property_key(property_address)
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO properties VALUES (?, ?, ?, ?, ?)",
+                (key, property_address.street, property_address.suburb, property_address.state, property_address.postcode)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, artifact, data, fetched_at)
+            )
+        return fetched_at
+
+    def get(self, property_address, artifact: str) -> Optional[StoredResult]:
+        """
+        Returns the stored result, or None. Freshness is left to the caller.
+        """
+        rows = self._select(
+            "WHERE r.property_key = ? AND r.artifact = ?",
+            (get_property_key(property_address), artifact)
+        )
+        return rows[0] if rows else None
+
+    def find(self, artifact: str, suburb: Optional[str] = None, state: Optional[str] = None,
+             since: Optional[float] = None, limit: Optional[int] = 1000) -> List[StoredResult]:
+        """
+        Returns results of an artifact, newest first, optionally only those for
+        a suburb/state (case-insensitive) or fetched at or after `since`.
+        A limit of None returns every match.
+        """
+        clauses, params = ["r.artifact = ?"], [artifact]
+        if suburb is not None:
+            clauses.append("p.suburb = ? COLLATE NOCASE")
+            params.append(suburb)
+        if state is not None:
+            clauses.append("p.state = ? COLLATE NOCASE")
+            params.append(state)
+        if since is not None:
+            clauses.append("r.fetched_at >= ?")
+            params.append(since)
+        params.append(-1 if limit is None else limit)
+        return self._select(f"WHERE {' AND '.join(clauses)} ORDER BY r.fetched_at DESC LIMIT ?", params)
+
+    def _select(self, where: str, params) -> List[StoredResult]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.property_key, p.street, p.suburb, p.state, p.postcode, r.artifact, r.data, r.fetched_at "
+                f"FROM results r JOIN properties p ON p.property_key = r.property_key {where}",
+                params
+            ).fetchall()
+        return [StoredResult(*row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+def get_result_store() -> ResultStore:
+    """
+    Returns the process-wide result store.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultStore()
+        return _store
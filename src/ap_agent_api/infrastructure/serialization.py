@@ -0,0 +1,45 @@
+"""
+JSON serialization, through orjson.
+
+orjson is a declared dependency; if it is missing from an environment the
+standard json module is used instead, with the same compact output.
+"""
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serializes obj to compact UTF-8 JSON. Pydantic models are dumped by alias,
+    like FastAPI responses.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump_json(by_alias=True).encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data) -> Any:
+    """
+    Parses JSON from bytes or str.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
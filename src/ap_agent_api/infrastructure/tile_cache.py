@@ -0,0 +1,189 @@
+"""
+Tile-grid map imagery with an on-disk tile cache.
+
+Instead of asking MapServer/export for an arbitrary bbox centred on each
+address, the standard Web Mercator tiles covering the bbox are fetched from
+the service's tile endpoint, cached on disk keyed by (service, z, x, y), and
+mosaicked and cropped locally. Neighbouring addresses share most of their
+tiles, so a street or suburb is mostly served from the cache.
+
+Only cached basemap services (the "_wmas" services) expose tiles.
+"""
+
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ap_agent_api.config import TILE_CACHE_DIR, TILE_LEVEL, TILE_OUTPUT_SIZE
+from ap_agent_api.infrastructure.http_clients import get_session
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Tiling scheme of the SA Geohub Web Mercator services
+# (https://location.sa.gov.au/arcgis/rest/services/BaseMaps/Topographic_wmas/MapServer)
+TILE_ORIGIN_X = -2.0037508342787E7
+TILE_ORIGIN_Y = 2.0037508342787E7
+TILE_SIZE = 256
+LEVEL_0_RESOLUTION = 156543.03392800014  # Meters per pixel at level 0
+
+
+def tile_resolution(z: int) -> float:
+    """
+    Meters per pixel at the given level (1.1943285668550503 at level 17).
+    """
+    return LEVEL_0_RESOLUTION / (2 ** z)
+
+
+def tile_range(bbox, z: int) -> Tuple[int, int, int, int]:
+    """
+    Returns the (col_min, row_min, col_max, row_max) tiles covering a Web Mercator bbox.
+    """
+    xmin, ymin, xmax, ymax = bbox
+    tile_meters = tile_resolution(z) * TILE_SIZE
+    col_min = int((xmin - TILE_ORIGIN_X) // tile_meters)
+    col_max = int((xmax - TILE_ORIGIN_X) // tile_meters)
+    row_min = int((TILE_ORIGIN_Y - ymax) // tile_meters)
+    row_max = int((TILE_ORIGIN_Y - ymin) // tile_meters)
+    return col_min, row_min, col_max, row_max
+
+
+def crop_window(bbox, z: int, col_min: int, row_min: int) -> Tuple[int, int, int, int]:
+    """
+    Returns the (left, top, width, height) pixels of a Web Mercator bbox in
+    the mosaic of tiles whose top-left tile is (col_min, row_min).
+    """
+    xmin, ymin, xmax, ymax = bbox
+    resolution = tile_resolution(z)
+    tile_meters = resolution * TILE_SIZE
+    left = int(round((xmin - (TILE_ORIGIN_X + col_min * tile_meters)) / resolution))
+    top = int(round(((TILE_ORIGIN_Y - row_min * tile_meters) - ymax) / resolution))
+    width = int(round((xmax - xmin) / resolution))
+    height = int(round((ymax - ymin) / resolution))
+    return left, top, width, height
+
+
+def tile_service_url(export_url: str) -> str:
+    """
+    Maps a MapServer/export URL to its MapServer base URL.
+    """
+    return export_url.rsplit("/export", 1)[0]
+
+
+class TileCache:
+    """
+    On-disk cache of raw tile bytes, laid out as <root>/<service>/<z>/<x>/<y>.png.
+    """
+
+    def __init__(self, root: Path = TILE_CACHE_DIR):
+        self.root = Path(root)
+
+    @staticmethod
+    def service_key(service_url: str) -> str:
+        path = service_url.split("/rest/services/", 1)[-1]
+        return re.sub(r"[^\w.-]", "_", path.replace("/MapServer", ""))
+
+    def path(self, service_url: str, z: int, x: int, y: int) -> Path:
+        return self.root / self.service_key(service_url) / str(z) / str(x) / f"{y}.png"
+
+    def get(self, service_url: str, z: int, x: int, y: int) -> Optional[bytes]:
+        try:
+            return self.path(service_url, z, x, y).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, service_url: str, z: int, x: int, y: int, content: bytes):
+        path = self.path(service_url, z, x, y)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial tile.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+_tile_cache = TileCache()
+_tile_executor: Optional[ThreadPoolExecutor] = None
+_tile_executor_lock = threading.Lock()
+
+def _get_tile_executor() -> ThreadPoolExecutor:
+    global _tile_executor
+    with _tile_executor_lock:
+        if _tile_executor is None:
+            _tile_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gis-tile")
+        return _tile_executor
+
+def shutdown_executor(wait: bool = True):
+    """
+    Shuts down the tile fetch pool; it is recreated on next use.
+    """
+    global _tile_executor
+    with _tile_executor_lock:
+        if _tile_executor is not None:
+            _tile_executor.shutdown(wait=wait)
+            _tile_executor = None
+
+
+def fetch_tile(service_url: str, z: int, x: int, y: int, cache: TileCache = _tile_cache) -> bytes:
+    """
+    Returns the tile bytes, from the disk cache when available.
+    """
+    content = cache.get(service_url, z, x, y)
+    if content is not None:
+        return content
+    # ArcGIS tile endpoint order is level/row/column.
+    response = get_session().get(f"{service_url}/tile/{z}/{y}/{x}", timeout=20)
+    response.raise_for_status()
+    content = response.content
+    cache.put(service_url, z, x, y, content)
+    return content
+
+
+def get_tiled_map_image(bbox, export_url: str, z: int = TILE_LEVEL, size: int = TILE_OUTPUT_SIZE,
+                        cache: TileCache = _tile_cache) -> bytes:
+    """
+    Builds the map image for a bbox from cached tiles.
+
+    The covering tiles are mosaicked and cropped to the bbox, at the tile
+    level's native resolution (size 0, the default). A non-zero size resizes
+    the crop to size x size pixels with nearest-neighbour sampling, which keeps
+    the map colours the contour isolation relies on but duplicates or drops
+    whole pixel rows and columns, so contour lengths, and the risk scores,
+    drift by up to the resampling ratio. Score the native image with its
+    ground width (box_side_metres) instead.
+
+    Returns: PNG bytes, like MapServer/export.
+    """
+    service_url = tile_service_url(export_url)
+    col_min, row_min, col_max, row_max = tile_range(bbox, z)
+    tiles = [(x, y) for y in range(row_min, row_max + 1) for x in range(col_min, col_max + 1)]
+
+    contents = list(_get_tile_executor().map(lambda xy: fetch_tile(service_url, z, xy[0], xy[1], cache), tiles))
+
+    mosaic = np.zeros(((row_max - row_min + 1) * TILE_SIZE, (col_max - col_min + 1) * TILE_SIZE, 3), dtype=np.uint8)
+    for (x, y), content in zip(tiles, contents):
+        tile = cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if tile is None:
+            raise ValueError(f"Could not decode tile {z}/{y}/{x} of {service_url}")
+        top, left = (y - row_min) * TILE_SIZE, (x - col_min) * TILE_SIZE
+        mosaic[top:top + TILE_SIZE, left:left + TILE_SIZE] = tile[:TILE_SIZE, :TILE_SIZE]
+
+    # Crop the bbox out of the mosaic.
+    left, top, width, height = crop_window(bbox, z, col_min, row_min)
+    cropped = mosaic[top:top + height, left:left + width]
+
+    if size and cropped.shape[:2] != (size, size):
+        cropped = cv2.resize(cropped, (size, size), interpolation=cv2.INTER_NEAREST)
+
+    ok, encoded = cv2.imencode(".png", cropped)
+    if not ok:
+        raise ValueError("Could not encode the mosaicked map image")
+    logger.debug(f"   -> Mosaicked {len(tiles)} tiles from {service_url}")
+    return encoded.tobytes()
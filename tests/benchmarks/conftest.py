@@ -0,0 +1,94 @@
+"""
+Offline benchmarks of the elevation pipeline.
+
+They are marked "benchmark" and deselected by default (see pyproject.toml);
+run them with:
+    python -m pytest tests/benchmarks -m benchmark
+
+With pytest-benchmark installed its `benchmark` fixture is used, so runs can be
+saved and compared (--benchmark-autosave, --benchmark-compare). Without it, a
+minimal fixture with the same calling convention times each benchmark and
+prints a summary table.
+"""
+
+import time
+
+import pytest
+
+try:
+    import pytest_benchmark  # noqa: F401
+    HAS_PYTEST_BENCHMARK = True
+except ImportError:
+    HAS_PYTEST_BENCHMARK = False
+
+
+class FallbackBenchmark:
+    """Times fn over warmup + measured rounds, like pytest-benchmark's fixture."""
+
+    min_rounds = 5
+    min_time = 0.2
+    warmup_rounds = 1
+
+    def __init__(self, name: str):
+        self.name = name
+        self.timings = []
+
+    def __call__(self, fn, *args, **kwargs):
+        for _ in range(self.warmup_rounds):
+            fn(*args, **kwargs)
+        deadline = time.perf_counter() + self.min_time
+        while len(self.timings) < self.min_rounds or time.perf_counter() < deadline:
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            self.timings.append(time.perf_counter() - start)
+        return result
+
+    def pedantic(self, fn, args=(), kwargs=None, rounds=1, iterations=1, warmup_rounds=0):
+        kwargs = kwargs or {}
+        for _ in range(warmup_rounds):
+            fn(*args, **kwargs)
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = fn(*args, **kwargs)
+            self.timings.append((time.perf_counter() - start) / iterations)
+        return result
+
+
+_fallback_results = []
+_report_lines = []
+
+
+@pytest.fixture
+def benchmark_report():
+    """
+    Adds a line to the benchmark notes shown in the terminal summary, for
+    comparisons that do not fit the benchmark fixture.
+    """
+    return _report_lines.append
+
+if not HAS_PYTEST_BENCHMARK:
+    @pytest.fixture
+    def benchmark(request):
+        bench = FallbackBenchmark(request.node.nodeid.split("::", 1)[-1])
+        yield bench
+        if bench.timings:
+            _fallback_results.append(bench)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _report_lines:
+        terminalreporter.section("benchmark notes")
+        for line in _report_lines:
+            terminalreporter.write_line(line)
+    if not _fallback_results:
+        return
+    terminalreporter.section("benchmarks (pytest-benchmark not installed)")
+    width = max(len(bench.name) for bench in _fallback_results)
+    terminalreporter.write_line(f"{'name':<{width}}  {'min (ms)':>10}  {'median (ms)':>12}  {'rounds':>7}")
+    for bench in _fallback_results:
+        timings = sorted(bench.timings)
+        median = timings[len(timings) // 2]
+        terminalreporter.write_line(
+            f"{bench.name:<{width}}  {timings[0] * 1e3:>10.3f}  {median * 1e3:>12.3f}  {len(timings):>7}"
+        )
@@ -0,0 +1,168 @@
+"""
+Benchmarks of the contour scoring pipeline on the committed sample maps and on
+synthetic high-density maps, with a correctness check against the stored
+assessment.
+"""
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+
+pytestmark = pytest.mark.benchmark
+
+SAMPLES_DIR = Path(__file__).parents[2] / "property_results"
+SAMPLE_MAPS = sorted(SAMPLES_DIR.glob("*/contour_map.png"))
+
+# BGR colours of the features on a real contour map.
+CONTOUR_BGR = (124, 132, 255)
+ROAD_BGR = (20, 60, 240)
+
+
+def _synthetic_map(size: int, spacing: int) -> np.ndarray:
+    """
+    A white map with a closed contour every `spacing` pixels around an off-centre
+    hill, crossed by roads, so that most rings are densely filled.
+    """
+    img = np.full((size, size, 3), 255, dtype=np.uint8)
+    centre = (size // 2 + size // 10, size // 2 - size // 12)
+    for radius in range(spacing, 2 * size, spacing):
+        cv2.ellipse(img, centre, (radius, int(radius * 0.7)), 20, 0, 360, CONTOUR_BGR, 1)
+    for offset in range(size // 8, size, size // 4):
+        cv2.line(img, (0, offset), (size - 1, offset + size // 10), ROAD_BGR, 3)
+        cv2.line(img, (offset, 0), (offset, size - 1), ROAD_BGR, 3)
+    return img
+
+
+SYNTHETIC_MAPS = {
+    "dense_400": _synthetic_map(400, 4),
+    "dense_1600": _synthetic_map(1600, 4),
+    # Contours far enough apart to stay separate lines after dilation.
+    "lines_1600": _synthetic_map(1600, 12),
+}
+
+
+def _encode(img: np.ndarray) -> bytes:
+    ok, buffer = cv2.imencode(".png", img)
+    assert ok
+    return buffer.tobytes()
+
+
+def _maps():
+    params = [pytest.param(cv2.imread(str(path)), id=path.parent.name) for path in SAMPLE_MAPS]
+    params += [pytest.param(img, id=name) for name, img in SYNTHETIC_MAPS.items()]
+    return params
+
+
+@pytest.fixture(params=_maps())
+def contour_map(request) -> np.ndarray:
+    return request.param
+
+
+def test_stored_assessment_matches(benchmark):
+    sample = SAMPLES_DIR / "1C_Raymel_Crescent"
+    expected = ElevationRiskAssessment.model_validate(json.loads((sample / "elevation_risk.json").read_text()))
+
+    result = benchmark(erc.calculate, str(sample / "contour_map.png"))
+
+    assert ElevationRiskAssessment(**result) == expected
+
+
+def test_subtract_roads_from_contours(benchmark, contour_map):
+    mask = benchmark(erc.subtract_roads_from_contours, contour_map)
+    assert mask.shape == contour_map.shape[:2]
+    assert mask.any()
+
+
+def test_get_contour_pixels(benchmark, contour_map):
+    mask = erc.subtract_roads_from_contours(contour_map)
+    pixels = benchmark(erc.get_contour_pixels, mask)
+    assert len(pixels) == np.count_nonzero(mask)
+
+
+def test_assess_ring_risk(benchmark, contour_map):
+    mask = erc.subtract_roads_from_contours(contour_map)
+    pixels = erc.get_contour_pixels(mask)
+    risk = benchmark(erc.assess_ring_risk, pixels, erc.CENTER_PIXEL, erc.RISK_RINGS)
+    assert risk == erc.assess_ring_risk_from_mask(mask, erc.CENTER_PIXEL, erc.RISK_RINGS)
+
+
+@pytest.mark.parametrize("engine", erc.ENGINES)
+def test_calculate_end_to_end(benchmark, contour_map, engine):
+    # From the PNG bytes, as returned by the map export.
+    risk = benchmark(erc.calculate, _encode(contour_map), engine=engine)
+    assert risk["Total Risk Score"] > 0
+
+
+def test_assess_ring_risk_from_mask(benchmark, contour_map):
+    # The pixel engine's scoring step (calculate on maps up to the tile size).
+    mask = erc.subtract_roads_from_contours(contour_map)
+    risk = benchmark(erc.assess_ring_risk_from_mask, mask, erc.CENTER_PIXEL, erc.RISK_RINGS)
+    assert risk["Total Risk Score"] > 0
+
+
+def test_assess_ring_risk_by_contours(benchmark, contour_map):
+    # The polyline engine's scoring step: tracing and scoring the polylines of
+    # the ring window; compare with test_assess_ring_risk_from_mask.
+    window, center = erc._ring_window(erc.subtract_roads_from_contours(contour_map), erc.CENTER_PIXEL, erc.RISK_RINGS)
+
+    def score():
+        return erc.assess_ring_risk_by_contours(erc.extract_contour_lines(window), center, erc.RISK_RINGS)
+
+    risk = benchmark(score)
+    assert risk["Total Risk Score"] > 0
+
+
+@pytest.mark.parametrize("max_workers", [1, None], ids=["serial", "process_pool"])
+def test_score_images_batch(benchmark, max_workers):
+    # A nightly re-scoring sized batch of the sample maps (as paths).
+    images = [path for path in SAMPLE_MAPS for _ in range(64)]
+    results = benchmark.pedantic(erc.score_images, args=(images,), kwargs={"max_workers": max_workers}, rounds=1)
+    assert all(r.ok for r in results)
+
+
+# Candidate centres around the default one: lot corners and neighbouring lots.
+CANDIDATE_CENTERS = [(erc.CENTER_PIXEL[0] + dx, erc.CENTER_PIXEL[1] + dy)
+                     for dx in range(-30, 31, 10) for dy in range(-30, 31, 10)]
+
+
+def test_assess_centers_full_passes(benchmark, contour_map):
+    mask = erc.subtract_roads_from_contours(contour_map)
+    risks = benchmark(lambda: [erc.assess_ring_risk_from_mask(mask, c, erc.RISK_RINGS) for c in CANDIDATE_CENTERS])
+    assert len(risks) == len(CANDIDATE_CENTERS)
+
+
+def test_assess_centers_ring_index(benchmark, contour_map):
+    # Includes building the index, as a request for several centres would.
+    mask = erc.subtract_roads_from_contours(contour_map)
+    risks = benchmark(lambda: erc.RingIndex(mask).assess_many(CANDIDATE_CENTERS))
+    assert risks == [erc.assess_ring_risk_from_mask(mask, c, erc.RISK_RINGS) for c in CANDIDATE_CENTERS]
+
+
+@pytest.mark.parametrize("tile_size", [4096, erc.SCORING_TILE_SIZE, 512], ids=["whole", "tiles_1024", "tiles_512"])
+def test_calculate_2048_export(benchmark, tile_size):
+    # A 2048px export of the same ground area, scored with the rings in metres.
+    img = cv2.resize(SYNTHETIC_MAPS["lines_1600"], (2048, 2048), interpolation=cv2.INTER_NEAREST)
+    risk = benchmark(erc.calculate, img, box_side_metres=erc.METRES_PER_PIXEL * 400, tile_size=tile_size)
+    assert risk["Total Risk Score"] > 0
+
+
+@pytest.mark.parametrize("pack_masks", [True, False], ids=["bitpacked", "raw"])
+def test_score_stored_masks(benchmark, tmp_path, pack_masks):
+    # Re-scoring from memory-mapped masks; compare with test_score_images_batch.
+    from ap_agent_api.domain.models.property import PropertyAddress
+    from ap_agent_api.infrastructure.raster_store import RasterStore
+
+    store = RasterStore(tmp_path, pack_masks=pack_masks)
+    addresses = [PropertyAddress(street=f"{n} Main Street", suburb="Campbelltown", state="SA", postcode="5074")
+                 for n in range(64 * len(SAMPLE_MAPS))]
+    for address, path in zip(addresses, [path for path in SAMPLE_MAPS for _ in range(64)]):
+        store.put(address, "contour_mask", erc.subtract_roads_from_contours(str(path)))
+
+    risks = benchmark.pedantic(lambda: [erc.score_mask(store.get(a, "contour_mask")) for a in addresses], rounds=3)
+    assert len(risks) == len(addresses)
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark of a cached PropertySearchResponse: the previous path (parse
+the stored JSON, validate it, then let FastAPI validate and serialize the
+response) against the fast path (splice the cached JSON bytes into the
+response envelope).
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from ap_agent_api.domain.models.property import PropertyData
+from ap_agent_api.infrastructure import serialization
+from ap_agent_api.infrastructure.api.fast_json import FastJSONResponse, envelope_response
+from ap_agent_api.infrastructure.api.models.responses import PropertySearchResponse
+
+pytestmark = pytest.mark.benchmark
+
+SAMPLE = Path(__file__).parents[2] / "property_results" / "1C_Raymel_Crescent" / "property_details.json"
+MESSAGE = "Property data loaded from existing file"
+ROUNDS = 2000
+
+
+def _previous_path(raw: str) -> bytes:
+    # load() -> model_validate_json -> response_model validation -> jsonable_encoder -> json.dumps
+    data = PropertyData.model_validate_json(raw)
+    response = PropertySearchResponse(success=True, message=MESSAGE, data=data)
+    response = PropertySearchResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(response), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _model_path(data: PropertyData) -> bytes:
+    return FastJSONResponse(PropertySearchResponse(success=True, message=MESSAGE, data=data)).body
+
+
+def _cached_bytes_path(data_json: bytes) -> bytes:
+    return envelope_response(MESSAGE, data_json).body
+
+
+def _per_call(fn, arg) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(arg)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def test_cached_search_response_serialization(benchmark_report):
+    raw = SAMPLE.read_text()
+    data = PropertyData.model_validate_json(raw)
+    data_json = serialization.dumps(data)
+
+    # All three produce the same document.
+    expected = json.loads(_previous_path(raw))
+    assert json.loads(_model_path(data)) == expected
+    assert json.loads(_cached_bytes_path(data_json)) == expected
+
+    previous = _per_call(_previous_path, raw)
+    model = _per_call(_model_path, data)
+    cached = _per_call(_cached_bytes_path, data_json)
+    benchmark_report(
+        f"PropertySearchResponse (orjson={serialization.HAS_ORJSON}): "
+        f"previous {previous * 1e6:.1f}us, model {model * 1e6:.1f}us, cached bytes {cached * 1e6:.1f}us "
+        f"({previous / cached:.0f}x)"
+    )
+    assert cached < previous / 2
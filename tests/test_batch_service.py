@@ -0,0 +1,106 @@
+"""
+Portfolio scoring: stored results come first, every address is yielded once
+with its index, and a failing assessment only fails its own item.
+"""
+
+import asyncio
+
+import pytest
+
+from ap_agent_api.application import batch_service
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+
+RISK = ElevationRiskAssessment.model_validate({
+    "High Risk (Immediate Property)": {"count": 244, "density": 8.6},
+    "Moderate Risk (Adjacent Properties)": {"count": 2044, "density": 5.9},
+    "Low Risk (Neighborhood Scale)": {"count": 12314, "density": 2.9},
+    "Total Risk Score": 17.4,
+})
+N_ADDRESSES = 5
+STORED = {1, 3}
+FAILING = {2}
+
+
+def _address(i):
+    return PropertyAddress(street=f"{i} Test Street", suburb="Campbelltown", state="SA", postcode="5074")
+
+
+def _index(address):
+    return int(address.street.split()[0])
+
+
+@pytest.fixture
+def geocoded(monkeypatch):
+    batches = []
+
+    def geocode_addresses(addresses):
+        batches.append(sorted(_index(address) for address in addresses))
+        return [(138.65, -34.88, 15434900.0, -4143000.0)] * len(addresses)
+
+    async def run_and_save_elevation_risk_assessment(address):
+        i = _index(address)
+        assert i not in STORED, "stored results must not be looked up or run again"
+        # Later addresses finish first.
+        await asyncio.sleep(0.01 * (N_ADDRESSES - i))
+        if i in FAILING:
+            raise RuntimeError("layer export failed")
+        return RISK
+
+    def load_stored(addresses, include_property_search):
+        return [{"elevation_risk": RISK if _index(a) in STORED else None} for a in addresses]
+
+    monkeypatch.setattr(batch_service, "_load_stored", load_stored)
+    monkeypatch.setattr(batch_service.gis_image_generate, "geocode_addresses", geocode_addresses)
+    monkeypatch.setattr(batch_service, "run_and_save_elevation_risk_assessment", run_and_save_elevation_risk_assessment)
+    return batches
+
+
+async def _collect(addresses):
+    return [item async for item in batch_service.score_portfolio(addresses)]
+
+
+def test_stored_results_are_yielded_first(geocoded):
+    items = asyncio.run(_collect([_address(i) for i in range(N_ADDRESSES)]))
+
+    assert {item.index for item in items[:len(STORED)]} == STORED
+    assert all(item.from_store == ["elevation_risk"] for item in items[:len(STORED)])
+    assert sorted(item.index for item in items) == list(range(N_ADDRESSES))
+    assert all(_index(item.address) == item.index for item in items)
+    # Only the addresses without a stored result are geocoded, in one batch.
+    assert geocoded == [[0, 2, 4]]
+
+
+def test_failures_are_isolated_to_their_item(geocoded):
+    items = {item.index: item for item in asyncio.run(_collect([_address(i) for i in range(N_ADDRESSES)]))}
+
+    for i, item in items.items():
+        if i in FAILING:
+            assert not item.success and item.elevation_risk is None
+            assert item.errors == {"elevation_risk": "layer export failed"}
+        else:
+            assert item.success and item.elevation_risk == RISK and not item.errors
+
+
+def test_cancelled_assessment_is_not_reported_as_a_failure(monkeypatch):
+    async def cancelled(address):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(batch_service, "run_and_save_elevation_risk_assessment", cancelled)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(batch_service._score_address(0, _address(0), {"elevation_risk": None}))
+
+
+def test_stored_results_are_not_looked_up_again(monkeypatch):
+    runs = []
+
+    async def run_and_save_property_search(address):
+        runs.append(address)
+        return None
+
+    monkeypatch.setattr(batch_service, "run_and_save_property_search", run_and_save_property_search)
+    item = asyncio.run(batch_service._score_address(
+        0, _address(0), {"elevation_risk": RISK, "property_data": None}
+    ))
+    assert item.success and item.elevation_risk == RISK and item.from_store == ["elevation_risk"]
+    assert runs == [_address(0)]
@@ -0,0 +1,96 @@
+"""
+The optimized contour isolation and ring scoring give exactly the results of
+the original implementations, kept here as small reference versions, on the
+committed sample maps.
+"""
+
+import math
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+
+SAMPLE_MAPS = sorted((Path(__file__).parents[1] / "property_results").glob("*/contour_map.png"))
+
+
+def _reference_mask(path) -> np.ndarray:
+    # The original subtract_roads_from_contours: np.where masking and a
+    # threshold of the wrapped uint8 difference.
+    contour_img = cv2.imread(str(path))
+    img_hsv = cv2.cvtColor(contour_img, cv2.COLOR_BGR2HSV)
+    img_bin = cv2.cvtColor(contour_img, cv2.COLOR_BGR2GRAY)
+    _, img_bin = cv2.threshold(img_bin, 230, 255, cv2.THRESH_BINARY_INV)
+
+    road_mask = cv2.inRange(img_hsv, np.array([0, 140, 200]), np.array([10, 255, 255]))
+    road_hsv = contour_img.copy()
+    road_hsv[np.where(road_mask == 0)] = 0
+    label_mask = cv2.inRange(img_hsv, np.array([0, 0, 50]), np.array([179, 40, 230]))
+    labels_hsv = contour_img.copy()
+    labels_hsv[np.where(label_mask == 0)] = 0
+
+    label_bin = cv2.cvtColor(labels_hsv, cv2.COLOR_BGR2GRAY)
+    _, label_bin = cv2.threshold(label_bin, 10, 255, cv2.THRESH_BINARY)
+    label_bin = cv2.dilate(label_bin, None, iterations=2)
+    road_bin = cv2.cvtColor(road_hsv, cv2.COLOR_BGR2GRAY)
+    _, road_bin = cv2.threshold(road_bin, 10, 255, cv2.THRESH_BINARY)
+    road_bin = cv2.dilate(road_bin, None, iterations=2)
+
+    isolated_contours = img_bin - road_bin - label_bin
+    _, isolated_contours = cv2.threshold(isolated_contours, 10, 255, cv2.THRESH_BINARY)
+    cv2.dilate(isolated_contours, None, isolated_contours, iterations=3)
+    return isolated_contours
+
+
+def _reference_ring_risk(mask, center, rings):
+    # The original assess_ring_risk: a Python loop over the contour pixels.
+    risk_data = {r[3]: {"count": 0, "density": 0.0} for r in rings}
+    ring_areas = {}
+    prev_r2_area = 0.0
+    for r_min, r_max, factor, name in rings:
+        r_max_area = math.pi * (r_max ** 2)
+        ring_areas[name] = (r_max_area - prev_r2_area) / factor
+        prev_r2_area = r_max_area
+
+    cx, cy = center
+    for py, px in np.argwhere(mask == 255):
+        distance = math.hypot(px - cx, py - cy)
+        for r_min, r_max, factor, name in rings:
+            if r_min <= distance < r_max:
+                risk_data[name]["count"] += 1
+                break
+
+    total_risk = 0.0
+    for name, data in risk_data.items():
+        if ring_areas[name] > 0:
+            data["density"] = data["count"] / ring_areas[name]
+            total_risk += data["density"]
+    risk_data["Total Risk Score"] = min(total_risk, 100)
+    return risk_data
+
+
+@pytest.fixture(params=SAMPLE_MAPS, ids=lambda p: p.parent.name)
+def sample(request):
+    return request.param
+
+
+def test_isolation_is_bit_identical(sample):
+    expected = _reference_mask(sample)
+    assert np.array_equal(erc.subtract_roads_from_contours(str(sample)), expected)
+    assert np.array_equal(erc.subtract_roads_from_contours_tiled(str(sample), tile_size=128), expected)
+
+
+@pytest.mark.parametrize("center", [erc.CENTER_PIXEL, (37, 310)], ids=["centre", "off_centre"])
+def test_ring_counts_match_the_pixel_loop(sample, center):
+    mask = _reference_mask(sample)
+    expected = _reference_ring_risk(mask, center, erc.RISK_RINGS)
+
+    assert erc.assess_ring_risk(erc.get_contour_pixels(mask), center, erc.RISK_RINGS) == expected
+    assert erc.assess_ring_risk_from_mask(mask, center, erc.RISK_RINGS) == expected
+    assert erc.assess_ring_risk_tiled(cv2.imread(str(sample)), center, erc.RISK_RINGS, tile_size=128) == expected
+
+
+def test_calculate_matches_the_original_pipeline(sample):
+    assert erc.calculate(str(sample)) == _reference_ring_risk(_reference_mask(sample), erc.CENTER_PIXEL, erc.RISK_RINGS)
@@ -0,0 +1,60 @@
+"""
+Coordinate transforms: the vectorized conversions match the scalar ones for
+arrays, lists and single values, and each thread reuses one transformer.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from ap_agent_api.infrastructure.gis_image_generate import (
+    get_wgs84_to_wmerc_transformer, transform_coordinates, transform_coordinates_array, web_mercator_to_latlon
+)
+
+LONS = [138.6007, 138.6503, 138.5149, 140.7832]
+LATS = [-34.9285, -34.8812, -35.0201, -37.8298]
+
+
+def _scalar_transforms():
+    return [transform_coordinates(lon, lat) for lon, lat in zip(LONS, LATS)]
+
+
+@pytest.mark.parametrize("convert", [np.array, list], ids=["array", "list"])
+def test_transform_coordinates_array_matches_the_scalar_transform(convert):
+    wm_x, wm_y = transform_coordinates_array(convert(LONS), convert(LATS))
+
+    assert wm_x.dtype == wm_y.dtype == np.float64 and wm_x.shape == (len(LONS),)
+    np.testing.assert_allclose(np.column_stack([wm_x, wm_y]), _scalar_transforms(), rtol=0, atol=1e-6)
+
+
+def test_transform_coordinates_array_of_scalars():
+    wm_x, wm_y = transform_coordinates_array(LONS[0], LATS[0])
+    assert wm_x.shape == wm_y.shape == ()
+    assert (float(wm_x), float(wm_y)) == pytest.approx(_scalar_transforms()[0], abs=1e-6)
+
+
+@pytest.mark.parametrize("convert", [np.array, list], ids=["array", "list"])
+def test_web_mercator_to_latlon_matches_the_scalar_conversion(convert):
+    wm_x, wm_y = zip(*_scalar_transforms())
+    lats, lons = web_mercator_to_latlon(convert(wm_x), convert(wm_y))
+
+    expected = [web_mercator_to_latlon(x, y) for x, y in zip(wm_x, wm_y)]
+    np.testing.assert_allclose(np.column_stack([lats, lons]), expected, rtol=0, atol=1e-12)
+    # And the round trip gets back to the original coordinates.
+    np.testing.assert_allclose(lats, LATS, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(lons, LONS, rtol=0, atol=1e-9)
+
+
+def test_web_mercator_to_latlon_of_scalars():
+    lat, lon = web_mercator_to_latlon(*_scalar_transforms()[0])
+    assert np.isscalar(lat) and np.isscalar(lon)
+    assert (lat, lon) == pytest.approx((LATS[0], LONS[0]), abs=1e-9)
+
+
+def test_transformer_is_reused_per_thread():
+    transformer = get_wgs84_to_wmerc_transformer()
+    transform_coordinates(LONS[0], LATS[0])
+    assert get_wgs84_to_wmerc_transformer() is transformer
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(get_wgs84_to_wmerc_transformer).result() is not transformer
@@ -0,0 +1,94 @@
+"""
+Load test for the elevation risk service: concurrent assessments must overlap
+instead of queueing behind each other on the event loop.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+from ap_agent_api.application import elevation_risk_service
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.domain.tools import elevation_risk_calculator
+from ap_agent_api.infrastructure.gis_image_generate import GisImages, LayerResult
+
+LAYER_LATENCY = 0.3
+N_REQUESTS = 8
+
+RISK_RESULT = {
+    "High Risk (Immediate Property)": {"count": 244, "density": 8.62973469209388},
+    "Moderate Risk (Adjacent Properties)": {"count": 2044, "density": 5.914776430542437},
+    "Low Risk (Neighborhood Scale)": {"count": 12314, "density": 2.916419597073808},
+    "Total Risk Score": 17.460930719710124,
+}
+
+
+def _geocode_property(address):
+    return 138.65, -34.88, 15434900.0, -4143000.0
+
+
+def _slow_fetch_images(address, wm_x, wm_y, persist="async"):
+    # Blocking call, like the real requests/curl_cffi layer exports.
+    time.sleep(LAYER_LATENCY)
+    layers = {"contour": LayerResult(name="contour", content=b"png", elapsed=LAYER_LATENCY)}
+    return GisImages(output_dir=Path("/nonexistent"), bbox=(0, 0, 1, 1), layers=layers)
+
+
+def _address(i):
+    return PropertyAddress(street=f"{i} Test Street", suburb="Campbelltown", state="SA", postcode="5074")
+
+
+def _patch_pipeline(monkeypatch):
+    monkeypatch.setattr(elevation_risk_service.gis_image_generate, "geocode_property", _geocode_property)
+    monkeypatch.setattr(elevation_risk_service.gis_image_generate, "fetch_images", _slow_fetch_images)
+    monkeypatch.setattr(elevation_risk_calculator, "calculate", lambda image, timings=None, **options: RISK_RESULT)
+
+
+async def _timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+def test_concurrent_requests_take_about_as_long_as_one(monkeypatch):
+    _patch_pipeline(monkeypatch)
+
+    async def scenario():
+        _, single = await _timed(elevation_risk_service.run_elevation_risk_assessment(_address(0)))
+        results, burst = await _timed(asyncio.gather(
+            *(elevation_risk_service.run_elevation_risk_assessment(_address(i)) for i in range(N_REQUESTS))
+        ))
+        return single, results, burst
+
+    single, results, burst = asyncio.run(scenario())
+
+    assert len(results) == N_REQUESTS
+    assert all(r.total_risk_score == RISK_RESULT["Total Risk Score"] for r in results)
+    # Serialised on the loop this would take N_REQUESTS * single.
+    assert burst < 2 * single, f"{N_REQUESTS} requests took {burst:.2f}s, one took {single:.2f}s"
+
+
+def test_event_loop_stays_responsive(monkeypatch):
+    _patch_pipeline(monkeypatch)
+
+    async def scenario():
+        tasks = [asyncio.create_task(elevation_risk_service.run_elevation_risk_assessment(_address(i))) for i in range(4)]
+        await asyncio.sleep(0.05)
+        # A trivial coroutine (like /health) must not wait for the layer fetches.
+        _, latency = await _timed(asyncio.sleep(0))
+        await asyncio.gather(*tasks)
+        return latency
+
+    latency = asyncio.run(scenario())
+    assert latency < LAYER_LATENCY / 3
+
+
+def test_assessment_uses_the_configured_engine(monkeypatch):
+    _patch_pipeline(monkeypatch)
+    calls = []
+    monkeypatch.setattr(elevation_risk_calculator, "calculate",
+                        lambda image, timings=None, **options: calls.append(options) or RISK_RESULT)
+    monkeypatch.setattr(elevation_risk_service, "SCORING_ENGINE", "polyline")
+
+    asyncio.run(elevation_risk_service.run_elevation_risk_assessment(_address(0)))
+    assert calls[0]["engine"] == "polyline"
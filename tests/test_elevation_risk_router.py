@@ -0,0 +1,98 @@
+"""
+The elevation risk endpoint looks the address up in the result store once:
+a miss runs and stores a new assessment, a hit returns the stored bytes.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from ap_agent_api.application import elevation_risk_service
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+from ap_agent_api.infrastructure import file_repo
+from ap_agent_api.infrastructure.api.routers.elevation_risk_router import assess_elevation_risk, list_elevation_risks
+from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
+from ap_agent_api.infrastructure.result_store import ResultStore
+
+RISK = ElevationRiskAssessment.model_validate({
+    "High Risk (Immediate Property)": {"count": 244, "density": 8.6},
+    "Moderate Risk (Adjacent Properties)": {"count": 2044, "density": 5.9},
+    "Low Risk (Neighborhood Scale)": {"count": 12314, "density": 2.9},
+    "Total Risk Score": 17.4,
+})
+ADDRESS = PropertyAddress(street="1 Main Street", suburb="Campbelltown", state="SA", postcode="5074")
+
+
+class CountingStore(ResultStore):
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.lookups = 0
+
+    def get(self, property_address, artifact):
+        self.lookups += 1
+        return super().get(property_address, artifact)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = CountingStore(tmp_path / "results.sqlite3")
+    monkeypatch.setattr(file_repo, "PROPERTY_RESULTS_DIR", tmp_path / "legacy")
+    monkeypatch.setattr(file_repo, "get_result_store", lambda: store)
+    PropertyFileRepository._cache.clear()
+    yield store
+    PropertyFileRepository._cache.clear()
+    store.close()
+
+
+def test_miss_looks_up_the_store_once(store, monkeypatch):
+    runs = []
+
+    async def run_elevation_risk_assessment(address):
+        runs.append(address)
+        return RISK
+
+    monkeypatch.setattr(elevation_risk_service, "run_elevation_risk_assessment", run_elevation_risk_assessment)
+
+    response = json.loads(asyncio.run(assess_elevation_risk(ADDRESS)).body)
+    assert response["message"] == "Elevation risk assessment completed successfully"
+    assert response["data"]["Total Risk Score"] == 17.4
+    assert (store.lookups, len(runs)) == (1, 1)
+
+    # The saved result is served from the in-process cache.
+    response = json.loads(asyncio.run(assess_elevation_risk(ADDRESS)).body)
+    assert response["message"] == "Property data loaded from existing file"
+    assert response["data"]["Total Risk Score"] == 17.4
+    assert (store.lookups, len(runs)) == (1, 1)
+
+
+def test_store_is_used_off_the_event_loop(store, monkeypatch):
+    loop_thread = []
+
+    class ThreadCheckingStore:
+        def __getattr__(self, name):
+            attr = getattr(store, name)
+            if callable(attr):
+                def call(*args, **kwargs):
+                    assert threading.get_ident() != loop_thread[0], f"store.{name} ran on the event loop"
+                    return attr(*args, **kwargs)
+                return call
+            return attr
+
+    async def run_elevation_risk_assessment(address):
+        return RISK
+
+    monkeypatch.setattr(file_repo, "get_result_store", lambda: ThreadCheckingStore())
+    monkeypatch.setattr(elevation_risk_service, "run_elevation_risk_assessment", run_elevation_risk_assessment)
+
+    async def scenario():
+        loop_thread.append(threading.get_ident())
+        await assess_elevation_risk(ADDRESS)
+        PropertyFileRepository._cache.clear()
+        await elevation_risk_service.get_or_run_elevation_risk_assessment(ADDRESS)
+        return await list_elevation_risks(suburb="Campbelltown", state=None, days=None)
+
+    assert len(asyncio.run(scenario()).data) == 1
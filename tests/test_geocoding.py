@@ -0,0 +1,147 @@
+"""
+Offline tests for batched geocoding against a simulated geocoder.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import requests
+from fastapi import HTTPException
+
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.domain.utils import normalize_address
+from ap_agent_api.infrastructure import gis_image_generate
+from ap_agent_api.infrastructure.api.routers import geocode_router
+from ap_agent_api.infrastructure.geocode_cache import GeocodeCache
+
+
+class FakeSession:
+    """
+    Stands in for the shared HTTP session: the locator metadata request fails,
+    and geocoding matches every address, none ("unmatched") or fails ("error").
+    """
+
+    def __init__(self):
+        self.locator_requests = 0
+        self.batches = []
+        self.mode = "match"
+
+    def get(self, url, params=None, timeout=None):
+        self.locator_requests += 1
+        raise requests.exceptions.ConnectionError("locator unavailable")
+
+    def post(self, url, data=None, timeout=None):
+        records = json.loads(data["addresses"])["records"]
+        self.batches.append(len(records))
+        if self.mode == "error":
+            raise requests.exceptions.ConnectionError("geocoder unavailable")
+        return FakeResponse({"locations": [
+            {"attributes": {"ResultID": r["attributes"]["OBJECTID"], "Status": "M" if self.mode == "match" else "U"},
+             "location": {"x": 138.0, "y": -34.0}}
+            for r in records
+        ]})
+
+
+class FakeResponse:
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(gis_image_generate, "get_session", lambda: session)
+    monkeypatch.setattr(gis_image_generate, "_geocode_batch_size", None)
+    monkeypatch.setattr(gis_image_generate, "GEOCODE_MAX_BATCH_SIZE", 2)
+    return session
+
+
+def test_failing_locator_falls_back_once(session):
+    addresses = [f"{n} Main Street, Campbelltown" for n in range(5)]
+
+    first = gis_image_generate._geocode_from_service_batched(addresses)
+    second = gis_image_generate._geocode_from_service_batched(addresses)
+
+    assert first == second == [(138.0, -34.0)] * 5
+    assert session.batches == [2, 2, 1, 2, 2, 1]
+    assert session.locator_requests == 1
+
+
+def test_normalize_address():
+    assert normalize_address("1C Raymel Crescent, Campbelltown, SA 5074") == "1c raymel cres, campbelltown, sa 5074"
+    assert normalize_address(" 1c  RAYMEL cres., Campbelltown,SA 5074") == normalize_address("1C Raymel Crescent, Campbelltown, SA 5074")
+    address = PropertyAddress(street="12 Main Street", suburb="Norwood", state="SA", postcode="5067")
+    assert normalize_address(address) == "12 main st, norwood, sa, 5067"
+    assert normalize_address(address) != normalize_address(address.model_copy(update={"suburb": "Campbelltown"}))
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = GeocodeCache(tmp_path / "geocode.sqlite3", negative_ttl=60)
+    monkeypatch.setattr(gis_image_generate, "GEOCODE_CACHE_ENABLED", True)
+    monkeypatch.setattr(gis_image_generate, "get_geocode_cache", lambda: cache)
+    yield cache
+    cache.close()
+
+
+def test_geocode_cache_hit_and_negative_ttl(cache, monkeypatch):
+    cache.put("found", 138.0, -34.0, 1.0, 2.0)
+    cache.put("not found")
+
+    assert cache.get("found").found and cache.get("found").wm_x == 1.0
+    assert not cache.get("not found").found
+    assert cache.get("missing") is None
+
+    later = time.time() + 3600
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.get("found").found
+    assert cache.get("not found") is None
+
+
+def test_geocode_address_is_served_from_the_cache(session, cache):
+    address = "1 Main Street, Campbelltown"
+    first = gis_image_generate.geocode_address(address)
+    second = gis_image_generate.geocode_address("1 MAIN ST., Campbelltown")
+
+    assert first == second and first[:2] == (138.0, -34.0)
+    assert session.batches == [1]
+
+
+def test_unmatched_addresses_are_cached_and_failed_requests_are_not(session, cache):
+    session.mode = "unmatched"
+    assert gis_image_generate.geocode_address("1 Main Street, Campbelltown") == (None, None, None, None)
+    assert gis_image_generate.geocode_address("1 Main Street, Campbelltown") == (None, None, None, None)
+    assert session.batches == [1]
+
+    session.mode = "error"
+    for geocode in (
+        lambda: gis_image_generate.geocode_address("2 Main Street, Campbelltown"),
+        lambda: gis_image_generate.geocode_addresses(["2 Main Street, Campbelltown"])[0],
+    ):
+        assert geocode()[0] is None
+    assert cache.get(gis_image_generate._geocode_cache_key("2 Main Street, Campbelltown")) is None
+
+    session.mode = "match"
+    assert gis_image_generate.geocode_address("2 Main Street, Campbelltown")[:2] == (138.0, -34.0)
+
+
+def test_batch_geocode_rejects_too_many_addresses(session, cache, monkeypatch):
+    monkeypatch.setattr(geocode_router, "BATCH_MAX_ADDRESSES", 3)
+    addresses = [PropertyAddress(street=f"{n} Main Street", suburb="Campbelltown", state="SA", postcode="5074")
+                 for n in range(4)]
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(geocode_router.batch_geocode(addresses))
+    assert error.value.status_code == 422
+    assert session.batches == []
+
+    assert len(asyncio.run(geocode_router.batch_geocode(addresses[:3])).data) == 3
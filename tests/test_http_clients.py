@@ -0,0 +1,51 @@
+"""
+Shared HTTP sessions: one pooled requests session for the process, one
+curl_cffi session per thread, and close_sessions() starting them afresh.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ap_agent_api.config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+from ap_agent_api.infrastructure import http_clients
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    http_clients.close_sessions()
+    yield
+    http_clients.close_sessions()
+
+
+def test_session_is_shared_across_threads():
+    session = http_clients.get_session()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        sessions = list(executor.map(lambda _: http_clients.get_session(), range(8)))
+    assert all(s is session for s in sessions)
+
+
+def test_session_pool_sizing():
+    session = http_clients.get_session()
+    for url in ("https://lsa1.geohub.sa.gov.au/", "http://location.sa.gov.au/"):
+        adapter = session.get_adapter(url)
+        assert adapter._pool_connections == HTTP_POOL_CONNECTIONS
+        assert adapter._pool_maxsize == HTTP_POOL_MAXSIZE
+
+
+def test_curl_session_per_thread():
+    session = http_clients.get_curl_session()
+    assert http_clients.get_curl_session() is session
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(http_clients.get_curl_session).result()
+    assert other is not session
+    assert http_clients._curl_sessions == [session, other]
+
+
+def test_close_sessions_recreates_them():
+    session, curl_session = http_clients.get_session(), http_clients.get_curl_session()
+    http_clients.close_sessions()
+
+    assert http_clients._session is None and http_clients._curl_sessions == []
+    assert http_clients.get_session() is not session
+    assert http_clients.get_curl_session() is not curl_session
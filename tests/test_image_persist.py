@@ -0,0 +1,69 @@
+"""
+Persisting fetched layer images: background save failures are logged, images
+that are not persisted get no directory, and an unknown IMAGE_PERSIST_MODE is
+rejected when the configuration is imported.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.infrastructure import gis_image_generate
+from ap_agent_api.infrastructure.gis_image_generate import LayerResult
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+@pytest.fixture
+def fetch(tmp_path, monkeypatch):
+    layers = {"contour": LayerResult("contour", b"png", 0.0)}
+    monkeypatch.setattr(gis_image_generate, "fetch_layers", lambda bbox: layers)
+    monkeypatch.setattr(gis_image_generate, "get_property_directory", lambda address: tmp_path)
+    address = PropertyAddress(street="1 Main St", suburb="Norwood", state="SA", postcode="5067")
+    return lambda persist: gis_image_generate.fetch_images(address, 0.0, 0.0, persist=persist)
+
+
+def test_background_save_failure_is_logged(fetch, monkeypatch, caplog):
+    def failing_save(layers, output_dir):
+        raise OSError("disk full")
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(gis_image_generate, "_get_save_executor", lambda: executor)
+    monkeypatch.setattr(gis_image_generate, "save_layers", failing_save)
+
+    with caplog.at_level(logging.ERROR, logger=gis_image_generate.logger.name):
+        fetch("async")
+        executor.shutdown(wait=True)
+
+    [record] = [r for r in caplog.records if "Could not save the layer images" in r.getMessage()]
+    assert isinstance(record.exc_info[1], OSError)
+
+
+def test_images_kept_in_memory_get_no_directory(fetch, monkeypatch):
+    def get_property_directory(address):
+        raise AssertionError("the property directory must not be created")
+
+    monkeypatch.setattr(gis_image_generate, "get_property_directory", get_property_directory)
+    images = fetch("none")
+    assert images.output_dir is None and images.content("contour") == b"png"
+
+
+def test_unknown_persist_mode_is_rejected(fetch):
+    with pytest.raises(ValueError):
+        fetch("later")
+
+
+def test_unknown_persist_mode_is_rejected_at_import():
+    env = dict(os.environ, IMAGE_PERSIST_MODE="later")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-c", "import ap_agent_api.config"], capture_output=True, text=True, env=env
+    )
+    assert result.returncode != 0
+    assert "IMAGE_PERSIST_MODE" in result.stderr
@@ -0,0 +1,46 @@
+"""
+Cold-start budget for the API module: importing ap_agent_api.infrastructure.api.main
+(what every uvicorn worker does before serving traffic) must stay cheap and must
+not pull in the heavy dependencies that are only needed on first use.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+API_MODULE = "ap_agent_api.infrastructure.api.main"
+# Cumulative import time of the API module, in milliseconds.
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+LAZY_MODULES = ["cv2", "numpy", "matplotlib", "pyproj", "curl_cffi", "agents", "openai"]
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def _import_times():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {API_MODULE}"],
+        capture_output=True, text=True, env=env, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)", line)
+        if match:
+            times[match.group(4)] = int(match.group(2)) / 1000.0
+    return times
+
+
+def test_heavy_dependencies_are_not_imported_at_startup():
+    imported = _import_times()
+    eager = [name for name in LAZY_MODULES if name in imported]
+    assert not eager, f"{API_MODULE} eagerly imports {eager}"
+
+
+def test_api_import_time_within_budget():
+    cumulative_ms = _import_times()[API_MODULE]
+    assert cumulative_ms < IMPORT_TIME_BUDGET_MS, (
+        f"Importing {API_MODULE} took {cumulative_ms:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)"
+    )
@@ -0,0 +1,193 @@
+"""
+Offline tests for the background job queues and the job manager.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from ap_agent_api.application.job_service import JobManager
+from ap_agent_api.domain.models.job import JobStatus
+from ap_agent_api.infrastructure.job_queue import InMemoryJobQueue, SQLiteJobQueue
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    q = InMemoryJobQueue() if request.param == "memory" else SQLiteJobQueue(tmp_path / "jobs.sqlite3")
+    yield q
+    q.close()
+
+
+def test_jobs_are_claimed_in_order_and_finished(queue):
+    first = queue.enqueue("search", {"n": 1})
+    second = queue.enqueue("elevation-risk", {"n": 2})
+    assert queue.get(first.id).status == JobStatus.QUEUED
+
+    claimed = queue.claim()
+    assert claimed.id == first.id and claimed.status == JobStatus.RUNNING
+    assert claimed.payload == {"n": 1}
+    queue.complete(claimed.id, {"data": [1, 2]})
+
+    claimed = queue.claim()
+    assert claimed.id == second.id
+    queue.fail(claimed.id, "boom")
+
+    assert queue.claim() is None
+    done, failed = queue.get(first.id), queue.get(second.id)
+    assert done.status == JobStatus.SUCCEEDED and done.result == {"data": [1, 2]}
+    assert failed.status == JobStatus.FAILED and failed.error == "boom"
+    assert done.started_at <= done.finished_at
+    assert queue.get("missing") is None
+
+
+def test_each_job_is_claimed_once(queue):
+    ids = {queue.enqueue("search", {}).id for _ in range(50)}
+    claimed = []
+
+    def drain():
+        while (job := queue.claim()) is not None:
+            claimed.append(job.id)
+
+    threads = [threading.Thread(target=drain) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(claimed) == sorted(ids)
+
+
+def test_sqlite_queue_survives_reopening(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    q = SQLiteJobQueue(path)
+    q.enqueue("search", {"address": {"street": "1 Test Street"}})
+    q.close()
+
+    q = SQLiteJobQueue(path)
+    assert q.claim().payload == {"address": {"street": "1 Test Street"}}
+    q.close()
+
+
+def test_manager_runs_jobs_on_a_bounded_pool(queue):
+    running, peak = 0, 0
+
+    async def handler(payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        if payload.get("fail"):
+            raise RuntimeError("handler failed")
+        return {"n": payload["n"]}
+
+    async def scenario():
+        manager = JobManager(queue, handlers={"test": handler}, workers=2, poll_interval=0.05)
+        await manager.start()
+        jobs = [await manager.submit("test", {"n": i}) for i in range(6)]
+        bad = await manager.submit("test", {"n": -1, "fail": True})
+        with pytest.raises(ValueError):
+            await manager.submit("unknown", {})
+        for _ in range(100):
+            finished = [await manager.get(j.id) for j in jobs + [bad]]
+            if all(j.status in (JobStatus.SUCCEEDED, JobStatus.FAILED) for j in finished):
+                break
+            await asyncio.sleep(0.05)
+        await manager.stop()
+        return finished
+
+    finished = asyncio.run(scenario())
+    assert [j.result for j in finished[:-1]] == [{"n": i} for i in range(6)]
+    assert finished[-1].status == JobStatus.FAILED and finished[-1].error == "handler failed"
+    assert peak == 2
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_finished_jobs_are_removed_after_the_retention(backend, tmp_path):
+    if backend == "memory":
+        queue = InMemoryJobQueue(retention_seconds=60)
+    else:
+        queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", retention_seconds=60)
+    done = queue.enqueue("search", {})
+    queue.complete(queue.claim().id, {"data": "x" * 1000})
+    running = queue.enqueue("search", {})
+    queue.claim()
+
+    queue.enqueue("search", {})
+    assert queue.get(done.id).status == JobStatus.SUCCEEDED
+
+    queue.retention_seconds = 0
+    queue.enqueue("search", {})
+    assert queue.get(done.id) is None
+    assert queue.get(running.id).status == JobStatus.RUNNING
+    queue.close()
+
+
+def test_sqlite_jobs_of_crashed_workers_are_claimed_again(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", lease_seconds=3600)
+    job = queue.enqueue("search", {})
+    assert queue.claim().id == job.id
+    assert queue.claim() is None
+
+    # A new process after the lease has run out.
+    queue.close()
+    queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", lease_seconds=0)
+    reclaimed = queue.claim()
+    assert reclaimed.id == job.id and reclaimed.status == JobStatus.RUNNING
+    queue.close()
+
+
+def test_jobs_enqueued_at_the_same_time_are_claimed_in_order(queue, monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    ids = [queue.enqueue("search", {"n": n}).id for n in range(20)]
+
+    assert [queue.claim().id for _ in ids] == ids
+
+
+class FlakyQueue(InMemoryJobQueue):
+    """Its first claim and the completion of "unstorable" results fail."""
+
+    def __init__(self):
+        super().__init__()
+        self.claim_failures = 1
+
+    def claim(self):
+        if self.claim_failures:
+            self.claim_failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().claim()
+
+    def complete(self, job_id, result):
+        if result.get("unstorable"):
+            raise TypeError("Object of type set is not JSON serializable")
+        super().complete(job_id, result)
+
+
+def test_workers_survive_queue_errors():
+    queue = FlakyQueue()
+
+    async def handler(payload):
+        return payload
+
+    async def scenario():
+        manager = JobManager(queue, handlers={"test": handler}, workers=1, poll_interval=0.01)
+        await manager.start()
+        unstorable = await manager.submit("test", {"unstorable": True})
+        ok = await manager.submit("test", {"n": 1})
+        for _ in range(100):
+            finished = [await manager.get(j.id) for j in (unstorable, ok)]
+            if all(j.status in (JobStatus.SUCCEEDED, JobStatus.FAILED) for j in finished):
+                break
+            await asyncio.sleep(0.02)
+        alive = all(not task.done() for task in manager._tasks)
+        await manager.stop()
+        return finished, alive
+
+    (unstorable, ok), alive = asyncio.run(scenario())
+    assert queue.claim_failures == 0
+    assert unstorable.status == JobStatus.FAILED and "not JSON serializable" in unstorable.error
+    assert ok.status == JobStatus.SUCCEEDED and ok.result == {"n": 1}
+    assert alive
@@ -0,0 +1,73 @@
+"""
+Fetching the map layers: a failing layer does not affect the others, every
+layer is timed, concurrent fetching takes about as long as the slowest layer,
+and the sequential fallback gives the same results.
+"""
+
+import threading
+import time
+
+import pytest
+
+from ap_agent_api.infrastructure import gis_image_generate
+
+DELAY = 0.2
+
+
+@pytest.fixture
+def fetchers(monkeypatch):
+    threads = {}
+
+    def layer(name, content=b"png", error=None):
+        def fetch():
+            threads[name] = threading.current_thread().name
+            time.sleep(DELAY)
+            if error is not None:
+                raise error
+            return content
+        return fetch
+
+    monkeypatch.setattr(gis_image_generate, "_layer_fetchers", lambda bbox, mode: {
+        "topology": layer("topology"),
+        "contour": layer("contour", error=ConnectionError("geohub down")),
+        "parcel": layer("parcel", content=b""),
+        "road": layer("road"),
+    })
+    return threads
+
+
+def _assert_results(results):
+    assert list(results) == ["topology", "contour", "parcel", "road"]
+    assert results["topology"].ok and results["topology"].content == b"png" and results["topology"].error is None
+    assert results["road"].ok and results["road"].content == b"png"
+    assert not results["contour"].ok and results["contour"].error == "geohub down"
+    assert not results["parcel"].ok and results["parcel"].error == "no image returned"
+    assert all(result.elapsed >= DELAY for result in results.values())
+
+
+def test_concurrent_fetch_isolates_failures(fetchers):
+    start = time.perf_counter()
+    results = gis_image_generate.fetch_layers(None, concurrent=True)
+    elapsed = time.perf_counter() - start
+
+    _assert_results(results)
+    assert elapsed < 2 * DELAY
+    assert all(name.startswith("gis-layer") for name in fetchers.values())
+
+
+def test_sequential_fallback(fetchers):
+    start = time.perf_counter()
+    results = gis_image_generate.fetch_layers(None, concurrent=False)
+    elapsed = time.perf_counter() - start
+
+    _assert_results(results)
+    assert elapsed >= 4 * DELAY
+    assert set(fetchers.values()) == {threading.current_thread().name}
+
+
+def test_timings_are_logged(fetchers, caplog):
+    with caplog.at_level("INFO", logger=gis_image_generate.logger.name):
+        gis_image_generate.fetch_layers(None, concurrent=True)
+
+    [record] = [r for r in caplog.records if r.getMessage().startswith("Layer fetch timings")]
+    assert all(f"{name}=" in record.getMessage() for name in ("topology", "contour", "parcel", "road"))
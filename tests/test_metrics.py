@@ -0,0 +1,38 @@
+"""
+Tests for the Prometheus text rendering of the metrics registry.
+"""
+
+from ap_agent_api.infrastructure.metrics import Registry
+
+
+def test_render_counters_histograms_and_gauges():
+    registry = Registry()
+    errors = registry.counter("errors_total", "Upstream errors.", ["upstream"])
+    latency = registry.histogram("fetch_seconds", "Fetch latency.", ["layer"], buckets=(0.1, 1))
+    registry.gauge_callback("hit_ratio", "Hit ratio.", lambda: {("result",): 0.75}, ["cache"])
+
+    errors.inc(upstream="geocode")
+    errors.inc(2, upstream="geocode")
+    for value in (0.05, 0.5, 5):
+        latency.observe(value, layer="contour")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE errors_total counter" in lines
+    assert 'errors_total{upstream="geocode"} 3' in lines
+    assert "# TYPE fetch_seconds histogram" in lines
+    assert 'fetch_seconds_bucket{layer="contour",le="0.1"} 1' in lines
+    assert 'fetch_seconds_bucket{layer="contour",le="1"} 2' in lines
+    assert 'fetch_seconds_bucket{layer="contour",le="+Inf"} 3' in lines
+    assert 'fetch_seconds_sum{layer="contour"} 5.55' in lines
+    assert 'fetch_seconds_count{layer="contour"} 3' in lines
+    assert 'hit_ratio{cache="result"} 0.75' in lines
+
+
+def test_histogram_timer_records_failures_too():
+    latency = Registry().histogram("run_seconds", "Run time.", ["outcome"])
+    try:
+        with latency.time(outcome="error"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert latency.count(outcome="error") == 1
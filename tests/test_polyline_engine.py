@@ -0,0 +1,96 @@
+"""
+Tests for the polyline scoring engine.
+"""
+
+import math
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+SAMPLE_MAPS = sorted((Path(__file__).parents[1] / "property_results").glob("*/contour_map.png"))
+
+
+def _line(*points):
+    return np.array(points, dtype=np.int32)
+
+
+def test_ring_lengths_split_segments_at_ring_circles():
+    center = (200, 200)
+    lines = [
+        # Through the centre, across every ring; one segment.
+        _line((0, 200), (400, 200)),
+        # Vertical, 90-135 px from the centre: only in the outer ring.
+        _line((290, 100), (290, 300)),
+        # Zero-length segment and a line outside all rings.
+        _line((200, 200), (200, 200)),
+        _line((0, 0), (10, 0)),
+    ]
+
+    lengths = erc._ring_lengths(lines, center, erc.RISK_RINGS)
+
+    np.testing.assert_allclose(lengths, [60, 100, 240 + 200], rtol=0, atol=1e-9)
+
+
+def test_closed_outline_of_a_band_gives_its_length_and_slope():
+    mask = np.zeros((400, 400), dtype=np.uint8)
+    # A 5 px wide horizontal band through the property centre.
+    mask[198:203, 0:400] = 255
+
+    risk = erc.assess_ring_risk_by_contours(erc.extract_contour_lines(mask), erc.CENTER_PIXEL, erc.RISK_RINGS)
+
+    high = risk["High Risk (Immediate Property)"]
+    assert high["count"] == pytest.approx(60, abs=1)
+    area = math.pi * 30 ** 2
+    assert high["slope"] == pytest.approx(erc.CONTOUR_INTERVAL_METRES * 60 / (area * erc.METRES_PER_PIXEL), rel=0.02)
+
+
+@pytest.mark.parametrize("path", SAMPLE_MAPS, ids=lambda p: p.parent.name)
+def test_calculate_polyline_engine(path):
+    risk = erc.calculate(str(path), engine="polyline")
+
+    assessment = ElevationRiskAssessment(**risk)
+    assert assessment.high_risk_immediate_property.slope == risk[erc.RISK_RINGS[0][3]]["slope"]
+    pixel_risk = erc.calculate(str(path))
+    for _, _, _, name in erc.RISK_RINGS:
+        # Contour length is zero exactly where there are no contour pixels.
+        assert (risk[name]["count"] == 0) == (pixel_risk[name]["count"] == 0)
+        assert risk[name]["slope"] >= 0
+
+
+def test_calculate_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        erc.calculate(str(SAMPLE_MAPS[0]), engine="vector")
+
+
+def test_pixel_engine_assessment_has_no_slope():
+    assessment = ElevationRiskAssessment(**erc.calculate(str(SAMPLE_MAPS[0])))
+    assert assessment.high_risk_immediate_property.slope is None
+
+
+@pytest.mark.parametrize("center, tile_size", [(erc.CENTER_PIXEL, erc.SCORING_TILE_SIZE), ((60, 380), 64)],
+                         ids=["centre", "edge_tiled"])
+def test_isolated_ring_window_matches_the_whole_image_mask(center, tile_size):
+    image = erc.load_image(str(SAMPLE_MAPS[0]))
+    expected, expected_center = erc._ring_window(erc.subtract_roads_from_contours(image), center, erc.RISK_RINGS)
+
+    window, window_center = erc._isolate_ring_window(image, center, erc.RISK_RINGS, tile_size)
+    assert window_center == expected_center
+    assert np.array_equal(window, expected)
+
+
+def test_unknown_scoring_engine_is_rejected_at_import():
+    env = dict(os.environ, SCORING_ENGINE="vector")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-c", "import ap_agent_api.config"], capture_output=True, text=True, env=env
+    )
+    assert result.returncode != 0
+    assert "SCORING_ENGINE" in result.stderr
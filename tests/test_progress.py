@@ -0,0 +1,73 @@
+"""
+Stage event streams: a failing producer ends the stream with an "error"
+event, and a client disconnecting stops the producer.
+"""
+
+import asyncio
+import json
+
+import pytest
+from starlette.requests import Request
+
+from ap_agent_api.application.progress import stream_stage_events
+from ap_agent_api.infrastructure.api.streaming import NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE, stage_event_response
+
+
+class Producer:
+    """Emits "geocoded", then fails or waits until it is cancelled."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.cancelled = False
+
+    async def __call__(self, emit):
+        emit("geocoded", longitude=138.65, latitude=-34.88)
+        if self.error is not None:
+            raise self.error
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def _request(accept):
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"accept", accept.encode())]})
+
+
+def test_failure_ends_the_stream_with_an_error_event():
+    async def scenario():
+        return [event async for event in stream_stage_events(Producer(RuntimeError("geohub down")))]
+
+    events = asyncio.run(scenario())
+    assert [event.stage for event in events] == ["geocoded", "error"]
+    assert events[0].data == {"longitude": 138.65, "latitude": -34.88}
+    assert events[1].data == {"message": "geohub down"}
+
+
+def test_consumer_stopping_early_cancels_the_producer():
+    async def scenario():
+        producer = Producer()
+        events = stream_stage_events(producer)
+        assert (await events.__anext__()).stage == "geocoded"
+        await events.aclose()
+        await asyncio.sleep(0)
+        return producer.cancelled
+
+    assert asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("accept", [NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE])
+def test_client_disconnect_stops_the_producer(accept):
+    async def scenario():
+        producer = Producer()
+        response = stage_event_response(_request(accept), stream_stage_events(producer))
+        first = await response.body_iterator.__anext__()
+        # Starlette closes the body iterator when the client goes away.
+        await response.body_iterator.aclose()
+        await asyncio.sleep(0)
+        return first, producer.cancelled
+
+    first, cancelled = asyncio.run(scenario())
+    assert json.loads(first.rsplit("data: ", 1)[-1])["stage"] == "geocoded"
+    assert cancelled
@@ -0,0 +1,130 @@
+"""
+Offline tests for the memory-mapped raster store.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ap_agent_api.application import rescoring_service
+from ap_agent_api.domain import utils
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+from ap_agent_api.infrastructure import file_repo
+from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
+from ap_agent_api.infrastructure.raster_store import RasterStore
+from ap_agent_api.infrastructure.result_store import ResultStore
+
+SAMPLE_MAPS = sorted((Path(__file__).parents[1] / "property_results").glob("*/contour_map.png"))
+BOX_SIDE_METRES = 305.748113
+
+
+def _address(street="1 Main Street"):
+    return PropertyAddress(street=street, suburb="Campbelltown", state="SA", postcode="5074")
+
+
+@pytest.mark.parametrize("pack_masks", [True, False])
+def test_masks_round_trip(tmp_path, pack_masks):
+    store = RasterStore(tmp_path, pack_masks=pack_masks)
+    mask = erc.subtract_roads_from_contours(str(SAMPLE_MAPS[0]))[:, :397].copy()  # odd width
+
+    store.put(_address(), "contour_mask", mask)
+
+    assert np.array_equal(store.get(_address(), "contour_mask"), mask)
+    assert store.get(_address(), "other") is None
+    assert store.get(_address("2 Main Street"), "contour_mask") is None
+    expected_size = mask.shape[0] * ((mask.shape[1] + 7) // 8 if pack_masks else mask.shape[1])
+    assert os.path.getsize(store.data_path) == expected_size
+
+
+def test_raw_rasters_are_read_only_views_of_the_mapped_file(tmp_path):
+    store = RasterStore(tmp_path)
+    image = erc.load_image(str(SAMPLE_MAPS[0]))
+
+    store.put(_address(), "contour", image)
+    stored = store.get(_address(), "contour")
+
+    assert np.array_equal(stored, image)
+    assert not stored.flags.writeable
+    assert isinstance(stored.base, np.memmap) or isinstance(stored.base.base, np.memmap)
+
+
+def test_put_again_replaces_and_other_instances_see_it(tmp_path):
+    store = RasterStore(tmp_path)
+    first = np.zeros((8, 8), dtype=np.uint8)
+    second = np.full((8, 8), 255, dtype=np.uint8)
+
+    store.put(_address(), "contour_mask", first)
+    old = store.get(_address(), "contour_mask")
+    store.put(_address(), "contour_mask", second)
+
+    assert np.array_equal(store.get(_address(), "contour_mask"), second)
+    assert np.array_equal(old, first)
+    assert np.array_equal(RasterStore(tmp_path).get(_address(), "contour_mask"), second)
+
+
+def test_newer_than(tmp_path):
+    store = RasterStore(tmp_path)
+    store.put(_address(), "contour_mask", np.zeros((4, 4), dtype=np.uint8))
+
+    assert store.get(_address(), "contour_mask", newer_than=0) is not None
+    assert store.get(_address(), "contour_mask", newer_than=2 ** 40) is None
+
+
+def test_rescoring_stores_masks_and_reuses_them(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_repo, "PROPERTY_RESULTS_DIR", tmp_path / "legacy")
+    monkeypatch.setattr(utils, "RESULT_BLOB_DIR", tmp_path / "blobs")
+    PropertyFileRepository._cache.clear()
+    repo = PropertyFileRepository(store=ResultStore(tmp_path / "results.sqlite3"))
+    raster_store = RasterStore(tmp_path / "rasters")
+    monkeypatch.setattr(rescoring_service, "PropertyFileRepository", lambda: repo)
+    monkeypatch.setattr(rescoring_service, "get_raster_store", lambda: raster_store)
+
+    addresses = [_address(f"{n} Main Street") for n in range(len(SAMPLE_MAPS))]
+    for address, path in zip(addresses, SAMPLE_MAPS):
+        shutil.copy(path, utils.get_property_directory(address) / "contour_map.png")
+        repo.save(address, erc.calculate(str(path)), filename=rescoring_service.ELEVATION_RISK_FILENAME)
+
+    first = rescoring_service.rescore_stored_properties(max_workers=1, use_raster_store=True)
+    second = rescoring_service.rescore_stored_properties(max_workers=1, use_raster_store=True)
+
+    assert first == {"rescored": 3, "failed": 0, "missing_image": 0, "from_raster_store": 0}
+    assert second == {"rescored": 3, "failed": 0, "missing_image": 0, "from_raster_store": 3}
+    for address, path in zip(addresses, SAMPLE_MAPS):
+        expected = erc.calculate(str(path), box_side_metres=BOX_SIDE_METRES)
+        assert erc.score_mask(raster_store.get(address, "contour_mask"), BOX_SIDE_METRES) == expected
+
+    # Newer contour maps replace the stored masks, and the store is compacted.
+    for address in addresses:
+        image = utils.get_property_directory(address) / "contour_map.png"
+        os.utime(image, (image.stat().st_mtime + 3600, image.stat().st_mtime + 3600))
+    third = rescoring_service.rescore_stored_properties(max_workers=1, use_raster_store=True)
+    assert third["from_raster_store"] == 0
+    stats = raster_store.stats()
+    assert stats["file_bytes"] == stats["live_bytes"]
+    PropertyFileRepository._cache.clear()
+
+
+def test_compact_reclaims_replaced_rasters(tmp_path):
+    store = RasterStore(tmp_path)
+    other = RasterStore(tmp_path)
+    masks = [np.full((16, 16), 255 * (n % 2), dtype=np.uint8) for n in range(10)]
+    for mask in masks:
+        store.put(_address(), "contour_mask", mask)
+    store.put(_address("2 Main Street"), "contour_mask", masks[0])
+    before = other.get(_address(), "contour_mask")
+
+    assert store.stats() == {"live_bytes": 2 * 32, "file_bytes": 11 * 32}
+    assert store.compact() == 9 * 32
+
+    assert store.stats() == {"live_bytes": 2 * 32, "file_bytes": 2 * 32}
+    assert len(list(tmp_path.glob("rasters-*.bin"))) == 1
+    # Other instances follow the index to the new data file.
+    assert np.array_equal(other.get(_address(), "contour_mask"), masks[-1])
+    assert np.array_equal(other.get(_address("2 Main Street"), "contour_mask"), masks[0])
+    assert np.array_equal(before, masks[-1])
+    store.put(_address("3 Main Street"), "contour_mask", masks[1])
+    assert store.stats() == {"live_bytes": 3 * 32, "file_bytes": 3 * 32}
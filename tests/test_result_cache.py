@@ -0,0 +1,61 @@
+"""
+The in-process LRU cache: per-entry expiry, least-recently-used eviction and
+invalidation.
+"""
+
+import pytest
+
+from ap_agent_api.infrastructure import result_cache
+from ap_agent_api.infrastructure.result_cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.put("default", 1)
+    cache.put("short", 2, ttl=10)
+    # An entry never outlives the cache default.
+    cache.put("long", 3, ttl=3600)
+    cache.put("stale", 4, ttl=-1)
+
+    clock[0] += 30
+    assert (cache.get("default"), cache.get("short"), cache.get("long"), cache.get("stale")) == (1, None, 3, None)
+    clock[0] += 31
+    assert (cache.get("default"), cache.get("long")) == (None, None)
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats() == {"hits": 3, "misses": 1, "hit_ratio": 0.75, "size": 2, "maxsize": 2}
+
+
+def test_invalidate_and_clear(clock):
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert (cache.get("a"), cache.get("b")) == (None, 2)
+
+    cache.clear()
+    assert cache.get("b") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_disabled_cache_stores_nothing(clock):
+    cache = LRUCache(maxsize=0, ttl=60)
+    cache.put("a", 1)
+    assert cache.get("a") is None
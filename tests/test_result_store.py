@@ -0,0 +1,154 @@
+"""
+Offline tests for the indexed result store behind PropertyFileRepository.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from ap_agent_api.domain import utils
+from ap_agent_api.domain.models.property import PropertyAddress
+from ap_agent_api.domain.models.risks import ElevationRiskAssessment
+from ap_agent_api.infrastructure import file_repo
+from ap_agent_api.infrastructure.file_repo import PropertyFileRepository
+from ap_agent_api.infrastructure.result_store import ResultStore
+
+FILENAME = "elevation_risk.json"
+
+
+def _risk(total):
+    ring = {"count": 1, "density": 1.0}
+    return {
+        "High Risk (Immediate Property)": ring,
+        "Moderate Risk (Adjacent Properties)": ring,
+        "Low Risk (Neighborhood Scale)": ring,
+        "Total Risk Score": total,
+    }
+
+
+def _address(street="1 Main Street", suburb="Campbelltown"):
+    return PropertyAddress(street=street, suburb=suburb, state="SA", postcode="5074")
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_repo, "PROPERTY_RESULTS_DIR", tmp_path / "legacy")
+    PropertyFileRepository._cache.clear()
+    store = ResultStore(tmp_path / "results.sqlite3")
+    yield PropertyFileRepository(store=store)
+    PropertyFileRepository._cache.clear()
+    store.close()
+
+
+def test_same_street_in_different_suburbs_does_not_collide(repo):
+    repo.save(_address(suburb="Campbelltown"), _risk(1.0), FILENAME)
+    repo.save(_address(suburb="Norwood"), _risk(2.0), FILENAME)
+
+    assert repo.load_model(_address(suburb="Campbelltown"), FILENAME, ElevationRiskAssessment).total_risk_score == 1.0
+    assert repo.load_model(_address(suburb="Norwood"), FILENAME, ElevationRiskAssessment).total_risk_score == 2.0
+    # Trivially different spellings map to the same property.
+    assert json.loads(repo.load(_address(street="1 main st.", suburb="CAMPBELLTOWN"), FILENAME)) == _risk(1.0)
+
+
+def test_results_expire_after_their_artifact_ttl(repo, monkeypatch):
+    address = _address()
+    eleven_days_ago = time.time() - 11 * 24 * 3600
+    repo.store.put(address, "elevation_risk", json.dumps(_risk(1.0)), fetched_at=eleven_days_ago)
+    assert repo.load(address, FILENAME) is None
+
+    monkeypatch.setitem(file_repo.RESULT_TTL_DAYS, "elevation_risk", 30)
+    assert repo.load(address, FILENAME) is not None
+
+
+def test_find_by_suburb_and_age(repo):
+    repo.save(_address("1 Main Street", "Campbelltown"), _risk(1.0), FILENAME)
+    repo.save(_address("2 Main Street", "Campbelltown"), _risk(2.0), FILENAME)
+    repo.save(_address("3 Main Street", "Norwood"), _risk(3.0), FILENAME)
+    repo.store.put(_address("4 Main Street", "Campbelltown"), "elevation_risk", json.dumps(_risk(4.0)),
+                   fetched_at=time.time() - 30 * 24 * 3600)
+
+    recent = repo.find(FILENAME, ElevationRiskAssessment, suburb="campbelltown", max_age_days=7)
+    assert sorted(risk.total_risk_score for _, _, risk in recent) == [1.0, 2.0]
+    assert len(repo.find(FILENAME, ElevationRiskAssessment, suburb="Campbelltown")) == 3
+
+
+def _write_legacy(address, filename, data, details_address=None):
+    directory = file_repo.PROPERTY_RESULTS_DIR / address.street.replace(" ", "_")
+    directory.mkdir(parents=True, exist_ok=True)
+    if details_address is not None:
+        (directory / file_repo.LEGACY_DETAILS_FILENAME).write_text(json.dumps({"address": details_address.model_dump()}))
+    (directory / filename).write_text(data)
+    return directory / filename
+
+
+def test_legacy_results_are_imported(repo):
+    address = _address()
+    legacy_file = _write_legacy(address, FILENAME, json.dumps(_risk(5.0)), details_address=address)
+    fetched_at = time.time() - 24 * 3600
+    os.utime(legacy_file, (fetched_at, fetched_at))
+
+    assert repo.load_model(address, FILENAME, ElevationRiskAssessment).total_risk_score == 5.0
+    stored = repo.store.get(address, "elevation_risk")
+    assert stored.fetched_at == pytest.approx(fetched_at)
+
+
+def test_legacy_results_of_another_suburb_are_not_imported(repo):
+    # The old directories were keyed by street only.
+    _write_legacy(_address(suburb="Norwood"), FILENAME, json.dumps(_risk(5.0)), details_address=_address(suburb="Norwood"))
+
+    assert repo.load_model(_address(suburb="Campbelltown"), FILENAME, ElevationRiskAssessment) is None
+    assert repo.store.get(_address(suburb="Campbelltown"), "elevation_risk") is None
+    assert repo.load_model(_address(suburb="Norwood"), FILENAME, ElevationRiskAssessment).total_risk_score == 5.0
+
+
+def test_legacy_results_without_an_address_are_not_imported(repo):
+    _write_legacy(_address(), FILENAME, json.dumps(_risk(5.0)))
+
+    assert repo.load_model(_address(), FILENAME, ElevationRiskAssessment) is None
+
+
+def test_find_image_only_uses_legacy_images_of_the_same_address(repo, tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "RESULT_BLOB_DIR", tmp_path / "blobs")
+    norwood = _address(suburb="Norwood")
+    legacy_image = _write_legacy(norwood, "contour_map.png", "png", details_address=norwood)
+
+    assert repo.find_image(norwood, "contour_map.png") == legacy_image
+    assert repo.find_image(_address(suburb="Campbelltown"), "contour_map.png") is None
+
+    blob_image = utils.get_property_directory(_address(suburb="Campbelltown")) / "contour_map.png"
+    blob_image.write_text("png")
+    assert repo.find_image(_address(suburb="Campbelltown"), "contour_map.png") == blob_image
+
+
+def test_save_invalidates_cached_results(repo):
+    address = _address()
+    repo.save(address, _risk(1.0), FILENAME)
+    assert repo.load_model(address, FILENAME, ElevationRiskAssessment).total_risk_score == 1.0
+    assert json.loads(repo.load_json(address, FILENAME, ElevationRiskAssessment))["Total Risk Score"] == 1.0
+
+    # Another repository instance shares the cache; a dict is not cached by save().
+    PropertyFileRepository(store=repo.store).save(address, _risk(2.0), FILENAME)
+    assert repo.load_model(address, FILENAME, ElevationRiskAssessment).total_risk_score == 2.0
+    assert json.loads(repo.load_json(address, FILENAME, ElevationRiskAssessment))["Total Risk Score"] == 2.0
+
+    # A saved model replaces the cached entries directly.
+    repo.save(address, ElevationRiskAssessment.model_validate(_risk(3.0)), FILENAME)
+    assert repo.load_model(address, FILENAME, ElevationRiskAssessment).total_risk_score == 3.0
+    assert json.loads(repo.load_json(address, FILENAME, ElevationRiskAssessment))["Total Risk Score"] == 3.0
+
+
+def test_repositories_of_different_stores_do_not_share_cached_results(repo, tmp_path):
+    other_store = ResultStore(tmp_path / "other.sqlite3")
+    other = PropertyFileRepository(store=other_store)
+    address = _address()
+    repo.save(address, ElevationRiskAssessment.model_validate(_risk(1.0)), FILENAME)
+    assert repo.load_model(address, FILENAME, ElevationRiskAssessment).total_risk_score == 1.0
+
+    assert other.load_model(address, FILENAME, ElevationRiskAssessment) is None
+    assert other.load_json(address, FILENAME, ElevationRiskAssessment) is None
+    other.save(address, _risk(2.0), FILENAME)
+    assert other.load_model(address, FILENAME, ElevationRiskAssessment).total_risk_score == 2.0
+    assert repo.load_model(address, FILENAME, ElevationRiskAssessment).total_risk_score == 1.0
+    other_store.close()
@@ -0,0 +1,50 @@
+"""
+Tests for multi-centre ring queries on a contour mask.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+
+SAMPLE_MAPS = sorted((Path(__file__).parents[1] / "property_results").glob("*/contour_map.png"))
+
+
+def _centers(rng, count):
+    # Pixel and fractional centres, including some off the image.
+    return [(200, 200), (0, 0), (399, 399), (-40, 210)] + \
+        [tuple(rng.integers(0, 400, 2)) for _ in range(count)] + \
+        [tuple(rng.uniform(-20, 420, 2)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("path", SAMPLE_MAPS, ids=lambda p: p.parent.name)
+def test_matches_full_pass_on_sample_maps(path):
+    mask = erc.subtract_roads_from_contours(str(path))
+    index = erc.RingIndex(mask)
+    centers = _centers(np.random.default_rng(0), 25)
+
+    assert index.assess_many(centers) == [erc.assess_ring_risk_from_mask(mask, c, erc.RISK_RINGS) for c in centers]
+
+
+def test_matches_full_pass_with_fractional_radii():
+    rng = np.random.default_rng(1)
+    mask = (rng.random((300, 400)) < 0.3).astype(np.uint8) * 255
+    rings = [(0, 12.5, 100, "a"), (12.5, 33.3, 50, "b"), (40, 150.7, 25, "c")]
+    index = erc.RingIndex(mask)
+
+    for center in _centers(rng, 25):
+        assert index.assess(center, rings) == erc.assess_ring_risk_from_mask(mask, center, rings)
+
+
+def test_disk_count_and_overlapping_rings():
+    mask = np.full((50, 50), 255, dtype=np.uint8)
+    index = erc.RingIndex(mask)
+
+    assert index.disk_count((25, 25), 0) == 0
+    assert index.disk_count((25, 25), 1) == 1
+    assert index.disk_count((25, 25), 1.5) == 9
+    assert index.disk_count((25, 25), 100) == 2500
+    with pytest.raises(ValueError):
+        index.ring_counts((25, 25), [(0, 10, 1, "a"), (5, 20, 1, "b")])
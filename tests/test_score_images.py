@@ -0,0 +1,37 @@
+"""
+Tests for batch contour scoring on a process pool.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+
+SAMPLE_MAPS = sorted((Path(__file__).parents[1] / "property_results").glob("*/contour_map.png"))
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_results_and_errors_in_input_order(max_workers):
+    images = [SAMPLE_MAPS[0], "/nonexistent/contour_map.png", SAMPLE_MAPS[1].read_bytes(), b"not a png", str(SAMPLE_MAPS[2])]
+
+    results = erc.score_images(images, max_workers=max_workers, chunksize=1)
+
+    assert [r.index for r in results] == list(range(len(images)))
+    assert [r.ok for r in results] == [True, False, True, False, True]
+    assert "FileNotFoundError" in results[1].error
+    assert "ValueError" in results[3].error
+    for result, path in zip([results[0], results[2], results[4]], SAMPLE_MAPS):
+        assert result.risk == erc.calculate(str(path))
+
+
+def test_iter_score_images_streams_in_input_order():
+    images = [str(path) for path in SAMPLE_MAPS] * 3
+
+    results = erc.iter_score_images(images, max_workers=2, chunksize=1, return_masks=True)
+
+    assert not isinstance(results, list)
+    for index, result in enumerate(results):
+        assert result.index == index
+        assert result.mask.shape == (400, 400)
+        assert result.risk == erc.calculate(images[index])
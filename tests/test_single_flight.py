@@ -0,0 +1,83 @@
+"""
+SingleFlight: concurrent calls with the same key share one computation, its
+exception reaches every waiter, and one waiter giving up does not cancel it.
+"""
+
+import asyncio
+
+import pytest
+
+from ap_agent_api.application.single_flight import SingleFlight
+
+
+class Computation:
+
+    def __init__(self, result="result", error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def _start(flight, key, fn, n):
+    fn.release = asyncio.Event()
+    waiters = [asyncio.create_task(flight.do(key, fn)) for _ in range(n)]
+    await asyncio.sleep(0)
+    return waiters
+
+
+def test_concurrent_calls_are_coalesced():
+    async def scenario():
+        flight, fn, other = SingleFlight(), Computation(), Computation("other")
+        waiters = await _start(flight, "a", fn, 5)
+        other_waiters = await _start(flight, "b", other, 1)
+        assert flight.in_flight() == 2
+        fn.release.set()
+        other.release.set()
+        results = await asyncio.gather(*waiters, *other_waiters)
+        assert results == ["result"] * 5 + ["other"]
+        assert (fn.calls, other.calls, flight.in_flight()) == (1, 1, 0)
+
+        # Once finished, the key runs afresh.
+        waiters = await _start(flight, "a", fn, 1)
+        fn.release.set()
+        await asyncio.gather(*waiters)
+        assert fn.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_exception_reaches_every_waiter():
+    async def scenario():
+        flight, fn = SingleFlight(), Computation(error=RuntimeError("geohub down"))
+        waiters = await _start(flight, "a", fn, 3)
+        fn.release.set()
+        outcomes = await asyncio.gather(*waiters, return_exceptions=True)
+        assert [str(outcome) for outcome in outcomes] == ["geohub down"] * 3
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        assert fn.calls == 1 and flight.in_flight() == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    async def scenario():
+        flight, fn = SingleFlight(), Computation()
+        cancelled, *waiters = await _start(flight, "a", fn, 3)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert flight.in_flight() == 1
+
+        fn.release.set()
+        assert await asyncio.gather(*waiters) == ["result", "result"]
+        assert fn.calls == 1
+
+    asyncio.run(scenario())
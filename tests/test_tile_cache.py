@@ -0,0 +1,99 @@
+"""
+Tile-grid map imagery: covering tiles, cropping the bbox out of the mosaic
+(from a pre-filled tile cache, so no requests are made) and shutdown.
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from ap_agent_api.infrastructure import gis_image_generate, tile_cache
+from ap_agent_api.infrastructure.gis_image_generate import BOX_SIDE_METERS, calculate_bounding_box
+from ap_agent_api.infrastructure.tile_cache import (
+    TILE_ORIGIN_X, TILE_ORIGIN_Y, TILE_SIZE, TileCache, crop_window, get_tiled_map_image, tile_range,
+    tile_resolution
+)
+
+Z = 17
+SERVICE_URL = "https://lsa2.geohub.sa.gov.au/server/rest/services/BaseMaps/Topographic_wmas/MapServer"
+EXPORT_URL = f"{SERVICE_URL}/export"
+# A point in Adelaide, Web Mercator
+WM_X, WM_Y = 15434900.0, -4143000.0
+
+
+def _tile_meters(z=Z):
+    return tile_resolution(z) * TILE_SIZE
+
+
+def _global_pixel(wm_x, wm_y, z=Z):
+    resolution = tile_resolution(z)
+    return (wm_x - TILE_ORIGIN_X) / resolution, (TILE_ORIGIN_Y - wm_y) / resolution
+
+
+def _tile(x, y):
+    # Each pixel encodes its global column and row (modulo 251).
+    cols, rows = np.meshgrid(np.arange(TILE_SIZE) + x * TILE_SIZE, np.arange(TILE_SIZE) + y * TILE_SIZE)
+    tile = np.dstack([cols % 251, rows % 251, np.zeros_like(cols)]).astype(np.uint8)
+    return cv2.imencode(".png", tile)[1].tobytes()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TileCache(tmp_path)
+    col_min, row_min, col_max, row_max = tile_range(calculate_bounding_box(WM_X, WM_Y, BOX_SIDE_METERS), Z)
+    for y in range(row_min, row_max + 1):
+        for x in range(col_min, col_max + 1):
+            cache.put(SERVICE_URL, Z, x, y, _tile(x, y))
+    return cache
+
+
+def test_tile_range_within_one_tile():
+    col, row = 116240, 80820
+    xmin = TILE_ORIGIN_X + col * _tile_meters() + 10
+    ymax = TILE_ORIGIN_Y - row * _tile_meters() - 10
+    assert tile_range((xmin, ymax - 100, xmin + 100, ymax), Z) == (col, row, col, row)
+
+
+def test_tile_range_across_tile_edges():
+    col, row = 116240, 80820
+    x_edge = TILE_ORIGIN_X + (col + 1) * _tile_meters()
+    y_edge = TILE_ORIGIN_Y - (row + 1) * _tile_meters()
+    assert tile_range((x_edge - 1, y_edge - 1, x_edge + 1, y_edge + 1), Z) == (col, row, col + 1, row + 1)
+
+
+def test_crop_window_matches_the_bbox():
+    bbox = calculate_bounding_box(WM_X, WM_Y, BOX_SIDE_METERS)
+    col_min, row_min, _, _ = tile_range(bbox, Z)
+    left, top, width, height = crop_window(bbox, Z, col_min, row_min)
+
+    x, y = _global_pixel(bbox[0], bbox[3])
+    assert (left, top) == (round(x) - col_min * TILE_SIZE, round(y) - row_min * TILE_SIZE)
+    assert width == height == round(BOX_SIDE_METERS / tile_resolution(Z)) == 256
+
+
+def test_tiled_map_image_is_the_bbox_at_native_resolution(cache):
+    bbox = calculate_bounding_box(WM_X, WM_Y, BOX_SIDE_METERS)
+    image = cv2.imdecode(np.frombuffer(get_tiled_map_image(bbox, EXPORT_URL, z=Z, size=0, cache=cache), np.uint8),
+                         cv2.IMREAD_COLOR)
+
+    x0, y0 = (round(v) for v in _global_pixel(bbox[0], bbox[3]))
+    assert image.shape == (256, 256, 3)
+    assert np.array_equal(image[:, :, 0], np.tile((np.arange(256) + x0) % 251, (256, 1)))
+    assert np.array_equal(image[:, :, 1], np.tile(((np.arange(256) + y0) % 251)[:, None], (1, 256)))
+
+
+def test_tiled_map_image_can_be_resampled(cache):
+    bbox = calculate_bounding_box(WM_X, WM_Y, BOX_SIDE_METERS)
+    image = cv2.imdecode(np.frombuffer(get_tiled_map_image(bbox, EXPORT_URL, z=Z, size=400, cache=cache), np.uint8),
+                         cv2.IMREAD_COLOR)
+
+    x0, _ = (round(v) for v in _global_pixel(bbox[0], bbox[3]))
+    assert image.shape == (400, 400, 3)
+    # Nearest-neighbour sampling duplicates columns instead of blending them.
+    assert set(image[0, :, 0]) == set((np.arange(256) + x0) % 251)
+
+
+def test_tile_executor_is_shut_down_with_the_layer_pools(cache):
+    tile_cache._get_tile_executor()
+    gis_image_generate.shutdown_executors()
+    assert tile_cache._tile_executor is None
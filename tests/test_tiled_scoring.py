@@ -0,0 +1,80 @@
+"""
+Tests for resolution-independent (metre-based) and tiled scoring.
+"""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from ap_agent_api.domain.tools import elevation_risk_calculator as erc
+from ap_agent_api.infrastructure import metrics
+
+SAMPLE_MAPS = sorted((Path(__file__).parents[1] / "property_results").glob("*/contour_map.png"))
+BOX_SIDE_METRES = 305.748113
+CONTOUR_BGR = (124, 132, 255)
+ROAD_BGR = (20, 60, 240)
+
+
+def _map(size: int) -> np.ndarray:
+    # The same terrain at any export size: 1 px lines, as drawn by the map server.
+    scale = size / 400
+    img = np.full((size, size, 3), 255, dtype=np.uint8)
+    for radius in range(40, 800, 40):
+        axes = (int(radius * scale), int(radius * 0.7 * scale))
+        cv2.ellipse(img, (int(240 * scale), int(170 * scale)), axes, 20, 0, 360, CONTOUR_BGR, 1)
+    cv2.line(img, (0, int(100 * scale)), (size - 1, int(140 * scale)), ROAD_BGR, 3)
+    return img
+
+
+def test_rings_in_metres_map_back_to_the_400px_rings():
+    assert erc.rings_in_pixels(erc.RISK_RINGS_METRES, erc.METRES_PER_PIXEL) == erc.RISK_RINGS
+
+
+@pytest.mark.parametrize("path", SAMPLE_MAPS, ids=lambda p: p.parent.name)
+@pytest.mark.parametrize("engine", erc.ENGINES)
+def test_metre_mode_and_tiles_match_legacy_scores_at_400px(path, engine):
+    legacy = erc.calculate(str(path), engine=engine)
+
+    assert erc.calculate(str(path), engine=engine, box_side_metres=BOX_SIDE_METRES) == legacy
+    assert erc.calculate(str(path), engine=engine, box_side_metres=BOX_SIDE_METRES, tile_size=96) == legacy
+
+
+@pytest.mark.parametrize("tile_size", [64, 97, 250])
+def test_tiled_isolation_equals_whole_image(tile_size):
+    for img in [cv2.imread(str(path)) for path in SAMPLE_MAPS] + [_map(600)]:
+        expected = erc.subtract_roads_from_contours(img).copy()
+        assert np.array_equal(erc.subtract_roads_from_contours_tiled(img, tile_size), expected)
+
+
+@pytest.mark.parametrize("engine", erc.ENGINES)
+def test_scores_do_not_depend_on_export_size(engine):
+    reference = erc.calculate(_map(400), engine=engine, box_side_metres=BOX_SIDE_METRES)
+
+    for size in (800, 2048):
+        risk = erc.calculate(_map(size), engine=engine, box_side_metres=BOX_SIDE_METRES, tile_size=512)
+        assert risk["Total Risk Score"] == pytest.approx(reference["Total Risk Score"], rel=0.1)
+
+
+def test_score_images_in_metre_mode():
+    images = [_map(400), _map(1200)]
+
+    results = erc.score_images(images, max_workers=1, box_side_metres=BOX_SIDE_METRES)
+
+    for image, result in zip(images, results):
+        assert result.risk == erc.calculate(image, box_side_metres=BOX_SIDE_METRES)
+
+
+@pytest.mark.parametrize("engine, tile_size, steps", [
+    ("pixel", erc.SCORING_TILE_SIZE, {"decode", "isolation", "scoring"}),
+    ("polyline", 96, {"decode", "isolation", "scoring"}),
+    # Tile by tile, isolation and ring counting are one step.
+    ("pixel", 96, {"decode", "tiled_scoring"}),
+])
+def test_timed_steps(engine, tile_size, steps):
+    timings = {}
+    erc.calculate(_map(400), timings=timings, engine=engine, tile_size=tile_size)
+    assert set(timings) == steps
+    assert all(seconds > 0 for seconds in timings.values())
+    assert steps <= set(metrics.SCORING_STEP_SECONDS)